@@ -0,0 +1,210 @@
+"""Content-addressed artifact writes: skip unchanged files and replace changed ones atomically.
+
+Every tracked write hashes the new content and compares it with the ``artifact_manifest.json``
+recorded for that directory by the previous run. Unchanged files are not touched at all, which
+keeps network-mounted volumes quiet and ``git diff`` clean. Changed files are written to a
+temporary file next to the target and renamed over it, so readers never see a partial artifact.
+Committing a directory rewrites its manifest with each artifact's digest and the lists of
+changed and unchanged names for the run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+MANIFEST_FILENAME = "artifact_manifest.json"
+
+
+def _default_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+_DEFAULT_FILE_MODE = _default_file_mode()
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _temporary_file(path: Path) -> tuple[int, str]:
+    import tempfile
+
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = _DEFAULT_FILE_MODE
+    os.chmod(temp_name, mode)
+    return fd, temp_name
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    fd, temp_name = _temporary_file(path)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically replace ``path`` with ``data`` unless it already holds exactly those bytes."""
+
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write_bytes(path, data)
+    return True
+
+
+class _HashingWriter:
+    """Text handle that encodes, hashes and writes to a temporary file as content arrives."""
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8")
+        self.digest.update(data)
+        self.size += len(data)
+        self._handle.write(data)
+        return len(text)
+
+
+class _DirectoryState:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        manifest_path = directory / MANIFEST_FILENAME
+        try:
+            self.previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("artifacts", {})
+        except (OSError, ValueError, AttributeError):
+            self.previous = {}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.changed: List[str] = []
+        self.unchanged: List[str] = []
+
+    def is_current(self, path: Path, digest: str, size: int) -> bool:
+        """True when ``path`` already holds content with ``digest``, trusting the manifest's stat."""
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+        if stat.st_size != size:
+            return False
+        entry = self.previous.get(path.name)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == size:
+            return entry.get("sha256") == digest
+        return file_digest(path) == digest
+
+    def record(self, path: Path, digest: str, size: int, changed: bool) -> None:
+        if path.name in self.entries:
+            for bucket in (self.changed, self.unchanged):
+                if path.name in bucket:
+                    bucket.remove(path.name)
+        self.entries[path.name] = {"sha256": digest, "size": size, "mtime_ns": path.stat().st_mtime_ns}
+        (self.changed if changed else self.unchanged).append(path.name)
+
+
+class ArtifactStore:
+    """Track content-addressed writes per output directory until the directory is committed."""
+
+    def __init__(self) -> None:
+        self._states: Dict[Path, _DirectoryState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, directory: Path) -> _DirectoryState:
+        key = directory.resolve()
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _DirectoryState(directory)
+            return state
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """Write ``data`` to ``path`` unless unchanged; return whether the file was replaced."""
+
+        state = self._state(path.parent)
+        digest = hashlib.sha256(data).hexdigest()
+        changed = not state.is_current(path, digest, len(data))
+        if changed:
+            atomic_write_bytes(path, data)
+        with self._lock:
+            state.record(path, digest, len(data), changed)
+        return changed
+
+    def write_text(self, path: Path, content: str) -> bool:
+        return self.write_bytes(path, content.encode("utf-8"))
+
+    @contextmanager
+    def open_text(self, path: Path) -> Iterator[_HashingWriter]:
+        """Stream text into a temporary file; it replaces ``path`` on exit only if the content changed."""
+
+        state = self._state(path.parent)
+        fd, temp_name = _temporary_file(path)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                writer = _HashingWriter(handle)
+                yield writer
+            digest = writer.digest.hexdigest()
+            changed = not state.is_current(path, digest, writer.size)
+            if changed:
+                os.replace(temp_name, path)
+            else:
+                Path(temp_name).unlink()
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            state.record(path, digest, writer.size, changed)
+
+    def mark_unchanged(self, directory: Path) -> None:
+        """Report every artifact from the previous manifest as unchanged (e.g. a skipped stage)."""
+
+        state = self._state(directory)
+        with self._lock:
+            for name, entry in state.previous.items():
+                if name not in state.entries and (directory / name).exists():
+                    state.entries[name] = dict(entry)
+                    state.unchanged.append(name)
+
+    def commit(self, directory: Path) -> Dict[str, Any]:
+        """Write ``directory``'s manifest for this run and forget its pending state."""
+
+        with self._lock:
+            state = self._states.pop(directory.resolve(), None)
+        if state is None:
+            state = _DirectoryState(directory)
+        manifest = {
+            "artifacts": {name: state.entries[name] for name in sorted(state.entries)},
+            "changed": sorted(state.changed),
+            "unchanged": sorted(state.unchanged),
+        }
+        write_if_changed(directory / MANIFEST_FILENAME, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+        return manifest
+
+    def discard(self, directory: Path) -> None:
+        with self._lock:
+            self._states.pop(directory.resolve(), None)
+
+
+ARTIFACTS = ArtifactStore()
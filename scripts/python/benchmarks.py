@@ -0,0 +1,829 @@
+#!/usr/bin/env python3
+"""Benchmarks for the stage artifact generator.
+
+``suite`` times the generator hot paths on synthetic inputs scaled from 1x to 1000x and
+emits JSON; ``compare`` diffs two such result files so regressions show up between commits;
+``batch`` reports articles/second of batch mode by worker count; ``sections`` compares serial,
+threaded and multi-process Stage 2 section rendering on a long outline; ``platforms`` does the
+same for the Stage 3 per-platform fan-out; ``duplicates`` times MinHash indexing of a large
+synthetic catalog and LSH queries against a full scan; ``contexts`` compares the size and load
+time of each stage's context as indented JSON and in the compact format, and the size of its
+delta against the previous stage.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import context_chain
+import context_format
+import generate_stage_artifacts as gsa
+import markdown_html
+import near_duplicates
+import tokenizer
+
+ROOT = Path(__file__).resolve().parents[2]
+SAMPLE_ARTICLE_PATH = ROOT / "content" / "why-men-pull-away-understandingman.md"
+DEFAULT_SCALES = (1, 10, 100, 1000)
+MIN_BENCH_SECONDS = 0.2
+MAX_REPEATS = 50
+
+BenchSetup = Callable[[int], Tuple[Callable[[], Any], int]]
+
+_WORKDIRS: List[tempfile.TemporaryDirectory] = []
+
+
+def synthetic_article(scale: int) -> str:
+    """The sample blog post repeated ``scale`` times."""
+
+    return "\n\n".join([SAMPLE_ARTICLE_PATH.read_text(encoding="utf-8")] * scale)
+
+
+def synthetic_keyword_data(scale: int) -> Dict[str, Any]:
+    """Copies of the real keyword clusters with distinct ids and perturbed volumes."""
+
+    base = gsa.load_keyword_clusters()
+    clusters = []
+    for copy_index in range(scale):
+        for cluster in base["clusters"]:
+            clone = copy.deepcopy(cluster)
+            clone["id"] = f"{cluster['id']}-{copy_index}"
+            for offset, keyword in enumerate(clone["keywords"]):
+                keyword["volume"] = keyword["volume"] + (copy_index * 7 + offset) % 97
+            clusters.append(clone)
+    return {**base, "clusters": clusters}
+
+
+def benchmark_keywords() -> List[str]:
+    """Every keyword term in the real data plus the Stage 2 SEO package keywords."""
+
+    terms = [kw["term"] for cluster in gsa.load_keyword_clusters()["clusters"] for kw in cluster["keywords"]]
+    return terms + gsa.load_config()["stage2"]["seo_package_keywords"]
+
+
+def cold_tokens(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Clear the shared token cache before each run so every timing includes one tokenization."""
+
+    def run() -> Any:
+        tokenizer.tokenize.cache_clear()
+        return func()
+
+    return run
+
+
+def setup_keyword_density(scale: int) -> Tuple[Callable[[], Any], int]:
+    article = synthetic_article(scale)
+    keywords = benchmark_keywords()
+    return cold_tokens(lambda: [gsa.compute_keyword_density(article, keyword) for keyword in keywords]), len(article)
+
+
+def setup_keyword_densities(scale: int) -> Tuple[Callable[[], Any], int]:
+    article = synthetic_article(scale)
+    keywords = benchmark_keywords()
+    return cold_tokens(lambda: gsa.compute_keyword_densities(article, keywords)), len(article)
+
+
+def setup_flesch_kincaid(scale: int) -> Tuple[Callable[[], Any], int]:
+    article = synthetic_article(scale)
+    return cold_tokens(lambda: gsa.flesch_kincaid_grade(article)), len(article)
+
+
+def setup_estimate_syllables(scale: int) -> Tuple[Callable[[], Any], int]:
+    words = tokenizer.WORD_PATTERN.findall(synthetic_article(scale))
+    return (lambda: sum(gsa.estimate_syllables(word) for word in words)), len(words)
+
+
+def setup_stage2_text_metrics(scale: int) -> Tuple[Callable[[], Any], int]:
+    """Word count, densities and grade as before :class:`TextAnalysis`: each metric tokenizes again.
+
+    Mirrors the old standalone functions, including uncached syllable estimates, so it is the
+    baseline ``text_analysis`` is compared with.
+    """
+
+    article = synthetic_article(scale)
+    keywords = benchmark_keywords()
+
+    def densities() -> Dict[str, float]:
+        words = tokenizer.WORD_PATTERN.findall(article.lower())
+        phrases = {keyword: tuple(tokenizer.WORD_PATTERN.findall(keyword.lower())) for keyword in keywords}
+        counts = gsa.count_keyword_phrases(words, phrases.values())
+        return {keyword: counts[phrase] / len(words) for keyword, phrase in phrases.items()}
+
+    def grade() -> float:
+        sentences = [sentence for sentence in tokenizer.SENTENCE_BOUNDARY_PATTERN.split(article) if sentence.strip()]
+        words = tokenizer.WORD_PATTERN.findall(article)
+        syllables = sum(gsa.estimate_syllables(word) for word in words)
+        return round(0.39 * len(words) / len(sentences) + 11.8 * syllables / len(words) - 15.59, 2)
+
+    def run() -> Any:
+        return len(tokenizer.WORD_PATTERN.findall(article)), densities(), grade()
+
+    return run, len(article)
+
+
+def setup_text_analysis(scale: int) -> Tuple[Callable[[], Any], int]:
+    """The same Stage 2 metrics from one shared :class:`TextAnalysis`."""
+
+    article = synthetic_article(scale)
+    keywords = benchmark_keywords()
+
+    def run() -> Any:
+        analysis = gsa.TextAnalysis(article)
+        return analysis.word_count, analysis.keyword_densities(keywords), analysis.flesch_kincaid_grade()
+
+    return cold_tokens(run), len(article)
+
+
+STAGE2_EMOTIONAL_WORDS = ("fear", "desire", "hope", "reassurance")
+
+
+def setup_stage2_rescans(scale: int) -> Tuple[Callable[[], Any], int]:
+    """Every Stage 2 text check scanning the article on its own, as before the shared tokenizer."""
+
+    article = synthetic_article(scale)
+    keywords = benchmark_keywords()
+
+    def run() -> Any:
+        words = tokenizer.WORD_PATTERN.findall(article)
+        sentences = sum(1 for sentence in tokenizer.SENTENCE_BOUNDARY_PATTERN.split(article) if sentence.strip())
+        lowered = tokenizer.WORD_PATTERN.findall(article.lower())
+        phrases = [tokenizer.phrase_tokens(keyword) for keyword in keywords]
+        counts = gsa.count_keyword_phrases(lowered, phrases)
+        syllables = sum(gsa.cached_syllables(word.lower()) for word in words)
+        headings = [line for line in article.splitlines() if line.startswith("## ")]
+        emotional = {word: word in article.lower() for word in STAGE2_EMOTIONAL_WORDS}
+        return len(words), sentences, counts, syllables, headings, emotional
+
+    return run, len(article)
+
+
+def setup_stage2_analysis(scale: int) -> Tuple[Callable[[], Any], int]:
+    """The same Stage 2 checks reading one cached :class:`tokenizer.TokenizedText`."""
+
+    article = synthetic_article(scale)
+    keywords = benchmark_keywords()
+
+    def run() -> Any:
+        analysis = gsa.TextAnalysis(article)
+        tokens = analysis.tokens
+        return (
+            analysis.word_count,
+            analysis.keyword_densities(keywords),
+            analysis.flesch_kincaid_grade(),
+            tokens.lines_starting_with("## "),
+            {word: tokens.contains(word) for word in STAGE2_EMOTIONAL_WORDS},
+        )
+
+    return cold_tokens(run), len(article)
+
+
+def setup_cached_syllables(scale: int) -> Tuple[Callable[[], Any], int]:
+    words = tokenizer.WORD_PATTERN.findall(synthetic_article(scale))
+    return (lambda: sum(gsa.cached_syllables(word) for word in words)), len(words)
+
+
+def setup_markdown_html(scale: int) -> Tuple[Callable[[], Any], int]:
+    """Stream the sample post, repeated ``scale`` times, through the Markdown converter."""
+
+    article = synthetic_article(scale)
+
+    def run() -> Any:
+        with open(os.devnull, "w", encoding="utf-8") as sink:
+            markdown_html.write_html(io.StringIO(article), sink)
+
+    return run, len(article)
+
+
+def setup_cluster_metrics(scale: int) -> Tuple[Callable[[], Any], int]:
+    clusters = synthetic_keyword_data(scale)["clusters"]
+    return (lambda: [gsa.cluster_metrics(cluster) for cluster in clusters]), len(clusters)
+
+
+def setup_cluster_metrics_columnar(scale: int) -> Tuple[Callable[[], Any], int]:
+    clusters = synthetic_keyword_data(scale)["clusters"]
+    return (lambda: gsa.cluster_metrics_columnar(clusters)), len(clusters)
+
+
+def setup_render_paragraphs(scale: int) -> Tuple[Callable[[], Any], int]:
+    config = gsa.load_config()
+    context = {
+        "persona_name": "Heart-Led High Achiever",
+        "product": config["product"],
+        "primary_keyword": "phrases to make him obsessed",
+        "winning_cluster": gsa.cluster_metrics(gsa.load_keyword_clusters()["clusters"][0]),
+    }
+    themes = [theme for section in config["stage2"]["outline"]["sections"] for theme in section["themes"]] * scale
+    extra = {"tone": "warm and authoritative", "cta": "Invite him into the next moment with a confident, heart-led ask."}
+    return (lambda: [gsa.generate_paragraph(theme, context, extra) for theme in themes]), len(themes)
+
+
+def setup_article_variants(scale: int) -> Tuple[Callable[[], Any], int]:
+    """Render, dedupe and score ``10 * scale`` Stage 2 variants (x1000 is 10k variants)."""
+
+    config = gsa.load_config()
+    cluster = gsa.cluster_metrics(gsa.load_keyword_clusters()["clusters"][0])
+    # Enough distinct meta hooks that the space always holds the requested count.
+    cluster["meta_hooks"] = [f"Benchmark hook {index} keeps him close" for index in range(10 * scale)]
+    context = {
+        "persona_name": "Heart-Led High Achiever",
+        "product": config["product"],
+        "primary_keyword": "phrases to make him obsessed",
+        "winning_cluster": cluster,
+    }
+    count = 10 * scale
+    return cold_tokens(lambda: list(gsa.iter_article_variants(config, context, count, seed=scale))), count
+
+
+def setup_render_templates(scale: int) -> Tuple[Callable[[], Any], int]:
+    """Render the Stage 3 and Stage 4 templates for ``scale`` articles from the cached compilations."""
+
+    config = gsa.load_config()
+    slugs = [f"benchmark-article-{index}" for index in range(scale)]
+
+    def run() -> Any:
+        return [
+            (
+                gsa.templates().render(
+                    "stage3_cross_platform_distribution.md",
+                    prompts=config["stage3"]["prompts"],
+                    platforms=config["stage3"]["platforms"],
+                    slug=slug,
+                ),
+                gsa.templates().render(
+                    "stage4_analytics_refinement.md",
+                    slug=slug,
+                    systems=config["stage4"]["analytics_systems"],
+                ),
+            )
+            for slug in slugs
+        ]
+
+    return run, len(slugs)
+
+
+def setup_stages(scale: int) -> Tuple[Callable[[], Any], int]:
+    config = gsa.load_config()
+    keyword_data = synthetic_keyword_data(scale)
+
+    def run() -> Any:
+        with tempfile.TemporaryDirectory() as tmp:
+            return gsa.run_pipeline(
+                output_root=Path(tmp),
+                config=config,
+                keyword_data=keyword_data,
+                shared_context=Path(tmp) / "context.json",
+                force=True,
+            )
+
+    return run, len(keyword_data["clusters"])
+
+
+def make_stage_setup(stage: str) -> BenchSetup:
+    """Time one stage on its own, feeding it the upstream context produced at the same scale."""
+
+    def setup(scale: int) -> Tuple[Callable[[], Any], int]:
+        config = gsa.load_config()
+        keyword_data = synthetic_keyword_data(scale)
+        tmp = tempfile.TemporaryDirectory(prefix="bench-")
+        _WORKDIRS.append(tmp)
+        workdir = Path(tmp.name)
+        stages = gsa.STAGE_ORDER[: gsa.STAGE_ORDER.index(stage)]
+        context = (
+            gsa.run_pipeline(
+                stages,
+                output_root=workdir,
+                config=config,
+                keyword_data=keyword_data,
+                shared_context=workdir / "context.json",
+            )
+            if stages
+            else None
+        )
+        args = argparse.Namespace(
+            stage=stage,
+            output_dir=str(workdir / stage),
+            context=None,
+            product=config["product"],
+            persona_name=config["stage1"]["persona"]["name"],
+            lookback_days=30,
+            keyword_seed=None,
+            shared_context=str(workdir / "context.json"),
+        )
+        return (lambda: gsa.run_stage(args, config, keyword_data, context, force=True)), len(keyword_data["clusters"])
+
+    return setup
+
+
+BENCHMARKS: Dict[str, BenchSetup] = {
+    "compute_keyword_density": setup_keyword_density,
+    "compute_keyword_densities": setup_keyword_densities,
+    "flesch_kincaid_grade": setup_flesch_kincaid,
+    "estimate_syllables": setup_estimate_syllables,
+    "cached_syllables": setup_cached_syllables,
+    "stage2_text_metrics": setup_stage2_text_metrics,
+    "text_analysis": setup_text_analysis,
+    "stage2_rescans": setup_stage2_rescans,
+    "stage2_analysis": setup_stage2_analysis,
+    "markdown_html": setup_markdown_html,
+    "cluster_metrics": setup_cluster_metrics,
+    "cluster_metrics_columnar": setup_cluster_metrics_columnar,
+    "generate_paragraph": setup_render_paragraphs,
+    "article_variants": setup_article_variants,
+    "render_templates": setup_render_templates,
+    **{stage: make_stage_setup(stage) for stage in gsa.STAGE_ORDER},
+    "pipeline": setup_stages,
+}
+
+
+def time_callable(func: Callable[[], Any]) -> Dict[str, Any]:
+    """Repeat ``func`` until ``MIN_BENCH_SECONDS`` have elapsed (or ``MAX_REPEATS`` runs)."""
+
+    timings: List[float] = []
+    budget_start = time.perf_counter()
+    while len(timings) < MAX_REPEATS and (not timings or time.perf_counter() - budget_start < MIN_BENCH_SECONDS):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        "repeats": len(timings),
+        "best_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_suite(names: Sequence[str], scales: Sequence[int]) -> Dict[str, Any]:
+    results = []
+    try:
+        for name in names:
+            for scale in scales:
+                func, input_size = BENCHMARKS[name](scale)
+                timing = time_callable(func)
+                results.append({"name": name, "scale": scale, "input_size": input_size, **timing})
+                print(f"{name:<26} x{scale:<5} {timing['best_seconds'] * 1000:>10.2f} ms", file=sys.stderr)
+    finally:
+        while _WORKDIRS:
+            _WORKDIRS.pop().cleanup()
+    return {
+        "benchmark": "suite",
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], candidate: Dict[str, Any], *, threshold: float) -> Dict[str, Any]:
+    """Ratio of candidate to baseline best times; ratios above ``1 + threshold`` are regressions."""
+
+    base_times = {(row["name"], row["scale"]): row["best_seconds"] for row in baseline["results"]}
+    rows = []
+    for row in candidate["results"]:
+        key = (row["name"], row["scale"])
+        if key not in base_times or not base_times[key]:
+            continue
+        ratio = row["best_seconds"] / base_times[key]
+        rows.append(
+            {
+                "name": row["name"],
+                "scale": row["scale"],
+                "baseline_seconds": base_times[key],
+                "candidate_seconds": row["best_seconds"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return {
+        "benchmark": "compare",
+        "baseline_revision": baseline.get("git_revision"),
+        "candidate_revision": candidate.get("git_revision"),
+        "threshold": threshold,
+        "regressions": sum(1 for row in rows if row["regression"]),
+        "results": rows,
+    }
+
+
+def synthetic_manifest(article_count: int, keyword_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cycle through every keyword term as a seed so each article picks a real cluster."""
+
+    terms = [kw["term"] for cluster in keyword_data["clusters"] for kw in cluster["keywords"]]
+    return [
+        {
+            "id": f"bench-{index:05d}",
+            "keyword_seed": terms[index % len(terms)],
+            "persona_name": f"Benchmark Persona {index % 7}",
+        }
+        for index in range(article_count)
+    ]
+
+
+def bench_batch(article_count: int, worker_counts: Sequence[int]) -> Dict[str, Any]:
+    config = gsa.load_config()
+    keyword_data = gsa.load_keyword_clusters()
+    entries = synthetic_manifest(article_count, keyword_data)
+
+    runs = []
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = gsa.run_batch(entries, Path(tmp), config, keyword_data, workers=workers)
+        runs.append(
+            {
+                "workers": summary["workers"],
+                "elapsed_seconds": summary["elapsed_seconds"],
+                "articles_per_second": summary["articles_per_second"],
+            }
+        )
+
+    baseline = runs[0]["articles_per_second"] or 0.0
+    for run in runs:
+        run["speedup"] = round(run["articles_per_second"] / baseline, 2) if baseline else None
+    return {"benchmark": "batch", "articles": article_count, "cpu_count": os.cpu_count(), "runs": runs}
+
+
+def synthetic_outline(section_count: int, themes_per_section: int) -> List[Dict[str, Any]]:
+    """Cycle the real outline's headings and themes into a longer outline."""
+
+    sections = gsa.load_config()["stage2"]["outline"]["sections"]
+    themes = [theme for section in sections for theme in section["themes"]]
+    return [
+        {
+            "heading": f"{sections[index % len(sections)]['heading']} ({index + 1})",
+            "themes": [themes[(index + offset) % len(themes)] for offset in range(themes_per_section)],
+        }
+        for index in range(section_count)
+    ]
+
+
+def bench_sections(section_count: int, themes_per_section: int, worker_counts: Sequence[int]) -> Dict[str, Any]:
+    config = gsa.load_config()
+    context = {
+        "persona_name": config["stage1"]["persona"]["name"],
+        "product": config["product"],
+        "primary_keyword": "phrases to make him obsessed",
+        "winning_cluster": gsa.cluster_metrics(gsa.load_keyword_clusters()["clusters"][0]),
+    }
+    outline = synthetic_outline(section_count, themes_per_section)
+    expected = gsa.render_sections(outline, context)
+
+    runs = []
+    for executor in gsa.RENDER_EXECUTORS:
+        for workers in [1] if executor == "serial" else worker_counts:
+            started = time.perf_counter()
+            rendered = gsa.render_sections(outline, context, executor=executor, workers=workers)
+            elapsed = time.perf_counter() - started
+            if rendered != expected:
+                raise AssertionError(f"{executor} rendering with {workers} workers changed the output")
+            runs.append({"executor": executor, "workers": workers, "elapsed_seconds": round(elapsed, 6)})
+
+    baseline = runs[0]["elapsed_seconds"]
+    for run in runs:
+        run["speedup"] = round(baseline / run["elapsed_seconds"], 2) if run["elapsed_seconds"] else None
+    return {
+        "benchmark": "sections",
+        "sections": section_count,
+        "themes_per_section": themes_per_section,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+
+
+def synthetic_platforms(platform_count: int, posts_per_platform: int) -> Dict[str, Dict[str, Any]]:
+    """Cycle the real Stage 3 platforms into ``platform_count`` platforms with longer concept lists."""
+
+    platforms = list(gsa.load_config()["stage3"]["platforms"].items())
+    concepts = [concept for _, details in platforms for concept in details.get("concepts", [])] or ["Concept"]
+    result = {}
+    for index in range(platform_count):
+        name, details = platforms[index % len(platforms)]
+        result[f"{name} {index + 1}"] = {
+            **details,
+            "concepts": [f"{concepts[post % len(concepts)]} #{post + 1}" for post in range(posts_per_platform)],
+        }
+    return result
+
+
+def bench_platforms(platform_count: int, posts_per_platform: int, worker_counts: Sequence[int]) -> Dict[str, Any]:
+    """Render every platform's plan as its own unit, then merge, by executor and worker count."""
+
+    prompts = gsa.load_config()["stage3"]["prompts"]
+    platforms = synthetic_platforms(platform_count, posts_per_platform)
+    slugs = ["benchmark-article"] * len(platforms)
+
+    def render(executor: str, workers: int) -> str:
+        sections = gsa.executor_map(
+            gsa.render_platform_plan, platforms, platforms.values(), slugs, executor=executor, workers=workers
+        )
+        return gsa.templates().render("stage3_cross_platform_distribution.md", prompts=prompts, sections=sections)
+
+    expected = render("serial", 1)
+    runs = []
+    for executor in gsa.RENDER_EXECUTORS:
+        for workers in [1] if executor == "serial" else worker_counts:
+            started = time.perf_counter()
+            rendered = render(executor, workers)
+            elapsed = time.perf_counter() - started
+            if rendered != expected:
+                raise AssertionError(f"{executor} rendering with {workers} workers changed the merged plan")
+            runs.append({"executor": executor, "workers": workers, "elapsed_seconds": round(elapsed, 6)})
+
+    baseline = runs[0]["elapsed_seconds"]
+    for run in runs:
+        run["speedup"] = round(baseline / run["elapsed_seconds"], 2) if run["elapsed_seconds"] else None
+    return {
+        "benchmark": "platforms",
+        "platforms": platform_count,
+        "posts_per_platform": posts_per_platform,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+
+
+def synthetic_documents(count: int, words: int, seed: int = 0) -> List[str]:
+    """``count`` random documents of ``words`` words drawn from the sample post's vocabulary."""
+
+    rng = random.Random(seed)
+    vocabulary = sorted(set(tokenizer.tokenize(synthetic_article(1)).lowered_words))
+    return [" ".join(rng.choices(vocabulary, k=words)) for _ in range(count)]
+
+
+def bench_duplicates(document_count: int, query_count: int, words: int, edit_rate: float) -> Dict[str, Any]:
+    """Index ``document_count`` drafts, then look up edited copies of ``query_count`` of them.
+
+    Each query rewrites ``edit_rate`` of a stored document's words; recall is the share of
+    queries whose source document comes back above the default threshold. The full scan
+    scores every stored signature, as a pairwise comparison would.
+    """
+
+    documents = synthetic_documents(document_count, words)
+    index = near_duplicates.NearDuplicateIndex()
+    started = time.perf_counter()
+    for number, text in enumerate(documents):
+        index.add(f"doc-{number:06d}", text)
+    index_seconds = time.perf_counter() - started
+
+    rng = random.Random(1)
+    sources = rng.sample(range(document_count), min(query_count, document_count))
+    queries = []
+    for source in sources:
+        tokens = documents[source].split()
+        for position in rng.sample(range(len(tokens)), int(len(tokens) * edit_rate)):
+            tokens[position] = f"edit{position}"
+        queries.append((f"doc-{source:06d}", index.signature(" ".join(tokens))))
+
+    started = time.perf_counter()
+    found = 0
+    candidate_total = 0
+    for source_id, signature in queries:
+        candidate_total += len(index.candidates(signature))
+        found += any(doc_id == source_id for doc_id, _ in index.query_signature(signature))
+    query_seconds = time.perf_counter() - started
+
+    scan_queries = queries[: max(1, min(len(queries), 20))]
+    started = time.perf_counter()
+    for _, signature in scan_queries:
+        sorted(
+            (near_duplicates.estimate_similarity(signature, stored), doc_id)
+            for doc_id, stored in index.signatures.items()
+        )
+    scan_seconds = (time.perf_counter() - started) / len(scan_queries)
+
+    lsh_seconds = query_seconds / len(queries)
+    return {
+        "benchmark": "duplicates",
+        "documents": document_count,
+        "words_per_document": words,
+        "queries": len(queries),
+        "edit_rate": edit_rate,
+        "index_seconds": round(index_seconds, 3),
+        "documents_per_second": round(document_count / index_seconds, 1),
+        "lsh_query_seconds": round(lsh_seconds, 6),
+        "mean_candidates": round(candidate_total / len(queries), 2),
+        "recall": round(found / len(queries), 4),
+        "full_scan_query_seconds": round(scan_seconds, 6),
+        "speedup": round(scan_seconds / lsh_seconds, 1) if lsh_seconds else None,
+    }
+
+
+def bench_contexts(scale: int, field: str) -> Dict[str, Any]:
+    """Size and load time of every stage's context, as ``json.dumps(indent=2)`` and compact.
+
+    Loads run from bytes already in memory, so the timings compare decoding only. ``full``
+    decodes every field into a dict; ``field`` reads the one named field, which the compact
+    format does without decoding the rest. ``delta_bytes`` is the stage's delta against the
+    previous stage's context, as ``--context-format delta`` writes it.
+    """
+
+    config = gsa.load_config()
+    keyword_data = synthetic_keyword_data(scale)
+    stages = []
+    parent_path = None
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        gsa.run_pipeline(
+            output_root=Path(tmp),
+            config=config,
+            keyword_data=keyword_data,
+            shared_context=Path(tmp) / "context.json",
+            checkpoint="each",
+            force=True,
+        )
+        for stage in gsa.STAGE_ORDER:
+            context_path = Path(tmp) / stage / "context.json"
+            encoded = context_path.read_bytes()
+            compact = context_format.encode_context(json.loads(encoded), "compact")
+            delta = context_chain.encode_delta(
+                json.loads(encoded),
+                context_path.with_name("context.delta.json"),
+                stage=stage,
+                parent=json.loads(parent_path.read_bytes()) if parent_path else None,
+                parent_path=parent_path,
+            )
+            parent_path = context_path
+            assert context_format.decode_context(compact).to_dict() == json.loads(encoded)
+            json_full = time_callable(lambda: json.loads(encoded))["best_seconds"]
+            compact_full = time_callable(lambda: context_format.decode_context(compact).to_dict())["best_seconds"]
+            json_field = time_callable(lambda: json.loads(encoded).get(field))["best_seconds"]
+            compact_field = time_callable(lambda: context_format.decode_context(compact).get(field))["best_seconds"]
+            stages.append(
+                {
+                    "stage": stage,
+                    "fields": len(json.loads(encoded)),
+                    "json_bytes": len(encoded),
+                    "compact_bytes": len(compact),
+                    "size_ratio": round(len(compact) / len(encoded), 3),
+                    "delta_bytes": len(delta),
+                    "json_full_seconds": round(json_full, 7),
+                    "compact_full_seconds": round(compact_full, 7),
+                    "full_speedup": round(json_full / compact_full, 2),
+                    "json_field_seconds": round(json_field, 7),
+                    "compact_field_seconds": round(compact_field, 7),
+                    "field_speedup": round(json_field / compact_field, 2),
+                }
+            )
+    totals = {name: sum(entry[name] for entry in stages) for name in ("json_bytes", "compact_bytes", "delta_bytes")}
+    return {"benchmark": "contexts", "scale": scale, "field": field, "stages": stages, "totals": totals}
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--output", type=Path, default=None, help="Write the JSON results to this file")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    suite = subparsers.add_parser(
+        "suite",
+        parents=[common],
+        help="Time the generator hot paths at several input scales",
+    )
+    suite.add_argument(
+        "--only",
+        nargs="+",
+        choices=BENCHMARKS.keys(),
+        default=list(BENCHMARKS),
+        help="Benchmarks to run (default: all)",
+    )
+    suite.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+
+    compare = subparsers.add_parser("compare", parents=[common], help="Compare two suite result files")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("candidate", type=Path)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown reported as a regression (default: %(default)s)",
+    )
+
+    batch = subparsers.add_parser(
+        "batch",
+        parents=[common],
+        help="Articles/second of batch mode by worker count",
+    )
+    batch.add_argument("--articles", type=int, default=48)
+    batch.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Worker counts to compare (default: 1, 2, 4, ... up to the CPU count)",
+    )
+
+    sections = subparsers.add_parser(
+        "sections",
+        parents=[common],
+        help="Stage 2 section rendering time by executor and worker count",
+    )
+    sections.add_argument("--sections", type=int, default=64)
+    sections.add_argument("--themes", type=int, default=40, help="Themes (paragraphs) per section")
+    sections.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Worker counts to compare (default: 1, 2, 4, ... up to the CPU count)",
+    )
+
+    platforms = subparsers.add_parser(
+        "platforms",
+        parents=[common],
+        help="Stage 3 per-platform rendering and merge time by executor and worker count",
+    )
+    platforms.add_argument("--platforms", type=int, default=48)
+    platforms.add_argument("--posts", type=int, default=200, help="Concepts (posts) per platform")
+    platforms.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Worker counts to compare (default: 1, 2, 4, ... up to the CPU count)",
+    )
+
+    duplicates = subparsers.add_parser(
+        "duplicates",
+        parents=[common],
+        help="MinHash/LSH indexing throughput and query latency versus a full scan",
+    )
+    duplicates.add_argument("--documents", type=int, default=100_000)
+    duplicates.add_argument("--queries", type=int, default=200)
+    duplicates.add_argument("--words", type=int, default=150, help="Words per synthetic document")
+    duplicates.add_argument("--edit-rate", dest="edit_rate", type=float, default=0.05, help="Share of words rewritten")
+
+    contexts = subparsers.add_parser(
+        "contexts",
+        parents=[common],
+        help="Per-stage context size and load time, indented JSON versus compact",
+    )
+    contexts.add_argument("--scale", type=int, default=1, help="Keyword data scale the contexts are generated at")
+    contexts.add_argument("--field", default="primary_keyword", help="Field read by the single-field timing")
+    return parser.parse_args(argv)
+
+
+def default_worker_counts() -> List[int]:
+    cpu_count = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpu_count:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpu_count:
+        counts.append(cpu_count)
+    return counts
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv or sys.argv[1:])
+    exit_code = 0
+    if args.benchmark == "suite":
+        result = run_suite(args.only, args.scales)
+    elif args.benchmark == "compare":
+        result = compare_results(
+            json.loads(args.baseline.read_text(encoding="utf-8")),
+            json.loads(args.candidate.read_text(encoding="utf-8")),
+            threshold=args.threshold,
+        )
+        exit_code = 1 if result["regressions"] else 0
+    elif args.benchmark == "sections":
+        result = bench_sections(args.sections, args.themes, args.workers or default_worker_counts())
+    elif args.benchmark == "platforms":
+        result = bench_platforms(args.platforms, args.posts, args.workers or default_worker_counts())
+    elif args.benchmark == "duplicates":
+        result = bench_duplicates(args.documents, args.queries, args.words, args.edit_rate)
+    elif args.benchmark == "contexts":
+        result = bench_contexts(args.scale, args.field)
+    else:
+        result = bench_batch(args.articles, args.workers or default_worker_counts())
+
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Stage contexts stored as deltas against their parent context.
+
+With ``--context-format delta`` each stage writes ``context.delta.json`` holding only the
+top-level keys it added or changed (and the ones it removed), the hash of the full context
+and the path and hash of the parent context it was derived from. The shared context path
+becomes a pointer to the latest stage's delta. A parent can be a delta, a JSON or a compact
+context; Stage 1 (or a stage whose parent was never written) stores its whole context.
+
+:func:`resolve_context` replays a chain back to its root and checks every parent against the
+hash its child recorded, so a regenerated parent is reported instead of silently mixed in.
+Resolved contexts are cached by file, so resolving Stage 5 after Stage 4 only applies one
+delta. :func:`context_history` lists the chain for debugging::
+
+    python scripts/python/context_chain.py artifacts/stage5/context.delta.json
+    python scripts/python/context_chain.py artifacts/context.delta.json --stage stage2
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+DELTA_KEY = "context_delta"
+DELTA_VERSION = 1
+CONTEXT_CACHE_SIZE = 64
+MAX_CHAIN_LENGTH = 64
+
+
+def context_hash(context: Mapping[str, Any]) -> str:
+    encoded = json.dumps(dict(context), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def is_delta(data: Any) -> bool:
+    return isinstance(data, dict) and DELTA_KEY in data
+
+
+def _is_pointer(record: Mapping[str, Any]) -> bool:
+    return bool(record.get("pointer"))
+
+
+def _read_record(path: Path) -> Dict[str, Any] | None:
+    """The delta record at ``path``, or ``None`` when it holds a full context."""
+
+    data = path.read_bytes()
+    if not data.lstrip().startswith(b"{"):
+        return None
+    record = json.loads(data)
+    if not is_delta(record):
+        return None
+    if record[DELTA_KEY] != DELTA_VERSION:
+        raise ValueError(f"{path}: unsupported context delta version {record[DELTA_KEY]!r}.")
+    return record
+
+
+def _parent_of(path: Path, record: Mapping[str, Any]) -> Path:
+    return Path(os.path.normpath(path.parent / record["parent_path"]))
+
+
+def canonical_context_path(path: Path) -> Path:
+    """Follow pointers (the shared context) to the stage context they stand for."""
+
+    path = Path(path)
+    for _ in range(MAX_CHAIN_LENGTH):
+        record = _read_record(path) if path.exists() else None
+        if record is None or not _is_pointer(record):
+            return path
+        path = _parent_of(path, record)
+    raise ValueError(f"{path}: context pointers form a cycle.")
+
+
+def _relative(target: Path, location: Path) -> str:
+    """``target`` relative to ``location``'s directory, so a chain survives moving its root."""
+
+    try:
+        return os.path.relpath(target, Path(location).parent)
+    except ValueError:  # different drives on Windows
+        return str(Path(target).resolve())
+
+
+def _record_bytes(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, indent=2).encode("utf-8")
+
+
+def encode_delta(
+    context: Mapping[str, Any],
+    location: Path,
+    *,
+    stage: str | None = None,
+    parent: Mapping[str, Any] | None = None,
+    parent_path: Path | None = None,
+) -> bytes:
+    """Serialize ``context`` as a delta against ``parent``, which was read from ``parent_path``.
+
+    Without a parent on disk (or when the parent is ``location`` itself) every key is stored.
+    """
+
+    if parent_path is not None:
+        parent_path = canonical_context_path(parent_path)
+        if not parent_path.exists() or parent_path.resolve() == Path(location).resolve():
+            parent_path = None
+    if parent is None or parent_path is None:
+        parent, parent_path = {}, None
+    record: Dict[str, Any] = {
+        DELTA_KEY: DELTA_VERSION,
+        "stage": stage,
+        "hash": context_hash(context),
+        "parent": context_hash(parent) if parent_path is not None else None,
+        "parent_path": _relative(parent_path, location) if parent_path is not None else None,
+        "set": {key: value for key, value in context.items() if key not in parent or parent[key] != value},
+        "removed": [key for key in parent if key not in context],
+    }
+    return _record_bytes(record)
+
+
+def encode_pointer(target: Path, location: Path) -> bytes:
+    """A pointer at ``location`` to the delta at ``target``: same hash, nothing set or removed."""
+
+    target = canonical_context_path(target)
+    record = _read_record(target)
+    if record is None:
+        raise ValueError(f"{target} is not a context delta.")
+    return _record_bytes(
+        {
+            DELTA_KEY: DELTA_VERSION,
+            "stage": record["stage"],
+            "pointer": True,
+            "hash": record["hash"],
+            "parent": record["hash"],
+            "parent_path": _relative(target, location),
+            "set": {},
+            "removed": [],
+        }
+    )
+
+
+def _file_stamp(path: Path) -> Tuple[int, int, int]:
+    stat = path.stat()
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+_FileKey = Tuple[str, Tuple[int, int, int]]
+_RECORDS: "OrderedDict[_FileKey, Dict[str, Any] | None]" = OrderedDict()
+_RESOLVED: "OrderedDict[Tuple[_FileKey, ...], Tuple[str, bytes]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_MISSING = object()
+
+
+def _cached(cache: "OrderedDict[Any, Any]", key: Any) -> Any:
+    with _CACHE_LOCK:
+        if key not in cache:
+            return _MISSING
+        cache.move_to_end(key)
+        return cache[key]
+
+
+def _remember(cache: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+    with _CACHE_LOCK:
+        cache[key] = value
+        while len(cache) > CONTEXT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _chain(path: Path) -> List[Tuple[_FileKey, Dict[str, Any] | None]]:
+    """``path`` and its ancestors (head first) with their records; a full context ends the chain."""
+
+    chain: List[Tuple[_FileKey, Dict[str, Any] | None]] = []
+    current: Path | None = Path(os.path.abspath(path))
+    while current is not None:
+        if len(chain) > MAX_CHAIN_LENGTH:
+            raise ValueError(f"{path}: context chain is longer than {MAX_CHAIN_LENGTH} (or forms a cycle).")
+        key = (str(current), _file_stamp(current))
+        record = _cached(_RECORDS, key)
+        if record is _MISSING:
+            record = _read_record(current)
+            _remember(_RECORDS, key, record)
+        chain.append((key, record))
+        current = _parent_of(current, record) if record is not None and record["parent_path"] is not None else None
+    return chain
+
+
+def _resolved(path: Path) -> Tuple[str, bytes]:
+    """Hash and marshalled full context of ``path``.
+
+    Results are cached under the versions of every file in the chain, so editing any ancestor
+    invalidates its descendants. Resolving replays only the deltas below the deepest cached level.
+    """
+
+    chain = _chain(path)
+    files = [key for key, _ in chain]
+    start = len(chain)
+    entry = None
+    for level in range(len(chain)):
+        cached = _cached(_RESOLVED, tuple(files[level:]))
+        if cached is not _MISSING:
+            start, entry = level, cached
+            break
+
+    context: Dict[str, Any] = marshal.loads(entry[1]) if entry is not None else {}
+    for level in range(start - 1, -1, -1):
+        key, record = chain[level]
+        if record is None:
+            from context_format import read_context
+
+            context = read_context(Path(key[0]))
+            entry = (context_hash(context), marshal.dumps(context))
+        else:
+            if record["parent_path"] is not None and (entry is None or entry[0] != record["parent"]):
+                raise ValueError(f"{key[0]}: its parent context changed since this stage was written.")
+            for name in record["removed"]:
+                context.pop(name, None)
+            context.update(record["set"])
+            entry = (record["hash"], marshal.dumps(context))
+        _remember(_RESOLVED, tuple(files[level:]), entry)
+    assert entry is not None
+    return entry
+
+
+def resolve_context(path: Path) -> Dict[str, Any]:
+    """Rebuild the full context at ``path`` (a delta, pointer or full context) as a fresh dict."""
+
+    return marshal.loads(_resolved(Path(path))[1])
+
+
+def context_history(path: Path) -> List[Dict[str, Any]]:
+    """The chain behind ``path``, root first: each stage's file, hash and the keys it set or removed."""
+
+    history: List[Dict[str, Any]] = []
+    current: Path | None = canonical_context_path(path)
+    while current is not None:
+        if len(history) > MAX_CHAIN_LENGTH:
+            raise ValueError(f"{path}: context chain is longer than {MAX_CHAIN_LENGTH} (or forms a cycle).")
+        record = _read_record(current)
+        if record is None:
+            history.append({"path": str(current), "stage": None, "hash": _resolved(current)[0]})
+            break
+        history.append(
+            {
+                "path": str(current),
+                "stage": record["stage"],
+                "hash": record["hash"],
+                "parent": record["parent"],
+                "set": sorted(record["set"]),
+                "removed": record["removed"],
+            }
+        )
+        current = canonical_context_path(_parent_of(current, record)) if record["parent_path"] is not None else None
+    history.reverse()
+    return history
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("context", type=Path, help="Context file: a delta, the shared pointer or a full context")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--resolve", action="store_true", help="Print the full resolved context")
+    mode.add_argument("--stage", default=None, help="Print the full context as of this stage of the chain")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.resolve:
+        result: Any = resolve_context(args.context)
+    elif args.stage:
+        matches = [entry for entry in context_history(args.context) if entry["stage"] == args.stage]
+        if not matches:
+            raise SystemExit(f"No {args.stage} context in the chain behind {args.context}.")
+        result = resolve_context(Path(matches[-1]["path"]))
+    else:
+        result = context_history(args.context)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
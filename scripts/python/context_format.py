@@ -0,0 +1,221 @@
+"""Read and write stage contexts as indented JSON or in a compact binary format.
+
+The compact format stores every top-level field as its own ``marshal`` record behind a small
+header of offsets, so a reader decodes only the fields it touches. Subtrees that occur more
+than once in the context (the winning cluster is also the first entry of ``clusters``, for
+example) are stored once in a shared section and referenced by path. Readers detect the format
+from the file's leading bytes, so either can sit behind any file name. The third format,
+``delta``, stores only what a stage changed; see :mod:`context_chain`.
+
+Layout::
+
+    MAGIC | Python major, minor (1 byte each) | header length (4 bytes, little endian)
+          | marshal header | field and shared records
+
+``marshal`` data is only guaranteed to load on the Python version that wrote it, so the writer's
+version is recorded ahead of any marshal bytes. Reading a compact context written by another
+version raises :class:`IncompatibleContextError`: a stage's cached context is then rebuilt, and
+the keyword index skips the file in favour of any JSON copy of the same article.
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+import sys
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+CONTEXT_FORMATS = ("json", "compact", "delta")
+CONTEXT_FILENAMES = {"json": "context.json", "compact": "context.ctx", "delta": "context.delta.json"}
+COMPACT_VERSION = 2
+MAGIC_PREFIX = b"BWCTX\x00"
+MAGIC = MAGIC_PREFIX + bytes([COMPACT_VERSION]) + b"\n"
+PYTHON_VERSION = bytes(sys.version_info[:2])
+SHARE_MIN_BYTES = 128  # smaller repeated subtrees cost less inline than as references
+
+_Ref = Tuple[Tuple[Any, ...], int]  # path of a placeholder, index of the shared record it stands for
+_Record = Tuple[int, int, List[_Ref]]  # offset, length, refs
+
+
+class IncompatibleContextError(ValueError):
+    """A compact context this interpreter cannot decode (another format or Python version)."""
+
+
+def context_filename(context_format: str) -> str:
+    if context_format not in CONTEXT_FORMATS:
+        raise ValueError(f"Context format must be one of {', '.join(CONTEXT_FORMATS)}.")
+    return CONTEXT_FILENAMES[context_format]
+
+
+def _children(value: Any) -> Iterator[Tuple[Any, Any]]:
+    if isinstance(value, dict):
+        return iter(value.items())
+    if isinstance(value, list):
+        return enumerate(value)
+    return iter(())
+
+
+class _Encoder:
+    def __init__(self, context: Mapping[str, Any]) -> None:
+        self.counts: Counter[bytes] = Counter()
+        self.shared_ids: Dict[bytes, int] = {}
+        self.shared: List[Tuple[bytes, List[_Ref]]] = []
+        for value in context.values():
+            self.count(value)
+
+    def key(self, value: Any) -> bytes | None:
+        if not isinstance(value, (dict, list)):
+            return None
+        # Version 2 writes no back-references, so equal subtrees always encode to equal bytes.
+        encoded = marshal.dumps(value, 2)
+        return encoded if len(encoded) >= SHARE_MIN_BYTES else None
+
+    def count(self, value: Any) -> None:
+        key = self.key(value)
+        if key is not None:
+            self.counts[key] += 1
+            if self.counts[key] > 1:
+                return  # a repeat: its own subtrees were counted at the first occurrence
+        for _, child in _children(value):
+            self.count(child)
+
+    def encode(self, value: Any, shareable: bool = True) -> Tuple[bytes, List[_Ref]]:
+        """Marshal ``value`` with repeated subtrees (``value`` itself too, if ``shareable``) stripped."""
+
+        refs: List[_Ref] = []
+        stripped = self.strip(value, (), refs, top=not shareable)
+        return marshal.dumps(stripped), refs
+
+    def strip(self, value: Any, path: Tuple[Any, ...], refs: List[_Ref], top: bool = False) -> Any:
+        """Copy ``value`` with repeated subtrees replaced by ``None`` placeholders listed in ``refs``."""
+
+        key = None if top else self.key(value)
+        if key is not None and self.counts[key] > 1:
+            index = self.shared_ids.get(key)
+            if index is None:
+                index = self.shared_ids[key] = len(self.shared)
+                self.shared.append((b"", []))
+                self.shared[index] = self.encode(value, shareable=False)
+            refs.append((path, index))
+            return None
+        if isinstance(value, dict):
+            return {name: self.strip(child, path + (name,), refs) for name, child in value.items()}
+        if isinstance(value, list):
+            return [self.strip(child, path + (index,), refs) for index, child in enumerate(value)]
+        return value
+
+
+def encode_compact(context: Mapping[str, Any]) -> bytes:
+    encoder = _Encoder(context)
+    chunks: List[bytes] = []
+    offset = 0
+
+    def place(data: bytes) -> Tuple[int, int]:
+        nonlocal offset
+        chunks.append(data)
+        offset += len(data)
+        return offset - len(data), len(data)
+
+    fields: Dict[str, _Record] = {}
+    for name, value in context.items():
+        data, refs = encoder.encode(value)
+        fields[name] = (*place(data), refs)
+    shared = [(*place(data), refs) for data, refs in encoder.shared]
+    header = marshal.dumps({"version": COMPACT_VERSION, "fields": fields, "shared": shared})
+    return b"".join([MAGIC, PYTHON_VERSION, len(header).to_bytes(4, "little"), header, *chunks])
+
+
+def encode_context(context: Mapping[str, Any], context_format: str = "json") -> bytes:
+    """Serialize ``context``; ``"json"`` matches the historical ``json.dumps(indent=2)`` output."""
+
+    context_filename(context_format)
+    if context_format == "compact":
+        return encode_compact(context)
+    if context_format == "delta":
+        raise ValueError("Delta contexts depend on their parent; write them with context_chain.encode_delta.")
+    return json.dumps(dict(context), indent=2).encode("utf-8")
+
+
+class CompactContext(Mapping):
+    """Read-only mapping over a compact context that decodes each field on first access.
+
+    Every access to a shared subtree decodes a fresh copy, so, as with ``json.load``, no two
+    fields alias the same object.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        if not data.startswith(MAGIC_PREFIX):
+            raise ValueError("Not a compact context.")
+        if not data.startswith(MAGIC):
+            raise IncompatibleContextError(f"Unsupported compact context version: {data[len(MAGIC_PREFIX)]!r}.")
+        written_by = data[len(MAGIC) : len(MAGIC) + 2]
+        if written_by != PYTHON_VERSION:
+            writer = ".".join(map(str, written_by))
+            raise IncompatibleContextError(
+                f"Compact context written by Python {writer}, which Python {sys.version_info[0]}."
+                f"{sys.version_info[1]} cannot read; regenerate it (or use --context-format json)."
+            )
+        start = len(MAGIC) + 2 + 4
+        header_length = int.from_bytes(data[start - 4 : start], "little")
+        header = marshal.loads(data[start : start + header_length])
+        self._view = memoryview(data)[start + header_length :]
+        self._fields: Dict[str, _Record] = header["fields"]
+        self._shared: List[_Record] = header["shared"]
+        self._decoded: Dict[str, Any] = {}
+
+    def _decode(self, record: _Record) -> Any:
+        offset, length, refs = record
+        value = marshal.loads(self._view[offset : offset + length])
+        for path, index in refs:
+            if not path:
+                return self._decode(self._shared[index])
+            parent = value
+            for step in path[:-1]:
+                parent = parent[step]
+            parent[path[-1]] = self._decode(self._shared[index])
+        return value
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._decoded:
+            self._decoded[name] = self._decode(self._fields[name])
+        return self._decoded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: self[name] for name in self._fields}
+
+    copy = to_dict
+
+
+def decode_context(data: bytes) -> Mapping[str, Any]:
+    """A lazy :class:`CompactContext` for compact data, else the parsed JSON object."""
+
+    if data.startswith(MAGIC_PREFIX):
+        return CompactContext(data)
+    return json.loads(data)
+
+
+def open_context(path: Path) -> Mapping[str, Any]:
+    """Open a context file of any format; compact fields are decoded on access, deltas resolved."""
+
+    context = decode_context(Path(path).read_bytes())
+    if "context_delta" in context:
+        from context_chain import resolve_context
+
+        return resolve_context(path)
+    return context
+
+
+def read_context(path: Path) -> Dict[str, Any]:
+    """Load a context file of any format into a plain dict."""
+
+    context = open_context(path)
+    return context.to_dict() if isinstance(context, CompactContext) else context
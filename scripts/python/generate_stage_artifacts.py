@@ -6,40 +6,256 @@ from __future__ import annotations
 import argparse
 import json
 import math
-import re
-import statistics
-from datetime import datetime
+import os
+import time
+from array import array
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from textwrap import fill
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple
+
+from tokenizer import TokenizedText, phrase_tokens, slugify, tokenize
+
+if TYPE_CHECKING:
+    import logging
+
+    from template_engine import TemplateLoader
+
+# Everything else (logging, the artifact store, profiler, templates, context formats, pools,
+# hashing) is imported where it is first used, so ``--help`` and library imports stay cheap.
 
 ROOT = Path(__file__).resolve().parents[2]
 CONFIG_PATH = ROOT / "config" / "blog_post_workflow.json"
 KEYWORD_DATA_PATH = ROOT / "data" / "keyword_clusters.json"
 CONTEXT_SHARED_PATH = ROOT / "artifacts" / "context.json"
+TEMPLATE_DIR = ROOT / "templates"
+SNAPSHOT_DIR = ROOT / ".cache" / "snapshots"
+KEYWORD_INDEX_PATH = ROOT / ".cache" / "keyword_index.json"
+
+SYLLABLE_CACHE_SIZE = 65536
+RENDER_EXECUTORS = ("serial", "threads", "processes")
+STEP7_HEADING_ATTRIBUTES = {2: ' style="text-align:center;"'}
+SECTION_PARAGRAPH_STYLE = {
+    "tone": "warm and authoritative",
+    "cta": "Invite him into the next moment with a confident, heart-led ask.",
+}
+VARIANT_DENSITY_TARGET = (1.0, 2.0)
+VARIANT_GRADE_TARGET = (6.0, 8.0)
+
+CONVERSION_WEIGHTS = {"High": 3.0, "Medium": 2.0, "Low": 1.0}
+DEFAULT_CTR_ESTIMATE = 0.12
+TOP_KEYWORD_COUNT = 3
+DEFAULT_TOP_CLUSTERS = 50
+JSON_LINES_SUFFIXES = {".jsonl", ".ndjson"}
+JSON_STREAM_CHUNK_SIZE = 1 << 20
+SNAPSHOT_FORMAT = 2
+
+
+@lru_cache(maxsize=None)
+def templates() -> TemplateLoader:
+    """The artifact template loader, built on first use."""
+
+    from template_engine import TemplateLoader
+
+    return TemplateLoader(TEMPLATE_DIR)
+
+
+@lru_cache(maxsize=None)
+def _logger() -> logging.Logger:
+    import logging
+
+    return logging.getLogger(__name__)
+
+
+def _snapshot_path(path: Path, snapshot_dir: Path) -> Path:
+    """One snapshot per source file name: a source with the same name elsewhere replaces it."""
+
+    return snapshot_dir / f"{path.name}.marshal"
+
+
+def _prune_legacy_snapshots(path: Path, snapshot_dir: Path) -> None:
+    # Format 1 keyed snapshots by the source's absolute path, leaving one file per location.
+    for legacy in snapshot_dir.glob(f"{path.stem}-????????????????.marshal"):
+        legacy.unlink(missing_ok=True)
+
+
+def load_json_snapshot(path: Path, snapshot_dir: Path | None = SNAPSHOT_DIR) -> Any:
+    """Parse the JSON document at ``path``, reusing a ``marshal`` snapshot of the parsed value.
+
+    A snapshot is trusted while it was taken of the same source path and the source's size and
+    mtime match; if only the mtime moved, the recorded SHA-256 of the source revalidates it
+    without parsing. Missing, stale or unreadable snapshots fall back to ``json`` and are
+    rewritten in place, so the directory holds one snapshot per source name. ``snapshot_dir=None``
+    disables snapshots.
+    """
+
+    import hashlib
+    import marshal
+
+    from artifact_store import write_if_changed
+
+    if snapshot_dir is None:
+        with path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+    stat = path.stat()
+    source_path = str(path.resolve())
+    snapshot_path = _snapshot_path(path, snapshot_dir)
+    try:
+        version, snapshot_source, mtime_ns, size, digest, value = marshal.loads(snapshot_path.read_bytes())
+    except (OSError, EOFError, TypeError, ValueError):
+        version = None
+    if version == SNAPSHOT_FORMAT and snapshot_source == source_path and size == stat.st_size:
+        if mtime_ns == stat.st_mtime_ns:
+            return value
+        source = path.read_bytes()
+        current = hashlib.sha256(source).hexdigest() == digest
+    else:
+        source, current = path.read_bytes(), False
+    if not current:
+        digest = hashlib.sha256(source).hexdigest()
+        value = json.loads(source)
+    snapshot = marshal.dumps((SNAPSHOT_FORMAT, source_path, stat.st_mtime_ns, stat.st_size, digest, value))
+    try:
+        ensure_directory(snapshot_dir)
+        write_if_changed(snapshot_path, snapshot)
+        _prune_legacy_snapshots(path, snapshot_dir)
+    except OSError as exc:
+        _logger().debug("Could not write JSON snapshot %s: %s", snapshot_path, exc)
+    return value
 
 
 def load_config() -> Dict[str, Any]:
-    with CONFIG_PATH.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return load_json_snapshot(CONFIG_PATH, SNAPSHOT_DIR)
 
 
 def load_keyword_clusters() -> Dict[str, Any]:
-    with KEYWORD_DATA_PATH.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return load_json_snapshot(KEYWORD_DATA_PATH, SNAPSHOT_DIR)
+
+
+def load_keyword_data(
+    path: Path = KEYWORD_DATA_PATH,
+    *,
+    top_k: int | None = None,
+    keyword_seed: str | Sequence[str] | None = None,
+    snapshot_dir: Path | None = SNAPSHOT_DIR,
+) -> Dict[str, Any]:
+    """Load keyword clusters, streaming JSON Lines exports or whenever ``top_k`` bounds the result.
+
+    When streaming, pass every seed Stage 1 will use (a batch passes its manifest's seeds) so
+    each seed's best cluster survives the ``top_k`` cut.
+    """
+
+    if not streams_keyword_data(path, top_k):
+        return load_json_snapshot(path, snapshot_dir)
+    return stream_keyword_clusters(path, top_k or DEFAULT_TOP_CLUSTERS, keyword_seed)
+
+
+def streams_keyword_data(path: Path, top_k: int | None = None) -> bool:
+    """Whether :func:`load_keyword_data` streams ``path`` (and so keeps only its best clusters)."""
+
+    return top_k is not None or path.suffix in JSON_LINES_SUFFIXES
+
+
+class _IncrementalJsonReader:
+    """Decode consecutive JSON values from a text stream while buffering about one chunk."""
+
+    def __init__(self, handle: TextIO, chunk_size: int = JSON_STREAM_CHUNK_SIZE) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ("" at end of input)."""
+
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos : self.pos + 1]
+
+    def expect(self, *chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Malformed keyword data: expected one of {chars!r}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self._fill():
+                    raise
+                continue
+            # A number may end exactly at the chunk boundary; only trust it once more input is seen.
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_keyword_clusters(path: Path, chunk_size: int = JSON_STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield clusters one at a time from a JSON Lines file or a ``{"clusters": [...]}`` document.
+
+    A bare top-level array of clusters is accepted too. Only the cluster being decoded is held in
+    memory, so arbitrarily large exports stream in bounded space.
+    """
+
+    with path.open("r", encoding="utf-8") as fh:
+        if path.suffix in JSON_LINES_SUFFIXES:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        reader = _IncrementalJsonReader(fh, chunk_size)
+        if reader.expect("{", "[") == "[":
+            yield from _iter_json_array(reader)
+            return
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "clusters":
+                reader.expect("[")
+                yield from _iter_json_array(reader)
+            else:
+                reader.value()
+            if reader.expect(",", "}") == "}":
+                return
+
+
+def _iter_json_array(reader: _IncrementalJsonReader) -> Iterator[Any]:
+    """Yield the items of an array whose opening bracket has already been consumed."""
+
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",", "]") == "]":
+            return
 
 
 def ensure_directory(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def slugify(value: str) -> str:
-    value = value.lower()
-    value = re.sub(r"[^a-z0-9]+", "-", value)
-    value = re.sub(r"-+", "-", value)
-    return value.strip("-")
-
-
 def clean_sentence(text: str) -> str:
     text = text.strip()
     if not text:
@@ -67,14 +283,15 @@ def cluster_metrics(cluster: Dict[str, Any]) -> Dict[str, Any]:
     keywords = cluster["keywords"]
     volumes = [kw["volume"] for kw in keywords]
     difficulties = [kw["difficulty"] for kw in keywords]
-    ctrs = [kw.get("ctr_estimate", 0.12) for kw in keywords]
+    ctrs = [kw.get("ctr_estimate", DEFAULT_CTR_ESTIMATE) for kw in keywords]
     total_volume = sum(volumes)
+    import statistics
+
     avg_difficulty = statistics.mean(difficulties)
     avg_ctr = statistics.mean(ctrs)
-    conv_weight = {"High": 3.0, "Medium": 2.0, "Low": 1.0}
-    weight = conv_weight.get(cluster.get("conversion_potential", "Medium"), 2.0)
+    weight = CONVERSION_WEIGHTS.get(cluster.get("conversion_potential", "Medium"), 2.0)
     score = (total_volume * weight) + (avg_ctr * 1000) - (avg_difficulty * 45)
-    top_keywords = sorted(keywords, key=lambda kw: kw["volume"], reverse=True)[:3]
+    top_keywords = sorted(keywords, key=lambda kw: kw["volume"], reverse=True)[:TOP_KEYWORD_COUNT]
     pinterest_angles = _unique_preserving_order(
         kw.get("pinterest_angle") for kw in keywords
     )
@@ -101,15 +318,291 @@ def cluster_metrics(cluster: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def format_markdown_table(headers: List[str], rows: Iterable[Iterable[str]]) -> str:
-    header_row = " | ".join(headers)
-    separator = " | ".join(["---"] * len(headers))
-    body_rows = [" | ".join(row) for row in rows]
-    return "\n".join([header_row, separator, *body_rows])
+def _exact_mean(values: Sequence[float]) -> float:
+    """``statistics.mean`` without Fractions: an exact integer sum and one rounded division.
+
+    Every int and float is an integer over a power of two, so scaling to the largest
+    denominator keeps the sum exact and ``int / int`` rounds the quotient correctly. An
+    all-int column whose mean is whole stays an int, exactly like ``statistics.mean``.
+    """
+
+    if not values:
+        import statistics
+
+        raise statistics.StatisticsError("mean requires at least one data point")
+    ratios = [value.as_integer_ratio() for value in values]
+    denominator = max(q for _, q in ratios)
+    numerator = sum(p * (denominator // q) for p, q in ratios)
+    if denominator == 1 and numerator % len(values) == 0 and all(type(v) is int for v in values):
+        return numerator // len(values)
+    return numerator / (denominator * len(values))
+
+
+def build_cluster_columns(clusters: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flatten every cluster's keywords into parallel columns sliced by ``offsets``.
+
+    Cluster ``i`` owns rows ``offsets[i]:offsets[i + 1]``.
+    """
+
+    offsets = array("q", [0])
+    volumes: List[Any] = []
+    difficulties: List[Any] = []
+    ctrs: List[Any] = []
+    for cluster in clusters:
+        for kw in cluster["keywords"]:
+            volumes.append(kw["volume"])
+            difficulties.append(kw["difficulty"])
+            ctrs.append(kw.get("ctr_estimate", DEFAULT_CTR_ESTIMATE))
+        offsets.append(len(volumes))
+    try:
+        volume_column: Sequence[Any] = array("q", volumes)
+    except (TypeError, OverflowError):
+        volume_column = volumes
+    return {
+        "offsets": offsets,
+        "volume": volume_column,
+        "difficulty": difficulties,
+        "ctr": ctrs,
+        "weight": array(
+            "d",
+            (CONVERSION_WEIGHTS.get(cluster.get("conversion_potential", "Medium"), 2.0) for cluster in clusters),
+        ),
+    }
+
+
+def score_cluster_columns(columns: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Compute total volume, mean difficulty/CTR and score for every cluster in one pass."""
+
+    offsets = columns["offsets"]
+    volume, difficulty, ctr, weight = columns["volume"], columns["difficulty"], columns["ctr"], columns["weight"]
+    totals: List[Any] = []
+    avg_difficulties: List[Any] = []
+    avg_ctrs: List[Any] = []
+    scores = array("d")
+    for index in range(len(offsets) - 1):
+        start, end = offsets[index], offsets[index + 1]
+        total_volume = sum(volume[start:end])
+        avg_difficulty = _exact_mean(difficulty[start:end])
+        avg_ctr = _exact_mean(ctr[start:end])
+        totals.append(total_volume)
+        avg_difficulties.append(avg_difficulty)
+        avg_ctrs.append(avg_ctr)
+        scores.append((total_volume * weight[index]) + (avg_ctr * 1000) - (avg_difficulty * 45))
+    return {"total_volume": totals, "avg_difficulty": avg_difficulties, "avg_ctr": avg_ctrs, "score": scores}
+
+
+def cluster_metrics_columnar(clusters: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Columnar equivalent of ``[cluster_metrics(c) for c in clusters]`` with identical output.
+
+    Scores are computed over flat keyword columns and each cluster's top keywords come from a
+    partial ``heapq.nlargest`` selection instead of a full sort.
+    """
+
+    import heapq
+
+    columns = build_cluster_columns(clusters)
+    scored = score_cluster_columns(columns)
+    offsets, volume = columns["offsets"], columns["volume"]
+    metrics: List[Dict[str, Any]] = []
+    for index, cluster in enumerate(clusters):
+        keywords = cluster["keywords"]
+        start = offsets[index]
+        top_rows = heapq.nlargest(TOP_KEYWORD_COUNT, range(len(keywords)), key=lambda row: volume[start + row])
+        metrics.append(
+            {
+                "id": cluster["id"],
+                "label": cluster["label"],
+                "core_emotion": cluster.get("core_emotion", ""),
+                "conversion_potential": cluster.get("conversion_potential", "Medium"),
+                "product_compatibility": cluster.get("product_compatibility", ""),
+                "notes": cluster.get("notes", ""),
+                "total_volume": scored["total_volume"][index],
+                "avg_difficulty": scored["avg_difficulty"][index],
+                "avg_ctr": scored["avg_ctr"][index],
+                "score": scored["score"][index],
+                "keywords": keywords,
+                "top_keywords": [keywords[row]["term"] for row in top_rows],
+                "pinterest_angles": _unique_preserving_order(kw.get("pinterest_angle") for kw in keywords),
+                "meta_hooks": _unique_preserving_order(kw.get("meta_hook") for kw in keywords),
+                "emotional_drivers": _unique_preserving_order(kw.get("emotional_driver") for kw in keywords),
+            }
+        )
+    return metrics
+
+
+def top_clusters(clusters: Iterable[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """The ``k`` highest scoring clusters, earliest first among ties (as ``max`` picks)."""
+
+    import heapq
+
+    return heapq.nlargest(k, clusters, key=lambda c: c["score"])
+
+
+def select_winning_cluster(
+    clusters: List[Dict[str, Any]],
+    keyword_seed: str | None = None,
+    covered: Iterable[str] | None = None,
+) -> Dict[str, Any]:
+    """Pick the highest scoring cluster, preferring clusters whose keywords contain ``keyword_seed``.
+
+    Cluster ids in ``covered`` (already targeted by a published article) are passed over. The
+    candidates are heapified and popped best first, so only the covered clusters that outrank
+    the winner are examined; if every candidate is covered the best one is reused.
+    """
+
+    import heapq
+
+    candidates = clusters
+    if keyword_seed:
+        matching = clusters_matching_seed(clusters, keyword_seed)
+        if not matching:
+            _logger().warning("No keyword cluster matches the seed %r; using the best cluster overall.", keyword_seed)
+        candidates = matching or clusters
+    covered = set(covered or ())
+    if covered:
+        ranked = [(-cluster["score"], position) for position, cluster in enumerate(candidates)]
+        heapq.heapify(ranked)
+        while ranked:
+            _, position = heapq.heappop(ranked)
+            if str(candidates[position]["id"]) not in covered:
+                return candidates[position]
+        _logger().warning("Every candidate cluster is covered by a published article; reusing the best one.")
+    return top_clusters(candidates, 1)[0]
+
+
+def published_covered_clusters(
+    clusters: Sequence[Dict[str, Any]],
+    published_dirs: Sequence[Path],
+    *,
+    article_root: Path,
+    shared_context: str | Path | None = None,
+    index_path: Path | None = KEYWORD_INDEX_PATH,
+) -> List[str]:
+    """Clusters targeted by the articles under ``published_dirs``, for ``--skip-covered``.
+
+    The article being generated is not published: contexts under ``article_root`` (its stage
+    directories) and in the shared context files are left out of the scan.
+    """
+
+    from context_format import CONTEXT_FILENAMES
+    from keyword_index import load_keyword_index
+
+    if article_root.name in STAGE_HANDLERS:
+        article_root = article_root.parent  # per-stage layout: <root>/stage1, <root>/stage2, ...
+    shared = [CONTEXT_SHARED_PATH.with_name(name) for name in CONTEXT_FILENAMES.values()]
+    if shared_context:
+        shared.append(Path(shared_context))
+    index = load_keyword_index(clusters, published_dirs, index_path, exclude=[article_root, *shared])
+    return sorted(index.covered_clusters())
+
+
+def _cluster_matches_seed(cluster: Dict[str, Any], seed: str) -> bool:
+    return any(seed in kw["term"].lower() for kw in cluster["keywords"])
+
+
+def clusters_matching_seed(clusters: Sequence[Dict[str, Any]], keyword_seed: str) -> List[Dict[str, Any]]:
+    """The clusters with a keyword containing ``keyword_seed`` (case-insensitive)."""
+
+    seed = keyword_seed.strip().lower()
+    return [cluster for cluster in clusters if _cluster_matches_seed(cluster, seed)]
+
+
+def cluster_score(cluster: Dict[str, Any]) -> float:
+    """Score a single raw cluster exactly as ``cluster_metrics`` would."""
+
+    return score_cluster_columns(build_cluster_columns([cluster]))["score"][0]
+
+
+def stream_keyword_clusters(
+    path: Path,
+    top_k: int,
+    keyword_seed: str | Sequence[str] | None = None,
+    *,
+    chunk_size: int = JSON_STREAM_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Reduce a keyword export to its ``top_k`` clusters by score without loading it whole.
+
+    Clusters are scored as they are parsed and kept in a bounded min-heap, so memory holds at
+    most ``top_k`` clusters (plus the best match for each ``keyword_seed``, which ``stage1``
+    would pick over a higher scoring cluster). Survivors keep their file order so the Stage 1
+    table reads like a smaller export; ``cluster_count`` records how many clusters were scanned.
+    """
+
+    import heapq
+
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    seeds = [keyword_seed] if isinstance(keyword_seed, str) else list(keyword_seed or ())
+    seeds = list(dict.fromkeys(seed.strip().lower() for seed in seeds if seed and seed.strip()))
+    # Entries compare on (score, -index): ties keep the earliest cluster, matching ``max``.
+    heap: List[Tuple[float, int, Dict[str, Any]]] = []
+    best_matches: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+    count = 0
+    for index, cluster in enumerate(iter_keyword_clusters(path, chunk_size)):
+        count += 1
+        entry = (cluster_score(cluster), -index, cluster)
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+        for seed in seeds:
+            best = best_matches.get(seed)
+            if (best is None or entry[:2] > best[:2]) and _cluster_matches_seed(cluster, seed):
+                best_matches[seed] = entry
+
+    kept = {-neg_index: cluster for _, neg_index, cluster in heap}
+    for _, neg_index, cluster in best_matches.values():
+        kept[-neg_index] = cluster
+    return {"clusters": [kept[index] for index in sorted(kept)], "cluster_count": count}
 
 
 def write_text_file(path: Path, content: str) -> None:
-    path.write_text(content.strip() + "\n", encoding="utf-8")
+    from artifact_store import ARTIFACTS
+    from instrumentation import profile
+
+    with profile("file_writes"):
+        ARTIFACTS.write_text(path, content.strip() + "\n")
+
+
+def write_context(
+    args: argparse.Namespace,
+    output_dir: Path,
+    context: Dict[str, Any],
+    *,
+    stage_copy: bool = True,
+    parent: Dict[str, Any] | None = None,
+) -> None:
+    """Write the stage context next to its artifacts and to the shared context path.
+
+    ``--context-format compact`` writes ``context.ctx`` (and, by default, ``artifacts/context.ctx``)
+    in the compact binary format instead of indented JSON. ``--context-format delta`` writes
+    only the keys changed since ``parent`` (read from ``--context``) to ``context.delta.json``,
+    and makes the shared context a pointer to it.
+    """
+
+    from artifact_store import ARTIFACTS, write_if_changed
+    from context_chain import encode_delta, encode_pointer
+    from context_format import context_filename, encode_context
+    from instrumentation import profile
+
+    context_format = getattr(args, "context_format", None) or "json"
+    stage_path = output_dir / context_filename(context_format)
+    shared_path = Path(
+        getattr(args, "shared_context", None) or CONTEXT_SHARED_PATH.with_name(context_filename(context_format))
+    )
+    with profile("json_writes"):
+        ensure_directory(shared_path.parent)
+        if context_format == "delta":
+            if stage_copy:
+                parent_path = Path(args.context) if getattr(args, "context", None) else None
+                payload = encode_delta(context, stage_path, stage=args.stage, parent=parent, parent_path=parent_path)
+                ARTIFACTS.write_bytes(stage_path, payload)
+            write_if_changed(shared_path, encode_pointer(stage_path, shared_path))
+            return
+        payload = encode_context(context, context_format)
+        if stage_copy:
+            ARTIFACTS.write_bytes(stage_path, payload)
+        write_if_changed(shared_path, payload)
 
 
 def summarize_cluster(cluster: Dict[str, Any]) -> str:
@@ -121,27 +614,61 @@ def summarize_cluster(cluster: Dict[str, Any]) -> str:
 
 
 def compute_keyword_density(text: str, keyword: str) -> float:
-    words = re.findall(r"[A-Za-z0-9']+", text.lower())
-    if not words:
-        return 0.0
-    keyword_words = re.findall(r"[A-Za-z0-9']+", keyword.lower())
-    count = 0
-    for i in range(len(words) - len(keyword_words) + 1):
-        if words[i : i + len(keyword_words)] == keyword_words:
-            count += 1
-    return count / len(words)
+    return compute_keyword_densities(text, [keyword])[keyword]
+
+
+def _build_keyword_trie(phrases: Iterable[Tuple[str, ...]]) -> Dict[Any, Any]:
+    """Index keyword token sequences in a trie; ``None`` marks the end of a phrase."""
+
+    trie: Dict[Any, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for token in phrase:
+            node = node.setdefault(token, {})
+        node[None] = phrase
+    return trie
+
+
+def count_keyword_phrases(words: Sequence[str], phrases: Iterable[Tuple[str, ...]]) -> Dict[Tuple[str, ...], int]:
+    """Count (overlapping) occurrences of every phrase in ``words`` in one pass over the tokens.
+
+    From each token position the trie is followed only as far as it matches, so the cost is
+    bounded by the article length times the longest keyword rather than by the number of keywords.
+    """
+
+    phrases = set(phrases)
+    counts = {phrase: 0 for phrase in phrases}
+    if () in phrases:
+        # An empty phrase matches at every slice boundary, mirroring the sliding-window compare.
+        counts[()] = len(words) + 1
+    trie = _build_keyword_trie(phrase for phrase in phrases if phrase)
+    if not trie:
+        return counts
+    for start in range(len(words)):
+        node = trie.get(words[start])
+        position = start + 1
+        while node is not None:
+            phrase = node.get(None)
+            if phrase is not None:
+                counts[phrase] += 1
+            if position >= len(words):
+                break
+            node = node.get(words[position])
+            position += 1
+    return counts
+
+
+def compute_keyword_densities(text: str, keywords: Iterable[str]) -> Dict[str, float]:
+    """Return the density of every keyword in ``text`` after tokenizing the article once.
+
+    Produces the same values as calling :func:`compute_keyword_density` per keyword.
+    """
+
+    return TextAnalysis(text).keyword_densities(keywords)
 
 
 def flesch_kincaid_grade(text: str) -> float:
-    sentences = [s for s in re.split(r"[.!?]+", text) if s.strip()]
-    words = re.findall(r"[A-Za-z0-9']+", text)
-    syllables = sum(estimate_syllables(word) for word in words)
-    if not sentences or not words:
-        return 0.0
-    words_per_sentence = len(words) / len(sentences)
-    syllables_per_word = syllables / len(words)
-    grade = (0.39 * words_per_sentence) + (11.8 * syllables_per_word) - 15.59
-    return round(grade, 2)
+    return TextAnalysis(text).flesch_kincaid_grade()
 
 
 def estimate_syllables(word: str) -> int:
@@ -161,7 +688,67 @@ def estimate_syllables(word: str) -> int:
     return max(syllables, 1)
 
 
+cached_syllables = lru_cache(maxsize=SYLLABLE_CACHE_SIZE)(estimate_syllables)
+
+
+class TextAnalysis:
+    """Readability and keyword statistics over the shared tokens of an article.
+
+    The tokens come from :func:`tokenizer.tokenize`, so every analysis of the same text (and
+    every standalone metric function) reuses one tokenization. Syllables are estimated once
+    per distinct word and memoized across articles by :func:`cached_syllables`, so repeated
+    vocabulary costs a dictionary lookup.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.tokens: TokenizedText = tokenize(text)
+        self.text = text
+        self.words = self.tokens.words
+        self.sentence_count = self.tokens.sentence_count
+        self._syllables: int | None = None
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def lowered_words(self) -> Sequence[str]:
+        return self.tokens.lowered_words
+
+    @property
+    def syllable_count(self) -> int:
+        if self._syllables is None:
+            vocabulary = self.tokens.vocabulary
+            self._syllables = sum(cached_syllables(word) * count for word, count in vocabulary.items())
+        return self._syllables
+
+    def flesch_kincaid_grade(self) -> float:
+        if not self.sentence_count or not self.words:
+            return 0.0
+        words_per_sentence = len(self.words) / self.sentence_count
+        syllables_per_word = self.syllable_count / len(self.words)
+        grade = (0.39 * words_per_sentence) + (11.8 * syllables_per_word) - 15.59
+        return round(grade, 2)
+
+    def keyword_counts(self, keywords: Iterable[str]) -> Dict[str, int]:
+        """Count (overlapping) occurrences of each keyword phrase, case-insensitively."""
+
+        phrases = {keyword: phrase_tokens(keyword) for keyword in keywords}
+        counts = count_keyword_phrases(self.lowered_words, phrases.values())
+        return {keyword: counts[phrase] for keyword, phrase in phrases.items()}
+
+    def keyword_densities(self, keywords: Iterable[str]) -> Dict[str, float]:
+        keywords = list(keywords)
+        words = self.lowered_words
+        if not words:
+            return {keyword: 0.0 for keyword in keywords}
+        counts = self.keyword_counts(keywords)
+        return {keyword: counts[keyword] / len(words) for keyword in keywords}
+
+
 def generate_paragraph(theme: str, context: Dict[str, Any], extra: Dict[str, Any]) -> str:
+    from textwrap import fill
+
     persona_name = context.get("persona_name", "reader")
     product = context.get("product", "the program")
     primary_keyword = context.get("primary_keyword", "relationship strategy")
@@ -190,129 +777,220 @@ def generate_paragraph(theme: str, context: Dict[str, Any], extra: Dict[str, Any
 
 
 def generate_section_summary(heading: str, paragraphs: List[str]) -> str:
-    rendered = [f"## {heading}"]
-    rendered.extend(paragraphs)
-    rendered.append("")
-    return "\n".join(rendered)
+    # Blank lines keep each wrapped paragraph a separate Markdown paragraph.
+    return "\n\n".join([f"## {heading}", *paragraphs]) + "\n"
 
 
-def stage1(args: argparse.Namespace, config: Dict[str, Any], keyword_data: Dict[str, Any]) -> Dict[str, Any]:
-    output_dir = Path(args.output_dir)
-    ensure_directory(output_dir)
+def render_section(section: Dict[str, Any], context: Dict[str, Any]) -> str:
+    """Render one outline section: a paragraph per theme plus its key-action summary."""
 
-    persona_profile = config["stage1"]["persona"].copy()
-    persona_profile["name"] = args.persona_name or persona_profile.get("name")
+    from textwrap import fill
 
-    clusters = [cluster_metrics(cluster) for cluster in keyword_data["clusters"]]
-    winning_cluster = max(clusters, key=lambda c: c["score"])
+    section_paragraphs = [generate_paragraph(theme, context, SECTION_PARAGRAPH_STYLE) for theme in section["themes"]]
+    summary_text = fill(
+        (
+            f"Key action: Translate '{section['heading']}' into a scheduled deliverable that keeps the primary keyword "
+            f"'{context.get('primary_keyword', 'devotion blueprint')}' in the H2 and guides readers toward {context.get('product', 'the offer')}."
+        ),
+        width=100,
+    )
+    section_paragraphs.append(summary_text)
+    return generate_section_summary(section["heading"], section_paragraphs)
 
-    today = datetime.utcnow().strftime("%Y-%m-%d")
-    headers = [
-        "Cluster",
-        "Core Emotion",
-        "Primary Keywords",
-        "Total Volume",
-        "Avg Difficulty",
-        "Conversion",
-        "Pinterest Visual Angle",
-        "Meta Caption Hook",
-        "Product Fit",
-    ]
 
-    rows = []
-    for cluster in clusters:
-        rows.append(
-            [
-                cluster["label"],
-                cluster["core_emotion"],
-                ", ".join(cluster["top_keywords"]),
-                f"{cluster['total_volume']:,}",
-                f"{cluster['avg_difficulty']:.1f}",
-                cluster["conversion_potential"],
-                "; ".join(cluster["pinterest_angles"][:2]),
-                "; ".join(cluster["meta_hooks"][:2]),
-                cluster["product_compatibility"],
-            ]
-        )
+def render_sections(
+    sections: Sequence[Dict[str, Any]],
+    context: Dict[str, Any],
+    *,
+    executor: str = "serial",
+    workers: int | None = None,
+) -> List[str]:
+    """Render outline sections, optionally on a thread or process pool, in outline order.
 
-    table_md = format_markdown_table(headers, rows)
+    Sections are independent, so ``Executor.map`` can spread them across workers while still
+    returning them in input order. Threads mainly help when rendering releases the GIL; use
+    processes for long outlines, where ``textwrap.fill`` dominates.
+    """
 
-    deep_research_lines = [
-        "# Stage 1 — Step 1: Deep Research",
-        "Goal: Identify high-ROI keywords, audience intent, and emotional resonance to drive organic clicks and conversions.",
-        f"_Generated on {today} for {args.product}_",
-        "",
-        "## Market-Aligned Keyword Clusters",
-        table_md,
-        "",
-        "## Emotional & Performance Breakdown",
-    ]
+    return executor_map(render_section, sections, [context] * len(sections), executor=executor, workers=workers)
 
-    for cluster in clusters:
-        pinterest_angles = [angle for angle in cluster["pinterest_angles"] if angle]
-        meta_hooks = [hook for hook in cluster["meta_hooks"] if hook]
-        breakdown_lines = [
-            f"- **Cluster:** {cluster['label']}",
-            f"  - Primary keywords: {', '.join(cluster['top_keywords'])}",
-            f"  - Core emotional driver: {cluster['core_emotion']}",
-            f"  - Estimated volume: {cluster['total_volume']:,}",
-            f"  - Average SEO difficulty: {cluster['avg_difficulty']:.1f}",
-            f"  - Conversion potential: {cluster['conversion_potential']}",
-            f"  - Pinterest visual angles: {', '.join(pinterest_angles[:3])}",
-            f"  - Meta caption hooks: {', '.join(meta_hooks[:3])}",
-            f"  - Product compatibility: {cluster['product_compatibility']}",
-        ]
-        deep_research_lines.extend(breakdown_lines)
-        deep_research_lines.append("")
-
-    justification = (
-        f"The highest scoring cluster is **{winning_cluster['label']}** thanks to a total volume of "
-        f"{winning_cluster['total_volume']:,}, a {winning_cluster['conversion_potential'].lower()} conversion projection, "
-        f"and emotional drivers around {', '.join(filter(None, winning_cluster['emotional_drivers']))}. "
-        f"It aligns directly with {args.product} because the offer teaches devotion phrases that feel like "
-        f"{winning_cluster['core_emotion'].lower()} for the {persona_profile['name']} persona."
-    )
 
-    winning_angles = [angle for angle in winning_cluster["pinterest_angles"] if angle]
-    winning_hooks = [hook for hook in winning_cluster["meta_hooks"] if hook]
+def executor_map(
+    func: Callable[..., Any],
+    *iterables: Iterable[Any],
+    executor: str = "serial",
+    workers: int | None = None,
+) -> List[Any]:
+    """``map(func, *iterables)`` run serially or on a thread/process pool; results keep input order."""
+
+    import concurrent.futures
+
+    if executor not in RENDER_EXECUTORS:
+        raise ValueError(f"Render executor must be one of {', '.join(RENDER_EXECUTORS)}.")
+    columns = [list(iterable) for iterable in iterables]
+    if executor == "serial" or workers == 1 or min(map(len, columns), default=0) < 2:
+        return list(map(func, *columns))
+    futures = concurrent.futures
+    pool_type = futures.ThreadPoolExecutor if executor == "threads" else futures.ProcessPoolExecutor
+    with pool_type(max_workers=workers) as pool:
+        return list(pool.map(func, *columns))
+
+
+def unit_artifact_name(prefix: str, name: str) -> str:
+    """File name of one fan-out unit's artifact, e.g. ``stage3_platform_instagram_reels.md``."""
+
+    return f"{prefix}_{slugify(name).replace('-', '_')}.md"
+
+
+def unit_artifact_names(prefix: str, names: Iterable[str]) -> List[str]:
+    """One artifact name per unit, rejecting config names that slugify to the same file."""
+
+    owners: Dict[str, str] = {}
+    for name in names:
+        if not slugify(name):
+            raise ValueError(f"Config entry {name!r} has no usable characters for its {prefix} artifact name.")
+        file_name = unit_artifact_name(prefix, name)
+        if file_name in owners:
+            raise ValueError(
+                f"Config entries {owners[file_name]!r} and {name!r} would both write {file_name}; rename one."
+            )
+        owners[file_name] = name
+    return list(owners)
+
+
+def remove_stale_units(output_dir: Path, prefix: str, current: Iterable[str]) -> None:
+    """Delete unit artifacts for entries no longer in the config, so they are not recorded as outputs."""
+
+    keep = set(current)
+    for path in output_dir.glob(f"{prefix}_*.md"):
+        if path.name not in keep:
+            _logger().info("Removing %s; its unit is no longer in the config", path)
+            path.unlink(missing_ok=True)
+
+
+def render_platform_plan(platform: str, details: Dict[str, Any], slug: str) -> str:
+    return templates().render("stage3_platform.md", platform=platform, details=details, slug=slug)
+
+
+def render_analytics_system(system: str, details: Dict[str, Any]) -> str:
+    return templates().render("stage4_system.md", system=system, details=details)
+
+
+def variant_axes(config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Headline, hook, emotion and CTA options for A/B variants of the article opening.
+
+    Headlines expand ``stage2.variants.headline_templates`` (falling back to the Stage 1 title
+    template) over the cluster's top keywords; hooks combine the Stage 1 SEO hooks with the
+    cluster's meta hooks.
+    """
+
+    variants_config = config["stage2"].get("variants", {})
+    seo_templates = config["stage1"]["seo_templates"]
+    cluster = context.get("winning_cluster", {})
+    keywords = cluster.get("top_keywords") or [context.get("primary_keyword", "relationship rituals")]
+    fields = {"product": context.get("product", "the program"), "persona_short": context.get("persona_name", "reader")}
+    templates = variants_config.get("headline_templates") or [seo_templates["title"]]
+    return {
+        "headline": [
+            template.format(primary_keyword=keyword.title(), **fields) for template in templates for keyword in keywords
+        ],
+        "hook": [*seo_templates["hooks"], *cluster.get("meta_hooks", [])],
+        "emotion": cluster.get("emotional_drivers") or [cluster.get("core_emotion", "emotional connection")],
+        "cta": [cta.format(**fields) for cta in variants_config.get("ctas") or [SECTION_PARAGRAPH_STYLE["cta"]]],
+    }
+
+
+def render_variant(choice: Dict[str, str], context: Dict[str, Any]) -> str:
+    cluster = {**context.get("winning_cluster", {}), "core_emotion": choice["emotion"]}
+    paragraph = generate_paragraph(choice["hook"], {**context, "winning_cluster": cluster}, {"cta": choice["cta"]})
+    return f"# {choice['headline']}\n\n{paragraph}\n"
+
+
+def _band_gap(value: float, band: Tuple[float, float]) -> float:
+    low, high = band
+    return max(low - value, 0.0, value - high)
+
+
+def score_variant(text: str, primary_keyword: str) -> Dict[str, Any]:
+    """Word count, primary keyword density and grade level, plus the distance from the Stage 2
+    targets (1–2% density, grade 6–8) as ``target_gap``; lower is better."""
+
+    analysis = TextAnalysis(text)
+    density = round(analysis.keyword_densities([primary_keyword])[primary_keyword] * 100, 2)
+    grade = analysis.flesch_kincaid_grade()
+    return {
+        "word_count": analysis.word_count,
+        "primary_keyword_density_percent": density,
+        "grade_level": grade,
+        "target_gap": round(_band_gap(density, VARIANT_DENSITY_TARGET) + _band_gap(grade, VARIANT_GRADE_TARGET), 2),
+    }
+
+
+def iter_article_variants(
+    config: Dict[str, Any],
+    context: Dict[str, Any],
+    count: int,
+    seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily render, dedupe and score up to ``count`` distinct variants in seeded order.
 
-    deep_research_lines.extend(
-        [
-            "## Winner Selection & Justification",
-            fill(justification, width=100),
-            "",
-            "## Deliverables",
-            "- Unified keyword cluster summary",
-            "- Emotional intent mapping",
-            "- CTR forecast",
-            "- Pinterest visual angles",
-            "- Meta caption hooks",
-            "",
-            "### Unified Keyword Cluster",
-            f"- Label: {winning_cluster['label']}",
-            f"- Core emotion: {winning_cluster['core_emotion']}",
-            f"- Primary keywords: {', '.join(winning_cluster['top_keywords'])}",
-            f"- Estimated total volume: {winning_cluster['total_volume']:,}",
-            f"- Average SEO difficulty: {winning_cluster['avg_difficulty']:.1f}",
-            f"- Projected CTR: {winning_cluster['avg_ctr'] * 100:.1f}%",
-            "",
-            "### Emotional Intent Mapping",
-            f"- Emotional drivers: {', '.join(filter(None, winning_cluster['emotional_drivers'])) or 'Available upon refresh'}",
-            f"- Product compatibility notes: {winning_cluster['product_compatibility'] or 'Use persona language to customize.'}",
-            "",
-            "### CTR Forecast",
-            f"- Forecasted clicks per 1K impressions: {math.floor(winning_cluster['avg_ctr'] * 1000)}",
-            f"- Conversion potential: {winning_cluster['conversion_potential']}",
-            "",
-            "### Pinterest Visual Angles",
-            *([f"- {angle}" for angle in winning_angles] or ["- Refresh angles from trend scan"]),
-            "",
-            "### Meta Caption Hooks",
-            *([f"- {hook}" for hook in winning_hooks] or ["- Draft new hooks tied to emotional drivers"]),
-        ]
-    )
-
-    write_text_file(output_dir / "step1_deep_research.md", "\n".join(str(line) for line in deep_research_lines))
+    Equal seeds give equal variants. Renderings that only differ in case or punctuation are
+    skipped, and scoring reuses the tokens the duplicate check already produced.
+    """
+
+    from variants import VariantSpace, dedupe_rendered
+
+    space = VariantSpace(variant_axes(config, context))
+    primary_keyword = context.get("primary_keyword", "relationship rituals")
+    rendered = ({**choice, "text": render_variant(choice, context)} for choice in space.sample(seed=seed))
+    for number, variant in enumerate(islice(dedupe_rendered(rendered, key=lambda item: item["text"]), count), 1):
+        yield {"id": f"v{number:05d}", **variant, **score_variant(variant["text"], primary_keyword)}
+
+
+def stage1(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    from datetime import datetime
+    from textwrap import fill
+
+    from instrumentation import profile
+
+    output_dir = Path(args.output_dir)
+    ensure_directory(output_dir)
+
+    persona_profile = config["stage1"]["persona"].copy()
+    persona_profile["name"] = args.persona_name or persona_profile.get("name")
+
+    with profile("cluster_scoring"):
+        clusters = cluster_metrics_columnar(keyword_data["clusters"])
+        winning_cluster = select_winning_cluster(
+            clusters,
+            getattr(args, "keyword_seed", None),
+            getattr(args, "covered_clusters", None),
+        )
+
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    scanned = keyword_data.get("cluster_count", len(clusters))
+
+    with profile("rendering"):
+        deep_research = templates().render(
+            "step1_deep_research.md",
+            today=today,
+            product=args.product,
+            persona=persona_profile,
+            clusters=clusters,
+            winner=winning_cluster,
+            forecast={
+                "ctr_percent": winning_cluster["avg_ctr"] * 100,
+                "clicks_per_thousand": math.floor(winning_cluster["avg_ctr"] * 1000),
+            },
+            scanned_count=scanned,
+            truncated=scanned > len(clusters),
+        )
+    write_text_file(output_dir / "step1_deep_research.md", deep_research)
 
     persona_lines = [
         "# Stage 1 — Step 2: Define Target Persona",
@@ -370,6 +1048,8 @@ def stage1(args: argparse.Namespace, config: Dict[str, Any], keyword_data: Dict[
         )
     write_text_file(output_dir / "step4_competitor_audit.md", "\n".join(competitor_lines))
 
+    winning_angles = [angle for angle in winning_cluster["pinterest_angles"] if angle]
+    winning_hooks = [hook for hook in winning_cluster["meta_hooks"] if hook]
     cluster_context = winning_cluster.copy()
     cluster_context.update(
         {
@@ -393,22 +1073,25 @@ def stage1(args: argparse.Namespace, config: Dict[str, Any], keyword_data: Dict[
         "clusters": clusters,
     }
 
-    context_path = output_dir / "context.json"
-    context_path.write_text(json.dumps(context, indent=2), encoding="utf-8")
-    ensure_directory(CONTEXT_SHARED_PATH.parent)
-    CONTEXT_SHARED_PATH.write_text(json.dumps(context, indent=2), encoding="utf-8")
     return context
 
 
-def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
+def stage2(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    import io
+    from textwrap import fill
+
+    from artifact_store import ARTIFACTS
+    from instrumentation import profile
+    from variants import VariantSpace
+
     output_dir = Path(args.output_dir)
     ensure_directory(output_dir)
 
-    if not args.context or not Path(args.context).exists():
-        raise FileNotFoundError("Stage 2 requires a context file generated by Stage 1.")
-    with Path(args.context).open("r", encoding="utf-8") as fh:
-        context = json.load(fh)
-
     stage2_config = config["stage2"]
 
     outline_lines = [
@@ -434,28 +1117,13 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
     affiliate_prompt_path = output_dir / "step1_5_affiliate_link_prompt.txt"
     write_text_file(affiliate_prompt_path, stage2_config["outline"]["affiliate_prompt"])
 
-    section_summaries: List[str] = []
-    for section in stage2_config["outline"]["sections"]:
-        section_paragraphs = [
-            generate_paragraph(
-                theme,
-                context,
-                {
-                    "tone": "warm and authoritative",
-                    "cta": "Invite him into the next moment with a confident, heart-led ask.",
-                },
-            )
-            for theme in section["themes"]
-        ]
-        summary_text = fill(
-            (
-                f"Key action: Translate '{section['heading']}' into a scheduled deliverable that keeps the primary keyword "
-                f"'{context.get('primary_keyword', 'devotion blueprint')}' in the H2 and guides readers toward {context.get('product', 'the offer')}."
-            ),
-            width=100,
+    with profile("rendering"):
+        section_summaries = render_sections(
+            stage2_config["outline"]["sections"],
+            context,
+            executor=getattr(args, "render_executor", "serial"),
+            workers=getattr(args, "render_workers", None),
         )
-        section_paragraphs.append(summary_text)
-        section_summaries.append(generate_section_summary(section["heading"], section_paragraphs))
 
     faq_lines = ["## Embedded FAQ"]
     for faq in stage2_config["faq"]:
@@ -496,6 +1164,7 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
             width=100,
         )
     )
+    article_sections.append("")
     article_sections.append(concluding_paragraph)
 
     draft_sections = [
@@ -511,16 +1180,18 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
     draft_path = output_dir / "step2_draft_body.md"
     write_text_file(draft_path, draft_text)
 
-    words = re.findall(r"[A-Za-z0-9']+", article_text)
-    word_count = len(words)
+    with profile("tokenization"):
+        analysis = TextAnalysis(article_text)
+        word_count = analysis.word_count
 
     primary_keyword = context.get("primary_keyword", "relationship rituals")
     secondary_keywords = stage2_config["seo_package_keywords"]
-    primary_density = round(compute_keyword_density(article_text, primary_keyword) * 100, 2)
-    secondary_density = {
-        kw: round(compute_keyword_density(article_text, kw) * 100, 2) for kw in secondary_keywords
-    }
-    grade_level = flesch_kincaid_grade(article_text)
+    with profile("density"):
+        densities = analysis.keyword_densities([primary_keyword, *secondary_keywords])
+        primary_density = round(densities[primary_keyword] * 100, 2)
+        secondary_density = {kw: round(densities[kw] * 100, 2) for kw in secondary_keywords}
+    with profile("readability"):
+        grade_level = analysis.flesch_kincaid_grade()
 
     checklist_lines = [
         "# Stage 2 — Step 3: Optimization Review",
@@ -533,7 +1204,7 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
         checklist_lines.append(
             f"| Secondary Keyword Density ({kw}) | 0.5–1% | {density}% | {'Within range' if 0.5 <= density <= 1.0 else 'Adjust usage'} |"
         )
-    headings = [line for line in article_text.splitlines() if line.startswith("## ")]
+    headings = analysis.tokens.lines_starting_with("## ")
     keyword_in_headings = sum(1 for heading in headings if primary_keyword.lower() in heading.lower())
     heading_note = (
         f"{keyword_in_headings}/{len(headings)} contain primary keyword" if headings else "Add H2s to target keywords"
@@ -542,7 +1213,7 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
         f"| Headers include query keywords | ≥50% | {heading_note} | Continue refining headings |"
     )
     emotional_words = ["fear", "desire", "hope", "reassurance"]
-    emotional_presence = {word: (word in article_text.lower()) for word in emotional_words}
+    emotional_presence = {word: analysis.tokens.contains(word) for word in emotional_words}
     checklist_lines.append(
         "| Emotional Triggers | fear, desire, hope, reassurance | "
         + ", ".join(f"{word}:{'yes' if present else 'no'}" for word, present in emotional_presence.items())
@@ -565,21 +1236,41 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
     final_path = output_dir / "step6_5_final_draft.md"
     write_text_file(final_path, final_markdown)
 
-    html_lines = [
-        "<article class=\"devotion-blueprint\">",
-        f"  <h1 style=\"text-align:center;\">{context['seo_title']}</h1>",
-    ]
-    for line in article_text.splitlines():
-        if line.startswith("# "):
-            continue
-        if line.startswith("## "):
-            heading = line[3:]
-            html_lines.append(f"  <h2 style=\"text-align:center;\">{heading}</h2>")
-        elif line.strip():
-            html_lines.append(f"  <p>{line.strip()}</p>")
-    html_lines.append("</article>")
+    duplicate_report = None
+    if getattr(args, "check_duplicates", False):
+        from near_duplicates import DEFAULT_THRESHOLD, document_id, load_draft_index
+
+        threshold = getattr(args, "duplicate_threshold", None) or DEFAULT_THRESHOLD
+        with profile("near_duplicates"):
+            index = load_draft_index()
+            own_id = document_id(final_path)
+            candidates = index.query(final_markdown, 0.0, limit=None, exclude=(own_id,))
+        matches = [(doc_id, similarity) for doc_id, similarity in candidates if similarity >= threshold]
+        duplicate_report = {
+            "threshold": threshold,
+            "similarity": candidates[0][1] if candidates else 0.0,
+            "published_drafts": len(index) - (own_id in index),
+            "matches": [{"id": doc_id, "similarity": similarity} for doc_id, similarity in matches[:10]],
+        }
+        if matches:
+            _logger().warning(
+                "stage2: draft is a near duplicate of %d published draft(s); closest is %s at %.2f similarity",
+                len(matches),
+                matches[0][0],
+                matches[0][1],
+            )
+
+    from markdown_html import iter_html
+
     html_path = output_dir / "step7_clickbank_html.html"
-    write_text_file(html_path, "\n".join(html_lines))
+    with profile("rendering"), ARTIFACTS.open_text(html_path) as handle:
+        body = iter_html(
+            io.StringIO(article_text),
+            indent="  ",
+            heading_attributes=STEP7_HEADING_ATTRIBUTES,
+            skip_heading_levels=(1,),
+        )
+        templates().stream("step7_clickbank_html.html", handle, seo_title=context["seo_title"], body=body)
 
     seo_package = {
         "seo_title": context["seo_title"],
@@ -591,7 +1282,8 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
         "secondary_keyword_density_percent": secondary_density,
         "grade_level_estimate": grade_level,
     }
-    (output_dir / "step8_5_seo_package.json").write_text(json.dumps(seo_package, indent=2), encoding="utf-8")
+    with profile("json_writes"):
+        ARTIFACTS.write_text(output_dir / "step8_5_seo_package.json", json.dumps(seo_package, indent=2))
 
     image_brief_lines = [
         "# Stage 2 — Step 9: Image Creation & Optimization",
@@ -612,6 +1304,30 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
     ]
     write_text_file(output_dir / "step8_review_upload.md", "\n".join(review_upload_lines))
 
+    variant_count = getattr(args, "variant_count", 0) or 0
+    variants_summary = None
+    variants_path = output_dir / "step2_5_variants.jsonl"
+    if variant_count > 0:
+        variant_seed = getattr(args, "variant_seed", 0) or 0
+        best: Dict[str, Any] | None = None
+        written = 0
+        with profile("variants"), ARTIFACTS.open_text(variants_path) as handle:
+            for variant in iter_article_variants(config, context, variant_count, seed=variant_seed):
+                handle.write(json.dumps(variant) + "\n")
+                written += 1
+                if best is None or variant["target_gap"] < best["target_gap"]:
+                    best = variant
+        variants_summary = {
+            "count": written,
+            "space": VariantSpace(variant_axes(config, context)).size,
+            "seed": variant_seed,
+            "best": {key: value for key, value in best.items() if key != "text"} if best else None,
+        }
+    elif variants_path.exists():
+        # Left by an earlier run with --variants; it must not be recorded as this run's output.
+        _logger().info("Removing %s; variants are disabled", variants_path)
+        variants_path.unlink(missing_ok=True)
+
     updated_context = context.copy()
     updated_context.update(
         {
@@ -623,69 +1339,56 @@ def stage2(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
             "seo_package": seo_package,
         }
     )
-    context_path = output_dir / "context.json"
-    context_path.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
-    ensure_directory(CONTEXT_SHARED_PATH.parent)
-    CONTEXT_SHARED_PATH.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
+    if variants_summary is not None:
+        updated_context["variants"] = variants_summary
+    if duplicate_report is not None:
+        updated_context["near_duplicates"] = duplicate_report
     return updated_context
 
 
-def stage3(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
+def stage3(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    from instrumentation import profile
+
     output_dir = Path(args.output_dir)
     ensure_directory(output_dir)
 
-    if not args.context or not Path(args.context).exists():
-        raise FileNotFoundError("Stage 3 requires a context file generated by Stage 2.")
-    with Path(args.context).open("r", encoding="utf-8") as fh:
-        context = json.load(fh)
-
     stage3_config = config["stage3"]
 
-    distribution_lines = [
-        "# Stage 3 — Cross-Platform Distribution",
-        "Goal: Apply Pareto principle to focus on top-performing social channels.",
-        "",
-        "## Strategy Prompts",
-    ]
-    distribution_lines.extend(f"- {prompt}" for prompt in stage3_config["prompts"])
-    distribution_lines.append("")
-
     seo_title = context.get("seo_title", "Devotion Blueprint")
     slug = context.get("slug", slugify(seo_title))
 
-    for platform, details in stage3_config["platforms"].items():
-        distribution_lines.append(f"## {platform.replace('_', ' ')}")
-        if "post_structure" in details:
-            distribution_lines.append("### Post Structure")
-            distribution_lines.extend(f"- {item}" for item in details["post_structure"])
-        if "posting_times" in details:
-            distribution_lines.append("### Posting Times")
-            distribution_lines.extend(f"- {item}" for item in details["posting_times"])
-        if "posts" in details:
-            distribution_lines.append(f"- Total Posts: {details['posts']}")
-        if "concepts" in details:
-            distribution_lines.append("### Concepts")
-            distribution_lines.extend(f"- {concept}" for concept in details["concepts"])
-        if "best_time" in details:
-            distribution_lines.append(f"- Best Time: {details['best_time']}")
-        if "topics" in details:
-            distribution_lines.append("### Topics")
-            distribution_lines.extend(f"- {topic}" for topic in details["topics"])
-        if "schedule" in details:
-            distribution_lines.append("### Schedule")
-            distribution_lines.extend(f"- {item}" for item in details["schedule"])
-        if "prompts" in details:
-            distribution_lines.append(f"- Short-Form Prompts: {details['prompts']}")
-        if "posting_schedule" in details:
-            distribution_lines.append("### Posting Schedule")
-            distribution_lines.extend(f"- {item}" for item in details["posting_schedule"])
-        distribution_lines.append(f"- Tracking UTM: ?tid=understandingman_social_{slug}")
-        distribution_lines.append("")
-
-    write_text_file(output_dir / "stage3_cross_platform_distribution.md", "\n".join(distribution_lines))
+    # Each platform is an independent work unit with its own artifact; the combined plan
+    # concatenates them in config order, however the pool schedules them.
+    platforms = stage3_config["platforms"]
+    unit_names = unit_artifact_names("stage3_platform", platforms)
+    with profile("rendering"):
+        sections = executor_map(
+            render_platform_plan,
+            platforms,
+            platforms.values(),
+            [slug] * len(platforms),
+            executor=getattr(args, "render_executor", "serial"),
+            workers=getattr(args, "render_workers", None),
+        )
+    for unit_name, section in zip(unit_names, sections):
+        write_text_file(output_dir / unit_name, section)
+    remove_stale_units(output_dir, "stage3_platform", unit_names)
+
+    with profile("rendering"):
+        distribution = templates().render(
+            "stage3_cross_platform_distribution.md",
+            prompts=stage3_config["prompts"],
+            sections=sections,
+        )
+    write_text_file(output_dir / "stage3_cross_platform_distribution.md", distribution)
 
     updated_context = context.copy()
-    updated_context.setdefault("distribution", {})
+    updated_context["distribution"] = dict(updated_context.get("distribution", {}))
     updated_context["distribution"].update(
         {
             "slug": slug,
@@ -693,68 +1396,58 @@ def stage3(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
             "prompts": stage3_config["prompts"],
         }
     )
-    context_path = output_dir / "context.json"
-    context_path.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
-    ensure_directory(CONTEXT_SHARED_PATH.parent)
-    CONTEXT_SHARED_PATH.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
     return updated_context
 
 
-def stage4(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
+def stage4(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    from instrumentation import profile
+
     output_dir = Path(args.output_dir)
     ensure_directory(output_dir)
 
-    if not args.context or not Path(args.context).exists():
-        raise FileNotFoundError("Stage 4 requires a context file generated by Stage 3.")
-    with Path(args.context).open("r", encoding="utf-8") as fh:
-        context = json.load(fh)
-
     stage4_config = config["stage4"]
     slug = context.get("slug", slugify(context.get("seo_title", "devotion")))
 
-    analytics_lines = [
-        "# Stage 4 — Analytics & Refinement",
-        "Goal: Measure, optimize, and scale what drives revenue.",
-        "",
-        f"- Blog Slug Tracking ID: ?tid=understandingman_blog_{slug}",
-        "",
-    ]
+    systems = stage4_config["analytics_systems"]
+    unit_names = unit_artifact_names("stage4_system", systems)
+    with profile("rendering"):
+        sections = executor_map(
+            render_analytics_system,
+            systems,
+            systems.values(),
+            executor=getattr(args, "render_executor", "serial"),
+            workers=getattr(args, "render_workers", None),
+        )
+    for unit_name, section in zip(unit_names, sections):
+        write_text_file(output_dir / unit_name, section)
+    remove_stale_units(output_dir, "stage4_system", unit_names)
 
-    for system_name, system_details in stage4_config["analytics_systems"].items():
-        analytics_lines.append(f"## {system_name}")
-        if "description" in system_details:
-            analytics_lines.append(fill(system_details["description"], width=100))
-        if "metrics" in system_details:
-            analytics_lines.append("### Metrics")
-            analytics_lines.extend(f"- {metric}" for metric in system_details["metrics"])
-        if "tracking_id" in system_details:
-            analytics_lines.append(f"- Tracking Template: {system_details['tracking_id']}")
-        if "combines" in system_details:
-            analytics_lines.append("### Data Sources")
-            analytics_lines.extend(f"- {source}" for source in system_details["combines"])
-        analytics_lines.append("")
-
-    write_text_file(output_dir / "stage4_analytics_refinement.md", "\n".join(analytics_lines))
+    with profile("rendering"):
+        analytics = templates().render("stage4_analytics_refinement.md", slug=slug, sections=sections)
+    write_text_file(output_dir / "stage4_analytics_refinement.md", analytics)
 
     updated_context = context.copy()
-    updated_context.setdefault("analytics", {})
+    updated_context["analytics"] = dict(updated_context.get("analytics", {}))
     updated_context["analytics"].update(stage4_config["analytics_systems"])
-    context_path = output_dir / "context.json"
-    context_path.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
-    ensure_directory(CONTEXT_SHARED_PATH.parent)
-    CONTEXT_SHARED_PATH.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
     return updated_context
 
 
-def stage5(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
+def stage5(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    from textwrap import fill
+
     output_dir = Path(args.output_dir)
     ensure_directory(output_dir)
 
-    if not args.context or not Path(args.context).exists():
-        raise FileNotFoundError("Stage 5 requires a context file generated by Stage 4.")
-    with Path(args.context).open("r", encoding="utf-8") as fh:
-        context = json.load(fh)
-
     stage5_config = config["stage5"]
 
     growth_lines = [
@@ -776,10 +1469,6 @@ def stage5(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
 
     updated_context = context.copy()
     updated_context.setdefault("growth_actions", stage5_config["actions"])
-    context_path = output_dir / "context.json"
-    context_path.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
-    ensure_directory(CONTEXT_SHARED_PATH.parent)
-    CONTEXT_SHARED_PATH.write_text(json.dumps(updated_context, indent=2), encoding="utf-8")
     return updated_context
 
 
@@ -792,30 +1481,708 @@ STAGE_HANDLERS = {
 }
 
 
+STAGE_ORDER = list(STAGE_HANDLERS)
+
+_BATCH_CONFIG: Dict[str, Any] | None = None
+_BATCH_KEYWORD_DATA: Dict[str, Any] | None = None
+_BATCH_OPTIONS: Dict[str, Any] = {}
+
+
+CONTEXT_REQUIREMENTS = {
+    "stage2": "Stage 2 requires a context file generated by Stage 1.",
+    "stage3": "Stage 3 requires a context file generated by Stage 2.",
+    "stage4": "Stage 4 requires a context file generated by Stage 3.",
+    "stage5": "Stage 5 requires a context file generated by Stage 4.",
+}
+
+CHECKPOINT_MODES = ("end", "each")
+
+STAGE_CACHE_FILENAME = "stage_inputs.json"
+METRICS_FILENAME = "metrics.json"
+STAGE1_OPTION_NAMES = ("product", "persona_name", "lookback_days", "keyword_seed", "covered_clusters")
+STAGE2_OPTION_NAMES = ("variant_count", "variant_seed", "check_duplicates", "duplicate_threshold")
+
+GENERATOR_MODULES = (
+    "template_engine.py",
+    "markdown_html.py",
+    "artifact_store.py",
+    "tokenizer.py",
+    "variants.py",
+    "near_duplicates.py",
+)
+
+_GENERATOR_DIGEST: str | None = None
+
+
+def load_stage_context(args: argparse.Namespace) -> Dict[str, Any]:
+    from context_format import read_context
+
+    if not args.context or not Path(args.context).exists():
+        raise FileNotFoundError(CONTEXT_REQUIREMENTS[args.stage])
+    return read_context(Path(args.context))
+
+
+def _generator_digest() -> str:
+    """Hash this script and its rendering modules so code changes invalidate cached stage outputs."""
+
+    import hashlib
+
+    global _GENERATOR_DIGEST
+    if _GENERATOR_DIGEST is None:
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        for module in GENERATOR_MODULES:
+            digest.update(Path(__file__).with_name(module).read_bytes())
+        _GENERATOR_DIGEST = digest.hexdigest()
+    return _GENERATOR_DIGEST
+
+
+def _templates_digest() -> str:
+    """Hash the artifact templates, which can change while a long-running process is up."""
+
+    import hashlib
+
+    digest = hashlib.sha256()
+    for path in sorted(TEMPLATE_DIR.iterdir()):
+        digest.update(path.name.encode("utf-8") + b"\0" + path.read_bytes())
+    return digest.hexdigest()
+
+
+def stage_input_hash(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any] | None,
+    *,
+    context_digest: str | None = None,
+) -> str:
+    """Content hash of everything a stage reads: its config slice, upstream context and, for
+    Stage 1, the keyword data and CLI options (Stage 2: the variant and duplicate-check options,
+    plus the published drafts when checking).
+
+    The upstream context enters as its :func:`context_hash`, so a pipeline can pass the
+    ``context_digest`` an upstream stage recorded instead of rebuilding that context.
+    """
+
+    import hashlib
+
+    from context_chain import context_hash
+
+    if context_digest is None and context is not None:
+        context_digest = context_hash(context)
+    payload: Dict[str, Any] = {
+        "stage": args.stage,
+        "generator": _generator_digest(),
+        "templates": _templates_digest(),
+        "config": config.get(args.stage),
+        "context": context_digest,
+    }
+    if args.stage == "stage1":
+        payload["keyword_data"] = keyword_data
+        payload["options"] = {name: getattr(args, name, None) for name in STAGE1_OPTION_NAMES}
+    elif args.stage == "stage2":
+        payload["options"] = {name: getattr(args, name, None) for name in STAGE2_OPTION_NAMES}
+        if payload["options"]["check_duplicates"]:
+            from near_duplicates import document_id, draft_stats
+
+            # The duplicate report depends on the published drafts, other than this stage's own.
+            published = draft_stats()
+            published.pop(document_id(Path(args.output_dir) / "step6_5_final_draft.md"), None)
+            payload["published_drafts"] = published
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def recorded_stage_inputs(output_dir: Path, input_hash: str) -> Dict[str, Any] | None:
+    """The ``stage_inputs.json`` record when ``output_dir`` holds every artifact built from ``input_hash``."""
+
+    record_path = output_dir / STAGE_CACHE_FILENAME
+    if not record_path.exists():
+        return None
+    try:
+        record = json.loads(record_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if record.get("input_hash") != input_hash:
+        return None
+    if not all((output_dir / name).exists() for name in record.get("artifacts", [])):
+        return None
+    return record
+
+
+def load_cached_context(output_dir: Path, input_hash: str, context_format: str = "json") -> Dict[str, Any] | None:
+    """Return the stored context when ``output_dir`` was produced from identical inputs."""
+
+    from context_chain import context_hash
+    from context_format import context_filename, read_context
+
+    record = recorded_stage_inputs(output_dir, input_hash)
+    context_path = output_dir / context_filename(context_format)
+    if record is None or not context_path.exists():
+        return None
+    try:
+        context = read_context(context_path)
+    except (OSError, ValueError):
+        return None  # e.g. a delta whose parent context has since been regenerated
+    if record.get("output_hash") not in (None, context_hash(context)):
+        return None  # left by an earlier run; a pipeline rebuilt the stage without checkpointing it
+    return context
+
+
+def record_stage_inputs(output_dir: Path, stage: str, input_hash: str, context: Dict[str, Any]) -> None:
+    """Record the stage's input hash, artifacts and the hash of the context it produced.
+
+    Stages a pipeline does not checkpoint are recorded too: their ``output_hash`` lets the next
+    run check the following stage's inputs without rebuilding this one's context.
+    """
+
+    from artifact_store import MANIFEST_FILENAME, write_if_changed
+    from context_chain import context_hash
+
+    artifacts = sorted(
+        path.name
+        for path in output_dir.iterdir()
+        if path.is_file() and path.name not in {STAGE_CACHE_FILENAME, METRICS_FILENAME, MANIFEST_FILENAME}
+    )
+    record = {"stage": stage, "input_hash": input_hash, "output_hash": context_hash(context), "artifacts": artifacts}
+    write_if_changed(output_dir / STAGE_CACHE_FILENAME, json.dumps(record, indent=2).encode("utf-8"))
+
+
+def run_stage(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any] | None = None,
+    *,
+    persist: bool = True,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Run one stage handler, reading the upstream context from ``--context`` when none is given.
+
+    Unless ``force`` is set, a stage whose input hash matches the one recorded next to its
+    artifacts is skipped and its stored context is returned with the artifacts left untouched.
+    With profiling enabled the stage's timings are written to ``metrics.json`` beside them.
+    """
+
+    from instrumentation import PROFILER, profile
+
+    PROFILER.clear(args.stage)
+    with profile(args.stage):
+        updated_context = _run_stage(args, config, keyword_data, context, persist=persist, force=force)
+    if PROFILER.enabled:
+        PROFILER.write(Path(args.output_dir) / METRICS_FILENAME, prefix=args.stage)
+    return updated_context
+
+
+def _run_stage(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    context: Dict[str, Any] | None,
+    *,
+    persist: bool,
+    force: bool,
+) -> Dict[str, Any]:
+    from artifact_store import ARTIFACTS
+    from instrumentation import profile
+
+    if context is None and args.stage != "stage1":
+        with profile("json_reads"):
+            context = load_stage_context(args)
+    output_dir = Path(args.output_dir)
+    with profile("input_hash"):
+        input_hash = stage_input_hash(args, config, keyword_data, context)
+
+    if not force:
+        cached_context = load_cached_context(output_dir, input_hash, getattr(args, "context_format", None) or "json")
+        if cached_context is not None:
+            return _reuse_stage(args, output_dir, cached_context, persist=persist)
+
+    try:
+        updated_context = STAGE_HANDLERS[args.stage](args, config, keyword_data, context)
+        if persist:
+            write_context(args, output_dir, updated_context, parent=context)
+    except BaseException:
+        ARTIFACTS.discard(output_dir)
+        raise
+    manifest = ARTIFACTS.commit(output_dir)
+    _logger().info("%s: %d artifact(s) changed, %d unchanged", args.stage, len(manifest["changed"]), len(manifest["unchanged"]))
+    record_stage_inputs(output_dir, args.stage, input_hash, updated_context)
+    return updated_context
+
+
+def _keep_artifacts(stage: str, output_dir: Path) -> None:
+    from artifact_store import ARTIFACTS
+
+    _logger().info("%s inputs unchanged; reusing artifacts in %s", stage, output_dir)
+    ARTIFACTS.mark_unchanged(output_dir)
+    ARTIFACTS.commit(output_dir)
+
+
+def _reuse_stage(args: argparse.Namespace, output_dir: Path, context: Dict[str, Any], *, persist: bool) -> Dict[str, Any]:
+    if persist:
+        write_context(args, output_dir, context, stage_copy=False)
+    _keep_artifacts(args.stage, output_dir)
+    return context
+
+
+def run_pipeline(
+    stages: Sequence[str] = tuple(STAGE_ORDER),
+    *,
+    output_root: Path,
+    config: Dict[str, Any] | None = None,
+    keyword_data: Dict[str, Any] | None = None,
+    context: Dict[str, Any] | None = None,
+    context_path: Path | None = None,
+    product: str | None = None,
+    persona_name: str | None = None,
+    lookback_days: int = 30,
+    keyword_seed: str | None = None,
+    shared_context: Path | None = None,
+    context_format: str = "json",
+    checkpoint: str = "end",
+    force: bool = False,
+    render_executor: str = "serial",
+    render_workers: int | None = None,
+    covered_clusters: Sequence[str] | None = None,
+    variant_count: int = 0,
+    variant_seed: int = 0,
+    check_duplicates: bool = False,
+    duplicate_threshold: float | None = None,
+) -> Dict[str, Any]:
+    """Run ``stages`` in order inside one process, passing the context between handlers in memory.
+
+    Each stage still writes its artifacts to ``output_root / <stage>``. The context is only
+    serialized as a checkpoint: once after the final stage (``checkpoint="end"``) or after every
+    stage (``checkpoint="each"``, matching the per-stage CLI layout). With
+    ``context_format="delta"`` each checkpoint is chained to the previous one, or to
+    ``context_path`` (where ``context`` was read from) for the first.
+
+    Stages that are not checkpointed are skipped on a rerun while their recorded inputs match:
+    the next stage's inputs are checked against the context hash they recorded, and their
+    contexts are only rebuilt when a later stage has changed and needs them.
+    """
+
+    from context_format import context_filename
+
+    unknown = [stage for stage in stages if stage not in STAGE_HANDLERS]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    if checkpoint not in CHECKPOINT_MODES:
+        raise ValueError(f"Checkpoint mode must be one of {', '.join(CHECKPOINT_MODES)}.")
+
+    config = config if config is not None else load_config()
+    if keyword_data is None:
+        keyword_data = load_keyword_clusters() if "stage1" in stages else {}
+
+    deferred: List[argparse.Namespace] = []  # unchanged stages whose contexts were not rebuilt
+    deferred_digest: str | None = None
+    for index, stage in enumerate(stages):
+        if context is None and not deferred and stage != "stage1":
+            raise FileNotFoundError(CONTEXT_REQUIREMENTS[stage])
+        args = argparse.Namespace(
+            stage=stage,
+            output_dir=str(Path(output_root) / stage),
+            context=str(context_path) if context_path else None,
+            product=product or config.get("product", "Affiliate Offer"),
+            persona_name=persona_name
+            or config.get("stage1", {}).get("persona", {}).get("name", "Target Persona"),
+            lookback_days=lookback_days,
+            keyword_seed=keyword_seed,
+            shared_context=str(shared_context) if shared_context else None,
+            context_format=context_format,
+            render_executor=render_executor,
+            render_workers=render_workers,
+            covered_clusters=list(covered_clusters) if covered_clusters else None,
+            variant_count=variant_count,
+            variant_seed=variant_seed,
+            check_duplicates=check_duplicates,
+            duplicate_threshold=duplicate_threshold,
+        )
+        persist = checkpoint == "each" or index == len(stages) - 1
+        if not force and (deferred or not persist):
+            output_dir = Path(args.output_dir)
+            digest = deferred_digest if deferred else None
+            input_hash = stage_input_hash(args, config, keyword_data, context, context_digest=digest)
+            record = recorded_stage_inputs(output_dir, input_hash)
+            if record is not None and not persist and record.get("output_hash"):
+                deferred.append(args)
+                deferred_digest = record["output_hash"]
+                continue
+            cached = load_cached_context(output_dir, input_hash, context_format) if record is not None else None
+            if cached is not None:
+                for skipped in deferred:
+                    _keep_artifacts(skipped.stage, Path(skipped.output_dir))
+                deferred.clear()
+                context = _reuse_stage(args, output_dir, cached, persist=persist)
+                context_path = output_dir / context_filename(context_format)
+                continue
+            for skipped in deferred:  # this stage changed, so it needs their real contexts
+                context = run_stage(skipped, config, keyword_data, context, persist=False)
+            deferred.clear()
+        context = run_stage(args, config, keyword_data, context, persist=persist, force=force)
+        if persist:
+            context_path = Path(args.output_dir) / context_filename(context_format)
+    return context or {}
+
+
+def load_manifest(path: Path) -> List[Dict[str, Any]]:
+    """Read the batch manifest: a JSON object with an ``articles`` list (or a bare list)."""
+
+    with path.open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    articles = data.get("articles") if isinstance(data, dict) else data
+    if not isinstance(articles, list):
+        raise ValueError("The batch manifest must include an 'articles' list.")
+    for entry in articles:
+        if not isinstance(entry, dict):
+            raise ValueError("Each manifest article must be a JSON object.")
+    article_directory_names(articles)
+    return articles
+
+
+def article_directory_name(index: int, entry: Dict[str, Any]) -> str:
+    if entry.get("id"):
+        return slugify(str(entry["id"]))
+    seed = entry.get("keyword_seed") or entry.get("product") or "article"
+    return f"{index:04d}-{slugify(str(seed)) or 'article'}"
+
+
+def article_directory_names(entries: Sequence[Dict[str, Any]]) -> List[str]:
+    """One directory name per manifest entry, rejecting ids that would share a directory.
+
+    Ids are used as given (slugified), so ``"Post A"`` and ``"post-a"`` collide; two batch
+    workers would otherwise write the same stage directories concurrently.
+    """
+
+    names = [article_directory_name(index, entry) for index, entry in enumerate(entries, start=1)]
+    owners: Dict[str, int] = {}
+    for index, (name, entry) in enumerate(zip(names, entries), start=1):
+        if not name:
+            raise ValueError(f"Manifest article {index} has an id with no usable characters: {entry['id']!r}.")
+        if name in owners:
+            raise ValueError(
+                f"Manifest articles {owners[name]} and {index} would share the directory {name!r}; "
+                "give them distinct ids."
+            )
+        owners[name] = index
+    return names
+
+
+def run_article(
+    entry: Dict[str, Any],
+    article_dir: Path,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    *,
+    context_format: str = "json",
+    force: bool = False,
+    render_executor: str = "serial",
+    render_workers: int | None = None,
+) -> Dict[str, Any]:
+    """Run stages 1–5 for one manifest entry with its artifacts under ``article_dir``.
+
+    The keyword options are passed to :func:`run_pipeline` unchanged.
+    """
+
+    from context_format import context_filename
+
+    return run_pipeline(
+        STAGE_ORDER,
+        output_root=article_dir,
+        config=config,
+        keyword_data=keyword_data,
+        product=entry.get("product"),
+        persona_name=entry.get("persona_name"),
+        lookback_days=int(entry.get("lookback_days", 30)),
+        keyword_seed=entry.get("keyword_seed"),
+        shared_context=article_dir / context_filename(context_format),
+        context_format=context_format,
+        force=force,
+        render_executor=render_executor,
+        render_workers=render_workers,
+    )
+
+
+def _init_batch_worker(config: Dict[str, Any], keyword_data: Dict[str, Any], options: Dict[str, Any]) -> None:
+    global _BATCH_CONFIG, _BATCH_KEYWORD_DATA, _BATCH_OPTIONS
+    _BATCH_CONFIG = config
+    _BATCH_KEYWORD_DATA = keyword_data
+    _BATCH_OPTIONS = options
+
+
+def _run_batch_article(job: Tuple[Dict[str, Any], str]) -> Dict[str, Any]:
+    entry, article_dir = job
+    if _BATCH_CONFIG is None or _BATCH_KEYWORD_DATA is None:
+        raise RuntimeError("Batch worker used before _init_batch_worker() was called.")
+    context = run_article(entry, Path(article_dir), _BATCH_CONFIG, _BATCH_KEYWORD_DATA, **_BATCH_OPTIONS)
+    return {
+        "article_dir": article_dir,
+        "product": context.get("product"),
+        "persona_name": context.get("persona_name"),
+        "keyword_seed": entry.get("keyword_seed"),
+        "primary_keyword": context.get("primary_keyword"),
+        "slug": context.get("slug"),
+        "word_count": context.get("word_count"),
+    }
+
+
+def run_batch(
+    entries: List[Dict[str, Any]],
+    output_dir: Path,
+    config: Dict[str, Any],
+    keyword_data: Dict[str, Any],
+    *,
+    workers: int | None = None,
+    context_format: str = "json",
+    force: bool = False,
+    render_executor: str = "serial",
+    render_workers: int | None = None,
+) -> Dict[str, Any]:
+    """Generate every manifest article in one process tree, sharing the parsed config.
+
+    The config, keyword data and pipeline options are handed to each worker a single time
+    through the pool initializer; articles are returned in manifest order.
+    """
+
+    import concurrent.futures
+
+    ensure_directory(output_dir)
+    jobs = [(entry, str(output_dir / name)) for entry, name in zip(entries, article_directory_names(entries))]
+    options = {
+        "context_format": context_format,
+        "force": force,
+        "render_executor": render_executor,
+        "render_workers": render_workers,
+    }
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+
+    started = time.perf_counter()
+    if workers == 1:
+        _init_batch_worker(config, keyword_data, options)
+        articles = [_run_batch_article(job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(config, keyword_data, options),
+        ) as executor:
+            articles = list(executor.map(_run_batch_article, jobs))
+    elapsed = time.perf_counter() - started
+
+    summary = {
+        "workers": workers,
+        "article_count": len(articles),
+        "elapsed_seconds": round(elapsed, 4),
+        "articles_per_second": round(len(articles) / elapsed, 2) if elapsed else None,
+        "articles": articles,
+    }
+    (output_dir / "batch_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
+
+
 def parse_args() -> argparse.Namespace:
+    from context_format import CONTEXT_FORMATS
+
     parser = argparse.ArgumentParser(description="Generate blog workflow artifacts by stage.")
-    parser.add_argument("stage", choices=STAGE_HANDLERS.keys())
+    parser.add_argument("stage", choices=[*STAGE_HANDLERS.keys(), "pipeline", "batch"])
     parser.add_argument("--output-dir", required=True, help="Directory to place generated artifacts")
-    parser.add_argument("--context", help="Path to context JSON from prior stage")
+    parser.add_argument("--context", help="Path to the prior stage's context (JSON or compact; detected from the file)")
+    parser.add_argument(
+        "--context-format",
+        dest="context_format",
+        choices=CONTEXT_FORMATS,
+        default="json",
+        help="Format of the written context: indented JSON (context.json), compact binary (context.ctx) "
+        "or only the keys each stage changed, chained to --context (context.delta.json)",
+    )
     parser.add_argument("--product", default=None)
     parser.add_argument("--persona-name", dest="persona_name", default=None)
     parser.add_argument("--lookback-days", dest="lookback_days", type=int, default=30)
-    return parser.parse_args()
+    parser.add_argument(
+        "--keyword-seed",
+        dest="keyword_seed",
+        default=None,
+        help="Prefer the best keyword cluster containing this phrase in Stage 1",
+    )
+    parser.add_argument(
+        "--keyword-data",
+        dest="keyword_data",
+        default=str(KEYWORD_DATA_PATH),
+        help="Keyword cluster export (.json, or .jsonl/.ndjson with one cluster per line)",
+    )
+    parser.add_argument(
+        "--top-clusters",
+        dest="top_clusters",
+        type=int,
+        default=None,
+        help=f"Stream the keyword export and keep only the K best clusters (default for JSON Lines: {DEFAULT_TOP_CLUSTERS})",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGE_HANDLERS.keys(),
+        default=STAGE_ORDER,
+        help="Pipeline mode: stages to run in order (default: all)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        choices=CHECKPOINT_MODES,
+        default="end",
+        help="Pipeline mode: write the context after the final stage only, or after each stage",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild artifacts even when the stage inputs are unchanged since the last run",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall/CPU time and peak memory per stage and sub-step in metrics.json",
+    )
+    parser.add_argument(
+        "--render-executor",
+        dest="render_executor",
+        choices=RENDER_EXECUTORS,
+        default="serial",
+        help=(
+            "Stages 2-4: render outline sections and per-platform/per-system plans serially or on a "
+            "thread/process pool (output order is unchanged)"
+        ),
+    )
+    parser.add_argument(
+        "--render-workers",
+        dest="render_workers",
+        type=int,
+        default=None,
+        help="Stages 2-4: pool size for --render-executor (default: executor's default)",
+    )
+    parser.add_argument(
+        "--skip-covered",
+        dest="skip_covered",
+        action="store_true",
+        help="Stage 1: pick the best cluster not yet targeted by a published article (see keyword_index.py)",
+    )
+    parser.add_argument(
+        "--published-dir",
+        dest="published_dirs",
+        action="append",
+        default=None,
+        help="With --skip-covered (required): directory of published articles searched for context files "
+        "(repeatable); the output directory and shared context are never counted",
+    )
+    parser.add_argument(
+        "--variants",
+        dest="variant_count",
+        type=int,
+        default=0,
+        help="Stage 2: also write N scored headline/hook/CTA variants to step2_5_variants.jsonl",
+    )
+    parser.add_argument(
+        "--variant-seed",
+        dest="variant_seed",
+        type=int,
+        default=0,
+        help="Stage 2: seed for the variant order (equal seeds give identical variants)",
+    )
+    parser.add_argument(
+        "--check-duplicates",
+        dest="check_duplicates",
+        action="store_true",
+        help="Stage 2: compare the final draft with published drafts (see near_duplicates.py) and record the result",
+    )
+    parser.add_argument(
+        "--duplicate-threshold",
+        dest="duplicate_threshold",
+        type=float,
+        default=None,
+        help="With --check-duplicates: estimated similarity that counts as a near duplicate (default: 0.5)",
+    )
+    parser.add_argument("--manifest", help="Batch mode: JSON manifest of articles to generate")
+    parser.add_argument("--workers", type=int, default=None, help="Batch mode: worker processes (default: CPU count)")
+    args = parser.parse_args()
+    if args.skip_covered and not args.published_dirs:
+        parser.error("--skip-covered requires at least one --published-dir")
+    return args
 
 
 def main() -> None:
+    import logging
+
+    from context_format import read_context
+    from instrumentation import enable_profiling
+
     args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    if args.profile:
+        enable_profiling()
     config = load_config()
-    keyword_data = load_keyword_clusters()
+    # Keyword clusters only feed Stage 1; later stages start from the saved context.
+    needs_keywords = args.stage in {"stage1", "batch"} or (args.stage == "pipeline" and "stage1" in args.stages)
+    manifest: List[Dict[str, Any]] = []
+    if args.stage == "batch":
+        if not args.manifest:
+            raise SystemExit("Batch mode requires --manifest.")
+        manifest = load_manifest(Path(args.manifest))
+    # Streaming keeps each seed's best cluster, so a batch passes every manifest seed.
+    seeds = [entry["keyword_seed"] for entry in manifest if entry.get("keyword_seed")] if manifest else args.keyword_seed
+    keyword_data = (
+        load_keyword_data(Path(args.keyword_data), top_k=args.top_clusters, keyword_seed=seeds) if needs_keywords else {}
+    )
+    args.covered_clusters = None
+    if args.skip_covered and needs_keywords and args.stage != "batch":
+        args.covered_clusters = published_covered_clusters(
+            keyword_data["clusters"],
+            [Path(path) for path in args.published_dirs],
+            article_root=Path(args.output_dir),
+        )
+
+    if args.stage == "batch":
+        run_batch(
+            manifest,
+            Path(args.output_dir),
+            config,
+            keyword_data,
+            workers=args.workers,
+            context_format=args.context_format,
+            force=args.force,
+            render_executor=args.render_executor,
+            render_workers=args.render_workers,
+        )
+        return
+
+    if args.stage == "pipeline":
+        context = None
+        if args.context:
+            context = read_context(Path(args.context))
+        run_pipeline(
+            args.stages,
+            output_root=Path(args.output_dir),
+            config=config,
+            keyword_data=keyword_data,
+            context=context,
+            context_path=Path(args.context) if args.context else None,
+            product=args.product,
+            persona_name=args.persona_name,
+            lookback_days=args.lookback_days,
+            keyword_seed=args.keyword_seed,
+            context_format=args.context_format,
+            checkpoint=args.checkpoint,
+            force=args.force,
+            render_executor=args.render_executor,
+            render_workers=args.render_workers,
+            covered_clusters=args.covered_clusters,
+            variant_count=args.variant_count,
+            variant_seed=args.variant_seed,
+            check_duplicates=args.check_duplicates,
+            duplicate_threshold=args.duplicate_threshold,
+        )
+        return
 
     args.product = args.product or config.get("product", "Affiliate Offer")
     args.persona_name = args.persona_name or config.get("stage1", {}).get("persona", {}).get("name", "Target Persona")
 
-    handler = STAGE_HANDLERS[args.stage]
-    if args.stage == "stage1":
-        handler(args, config, keyword_data)
-    else:
-        handler(args, config)
+    run_stage(args, config, keyword_data, force=args.force)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""Opt-in timing and memory instrumentation shared by the workflow scripts."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+PROFILE_ENV_VAR = "BLOG_WORKFLOW_PROFILE"
+
+
+class Profiler:
+    """Collect wall time, CPU time and peak traced memory for named, nestable sections.
+
+    Sections opened inside another are recorded as ``outer/inner``. Repeated sections are
+    aggregated: times are summed and the peak is the largest seen. ``tracemalloc`` keeps one
+    process-wide peak, so a section that overlaps a section on another thread (e.g. work fanned
+    out by ``executor_map`` on threads) records ``peak_memory_bytes`` as ``None`` (not measured).
+    When disabled, ``measure`` costs a single attribute check.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: List[Dict[str, Any]] = []
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        import tracemalloc  # only once profiling is on
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        stack = self._stack()
+        thread = threading.get_ident()
+        frame = {
+            "name": "/".join([*(entry["name"] for entry in stack), name]),
+            "thread": thread,
+            "concurrent": False,
+        }
+        with self._lock:
+            if any(entry["thread"] != thread for entry in self._open):
+                # Another thread is mid-section: the shared peak now mixes both, so neither is measured.
+                for entry in self._open:
+                    entry["concurrent"] = True
+                frame["concurrent"] = True
+            else:
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    stack[-1]["max_peak"] = max(stack[-1]["max_peak"], peak)
+                tracemalloc.reset_peak()
+                frame["baseline"] = frame["max_peak"] = current
+            self._open.append(frame)
+        stack.append(frame)
+        frame["wall"] = time.perf_counter()
+        frame["cpu"] = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame["wall"]
+            cpu = time.process_time() - frame["cpu"]
+            stack.pop()
+            with self._lock:
+                self._open.remove(frame)
+                peak_bytes = None
+                if not frame["concurrent"]:
+                    peak = max(tracemalloc.get_traced_memory()[1], frame["max_peak"])
+                    if stack:
+                        stack[-1]["max_peak"] = max(stack[-1]["max_peak"], peak)
+                    peak_bytes = peak - frame["baseline"]
+            self._record(frame["name"], wall, cpu, peak_bytes)
+
+    def _record(self, name: str, wall: float, cpu: float, peak_bytes: int | None) -> None:
+        with self._lock:
+            record = self.records.setdefault(
+                name,
+                {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_memory_bytes": 0},
+            )
+            record["calls"] += 1
+            record["wall_seconds"] += wall
+            record["cpu_seconds"] += cpu
+            if peak_bytes is None or record["peak_memory_bytes"] is None:
+                record["peak_memory_bytes"] = None
+            else:
+                record["peak_memory_bytes"] = max(record["peak_memory_bytes"], peak_bytes)
+
+    def clear(self, prefix: str | None = None) -> None:
+        with self._lock:
+            for name in [name for name in self.records if _matches(name, prefix)]:
+                del self.records[name]
+
+    def snapshot(self, prefix: str | None = None) -> Dict[str, Any]:
+        """Return the records (optionally only ``prefix`` and its sub-steps) as JSON-ready data."""
+
+        with self._lock:
+            sections = {
+                name: {
+                    **record,
+                    "wall_seconds": round(record["wall_seconds"], 6),
+                    "cpu_seconds": round(record["cpu_seconds"], 6),
+                }
+                for name, record in self.records.items()
+                if _matches(name, prefix)
+            }
+        return {"sections": sections}
+
+    def write(self, path: Path, prefix: str | None = None) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.snapshot(prefix), indent=2) + "\n", encoding="utf-8")
+
+
+def _matches(name: str, prefix: str | None) -> bool:
+    return prefix is None or name == prefix or name.startswith(f"{prefix}/")
+
+
+PROFILER = Profiler(enabled=os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"})
+
+
+def enable_profiling() -> None:
+    PROFILER.enabled = True
+
+
+def profile(name: str) -> Any:
+    """Measure a section with the process-wide profiler."""
+
+    return PROFILER.measure(name)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Inverted index from keyword terms to the clusters and published articles that target them.
+
+Built from the keyword cluster export and the published articles: every context file (JSON,
+compact or delta) with a ``slug`` under the published directories, one per slug, then
+persisted to ``.cache/keyword_index.json`` and reused until either source changes. There is
+no default published directory: the working output directory holds the article being
+generated, whose own contexts must not count as published, so it is excluded from the scan. It answers "which
+clusters or articles already target this keyword?" exactly, by prefix (binary search over the
+sorted terms) or fuzzily (trigram candidates ranked by Dice similarity), and lists the
+clusters already covered by a published article so Stage 1 can move on to the best uncovered
+one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+from artifact_store import write_if_changed
+from context_format import CONTEXT_FILENAMES, IncompatibleContextError, open_context
+from tokenizer import phrase_tokens
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_INDEX_PATH = ROOT / ".cache" / "keyword_index.json"  # KEYWORD_INDEX_PATH in the generator
+INDEX_VERSION = 1
+DEFAULT_FUZZY_THRESHOLD = 0.5
+
+LOGGER = logging.getLogger(__name__)
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase ``term`` and collapse punctuation and spacing, matching Stage 2's tokenizer."""
+
+    return " ".join(phrase_tokens(term))
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def find_published_contexts(directories: Iterable[Path], exclude: Iterable[Path] = ()) -> List[Path]:
+    """Context files under ``directories``, skipping any at or below an ``exclude`` path."""
+
+    excluded = [Path(path).resolve() for path in exclude]
+    paths: Set[Path] = set()
+    for directory in directories:
+        if directory.is_dir():
+            for filename in CONTEXT_FILENAMES.values():
+                paths.update(directory.rglob(filename))
+    return sorted(
+        path
+        for path in paths
+        if not any(path.resolve() == skip or skip in path.resolve().parents for skip in excluded)
+    )
+
+
+def _read_published(path: Path) -> Mapping[str, Any] | None:
+    """The published context at ``path``; compact contexts only decode the fields the index reads."""
+
+    try:
+        context = open_context(path)
+        if isinstance(context, Mapping) and context.get("slug"):
+            return context
+    except IncompatibleContextError as exc:
+        LOGGER.warning("Skipping %s: %s", path, exc)
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+    return None
+
+
+def _fingerprint(clusters: Sequence[Mapping[str, Any]], context_paths: Sequence[Path]) -> str:
+    digest = hashlib.sha256(f"v{INDEX_VERSION}".encode("utf-8"))
+    for cluster in clusters:
+        digest.update(f"\0c{cluster['id']}".encode("utf-8"))
+        for keyword in cluster.get("keywords", []):
+            digest.update(f"\0t{keyword['term']}".encode("utf-8"))
+    for path in context_paths:
+        stat = path.stat()
+        digest.update(f"\0p{path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class KeywordIndex:
+    """Term postings (cluster ids and article slugs) plus the published articles' targets."""
+
+    def __init__(
+        self,
+        postings: Dict[str, Dict[str, List[str]]],
+        articles: Dict[str, Dict[str, Any]],
+        *,
+        fingerprint: str = "",
+    ) -> None:
+        self.postings = postings
+        self.articles = articles
+        self.fingerprint = fingerprint
+        self.terms = sorted(postings)
+        self._trigram_index: Dict[str, List[int]] | None = None
+        self._trigram_counts: List[int] = []
+
+    @classmethod
+    def build(
+        cls,
+        clusters: Sequence[Mapping[str, Any]],
+        published: Iterable[Mapping[str, Any]] = (),
+        *,
+        fingerprint: str = "",
+    ) -> "KeywordIndex":
+        # Dicts keep first-seen order while de-duplicating in O(1).
+        entries: Dict[str, Dict[str, Dict[str, None]]] = {}
+
+        def post(term: str, field: str, value: str) -> None:
+            entry = entries.setdefault(normalize_term(term), {"clusters": {}, "slugs": {}})
+            entry[field][value] = None
+
+        for cluster in clusters:
+            for keyword in cluster.get("keywords", []):
+                post(keyword["term"], "clusters", str(cluster["id"]))
+        articles: Dict[str, Dict[str, Any]] = {}
+        for context in published:
+            slug = str(context["slug"])
+            cluster = context.get("winning_cluster") or {}
+            primary = normalize_term(context.get("primary_keyword") or "")
+            articles[slug] = {"cluster": cluster.get("id"), "primary_keyword": primary}
+            if primary:
+                post(primary, "slugs", slug)
+            for keyword in cluster.get("keywords", []):
+                post(keyword["term"], "slugs", slug)
+        entries.pop("", None)
+        postings = {term: {field: list(values) for field, values in entry.items()} for term, entry in entries.items()}
+        return cls(postings, articles, fingerprint=fingerprint)
+
+    def lookup(self, term: str) -> Dict[str, List[str]]:
+        """Clusters and published slugs containing exactly ``term`` (after normalization)."""
+
+        entry = self.postings.get(normalize_term(term), {"clusters": [], "slugs": []})
+        return {"clusters": list(entry["clusters"]), "slugs": list(entry["slugs"])}
+
+    def prefix(self, prefix: str, limit: int | None = None) -> List[str]:
+        """Indexed terms starting with ``prefix`` in sorted order, found by binary search."""
+
+        prefix = normalize_term(prefix)
+        matches: List[str] = []
+        position = bisect.bisect_left(self.terms, prefix)
+        while position < len(self.terms) and self.terms[position].startswith(prefix):
+            if limit is not None and len(matches) >= limit:
+                break
+            matches.append(self.terms[position])
+            position += 1
+        return matches
+
+    def fuzzy(self, term: str, limit: int = 10, threshold: float = DEFAULT_FUZZY_THRESHOLD) -> List[Tuple[str, float]]:
+        """Terms whose trigram Dice similarity to ``term`` is at least ``threshold``, best first.
+
+        Overlaps are tallied from the postings of the query's trigrams only, so a lookup reads
+        the terms sharing at least one trigram with the query instead of the whole vocabulary.
+        """
+
+        if self._trigram_index is None:
+            self._trigram_index = {}
+            for position, indexed in enumerate(self.terms):
+                grams = _trigrams(indexed)
+                self._trigram_counts.append(len(grams))
+                for gram in grams:
+                    self._trigram_index.setdefault(gram, []).append(position)
+        query = _trigrams(normalize_term(term))
+        shared: Counter[int] = Counter()
+        for gram in query:
+            shared.update(self._trigram_index.get(gram, ()))
+        scored = []
+        for position, overlap in shared.items():
+            similarity = 2 * overlap / (len(query) + self._trigram_counts[position])
+            if similarity >= threshold:
+                scored.append((self.terms[position], round(similarity, 4)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def covered_clusters(self) -> Set[str]:
+        """Clusters a published article already targets: its winning cluster, and every cluster
+        containing its primary keyword (which a new article would cannibalize)."""
+
+        covered: Set[str] = set()
+        for article in self.articles.values():
+            if article.get("cluster") is not None:
+                covered.add(str(article["cluster"]))
+            entry = self.postings.get(article.get("primary_keyword") or "")
+            if entry:
+                covered.update(entry["clusters"])
+        return covered
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "articles": self.articles,
+            "postings": self.postings,
+        }
+
+    def save(self, path: Path) -> bool:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_if_changed(path, json.dumps(self.to_dict(), sort_keys=True).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: Path) -> "KeywordIndex | None":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        return cls(data["postings"], data["articles"], fingerprint=data["fingerprint"])
+
+
+def load_keyword_index(
+    clusters: Sequence[Mapping[str, Any]],
+    published_dirs: Iterable[Path],
+    index_path: Path | None = DEFAULT_INDEX_PATH,
+    *,
+    exclude: Iterable[Path] = (),
+) -> KeywordIndex:
+    """Return the persisted index when its sources are unchanged, rebuilding (and saving) it otherwise.
+
+    ``exclude`` lists paths (the working output directory, the shared context) whose contexts
+    belong to the article being generated rather than to the published catalog.
+    """
+
+    context_paths = find_published_contexts(published_dirs, exclude)
+    fingerprint = _fingerprint(clusters, context_paths)
+    if index_path is not None:
+        index = KeywordIndex.load(index_path)
+        if index is not None and index.fingerprint == fingerprint:
+            return index
+    # Every stage (and the shared context) holds a copy of an article's context; keep the most
+    # recently written one per slug.
+    by_slug: Dict[str, Mapping[str, Any]] = {}
+    for path in sorted(context_paths, key=lambda path: path.stat().st_mtime_ns):
+        context = _read_published(path)
+        if context is not None:
+            by_slug[str(context["slug"])] = context
+    index = KeywordIndex.build(clusters, by_slug.values(), fingerprint=fingerprint)
+    if index_path is not None:
+        index.save(index_path)
+    return index
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("term", nargs="?", help="Keyword to look up")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--prefix", action="store_true", help="List indexed terms starting with TERM")
+    mode.add_argument("--fuzzy", action="store_true", help="List indexed terms similar to TERM")
+    mode.add_argument("--covered", action="store_true", help="List clusters already covered by published articles")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--keyword-data",
+        dest="keyword_data",
+        type=Path,
+        default=ROOT / "data" / "keyword_clusters.json",
+        help="Keyword cluster export (JSON)",
+    )
+    parser.add_argument(
+        "--published-dir",
+        dest="published_dirs",
+        type=Path,
+        action="append",
+        required=True,
+        help="Directory of published articles searched for context files (repeatable)",
+    )
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH, help="Persisted index location")
+    args = parser.parse_args(argv)
+    if not args.covered and not args.term:
+        parser.error("a TERM is required unless --covered is given")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    keyword_data = json.loads(args.keyword_data.read_text(encoding="utf-8"))
+    index = load_keyword_index(keyword_data["clusters"], args.published_dirs, args.index)
+    if args.covered:
+        result: Any = sorted(index.covered_clusters())
+    elif args.prefix:
+        result = {term: index.postings[term] for term in index.prefix(args.term, args.limit)}
+    elif args.fuzzy:
+        result = [
+            {"term": term, "similarity": similarity, **index.postings[term]}
+            for term, similarity in index.fuzzy(args.term, args.limit)
+        ]
+    else:
+        result = index.lookup(args.term)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
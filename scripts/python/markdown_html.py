@@ -0,0 +1,227 @@
+"""Streaming Markdown to HTML conversion for the publishing exports.
+
+Covers the block structure the workflow writes and publishes: ATX headings, paragraphs spanning
+several (wrapped) lines, nested ordered and unordered lists, thematic breaks, hard line breaks,
+leading YAML front matter (skipped) and lines holding a single raw HTML tag (passed through).
+Inline ``**strong**``, ``*emphasis*``, ```code``` and ``[links](url)`` are rendered; all other
+text is HTML-escaped.
+
+Input lines are consumed and HTML lines emitted incrementally, so memory holds at most one
+paragraph or list item no matter how long the document is.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import Collection, Iterable, Iterator, List, Mapping, TextIO
+
+HEADING_PATTERN = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+LIST_ITEM_PATTERN = re.compile(r"^([ \t]*)([-*+]|\d{1,9}[.)])(?:[ \t]+(.*))?$")
+THEMATIC_BREAK_PATTERN = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+HTML_TAG_LINE_PATTERN = re.compile(r"^ {0,3}</?[A-Za-z][A-Za-z0-9-]*(?:\s[^<>]*)?/?>[ \t]*$")
+INLINE_PATTERN = re.compile(
+    r"`([^`]+)`"
+    r"|\*\*(?!\s)(.+?)(?<!\s)\*\*"
+    r"|\*(?![\s*])(.+?)(?<![\s*])\*"
+    r"|(?<![A-Za-z0-9_])_(?![\s_])(.+?)(?<![\s_])_(?![A-Za-z0-9_])"
+    r"|\[([^\]]+)\]\(([^)\s]+)\)"
+)
+HARD_BREAK = "\n"
+
+
+def render_inline(text: str) -> str:
+    """Escape ``text`` and render its inline code, strong, emphasis and link spans."""
+
+    rendered: List[str] = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        rendered.append(html.escape(text[position : match.start()], quote=False))
+        code, strong, star_emphasis, underscore_emphasis, link_text, link_url = match.groups()
+        if code is not None:
+            rendered.append(f"<code>{html.escape(code, quote=False)}</code>")
+        elif strong is not None:
+            rendered.append(f"<strong>{render_inline(strong)}</strong>")
+        elif star_emphasis is not None or underscore_emphasis is not None:
+            rendered.append(f"<em>{render_inline(star_emphasis or underscore_emphasis)}</em>")
+        else:
+            rendered.append(f'<a href="{html.escape(link_url)}">{render_inline(link_text)}</a>')
+        position = match.end()
+    rendered.append(html.escape(text[position:], quote=False))
+    return "".join(rendered).replace(HARD_BREAK, "<br>")
+
+
+def _append_line(buffer: List[str], line: str) -> None:
+    """Join wrapped lines with a space; a trailing double space or backslash is a hard break."""
+
+    if buffer:
+        previous = buffer[-1]
+        hard = previous.endswith("  ") or previous.endswith("\\")
+        buffer[-1] = previous.rstrip().rstrip("\\") if hard else previous.rstrip()
+        buffer.append(HARD_BREAK if hard else " ")
+    buffer.append(line.lstrip())
+
+
+class _ListFrame:
+    __slots__ = ("tag", "indent", "content_indent", "item_lines", "item_open", "has_children")
+
+    def __init__(self, tag: str, indent: int, content_indent: int) -> None:
+        self.tag = tag
+        self.indent = indent
+        self.content_indent = content_indent
+        self.item_lines: List[str] = []
+        self.item_open = False
+        self.has_children = False
+
+
+def iter_html(
+    lines: Iterable[str],
+    *,
+    indent: str = "",
+    heading_attributes: Mapping[int, str] | None = None,
+    skip_heading_levels: Collection[int] = (),
+    front_matter: bool = True,
+) -> Iterator[str]:
+    """Convert Markdown ``lines`` (e.g. an open file) to HTML, yielding one output line at a time.
+
+    ``heading_attributes`` maps a heading level to extra attribute markup for its tag and
+    headings at ``skip_heading_levels`` are dropped, e.g. when the page title is rendered
+    separately. Every emitted line is prefixed with ``indent``.
+    """
+
+    heading_attributes = heading_attributes or {}
+    paragraph: List[str] = []
+    stack: List[_ListFrame] = []
+    blank_before = False
+
+    def flush_paragraph() -> Iterator[str]:
+        if paragraph:
+            yield f"{indent}<p>{render_inline(''.join(paragraph).rstrip())}</p>"
+            paragraph.clear()
+
+    def pad(depth: int) -> str:
+        return indent + "  " * depth
+
+    def flush_item_text(frame: _ListFrame, depth: int) -> Iterator[str]:
+        text = render_inline("".join(frame.item_lines).rstrip())
+        frame.item_lines.clear()
+        if frame.has_children:
+            yield f"{pad(depth + 2)}{text}"
+        else:
+            yield f"{pad(depth + 1)}<li>{text}"
+
+    def close_item() -> Iterator[str]:
+        frame, depth = stack[-1], 2 * (len(stack) - 1)
+        if not frame.item_open:
+            return
+        if frame.has_children:
+            if frame.item_lines:
+                yield from flush_item_text(frame, depth)
+            yield f"{pad(depth + 1)}</li>"
+        else:
+            yield f"{pad(depth + 1)}<li>{render_inline(''.join(frame.item_lines).rstrip())}</li>"
+            frame.item_lines.clear()
+        frame.item_open = frame.has_children = False
+
+    def close_list() -> Iterator[str]:
+        yield from close_item()
+        frame = stack.pop()
+        yield f"{pad(2 * len(stack))}</{frame.tag}>"
+
+    def close_blocks() -> Iterator[str]:
+        yield from flush_paragraph()
+        while stack:
+            yield from close_list()
+
+    iterator = iter(lines)
+    first = True
+    for raw_line in iterator:
+        line = raw_line.rstrip("\r\n")
+        if first:
+            first = False
+            if front_matter and line.strip() == "---":
+                for raw_line in iterator:
+                    if raw_line.rstrip("\r\n").strip() in {"---", "..."}:
+                        break
+                continue
+
+        if not line.strip():
+            yield from flush_paragraph()
+            blank_before = bool(stack)
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            yield from close_blocks()
+            level = len(heading.group(1))
+            if level not in skip_heading_levels:
+                attributes = heading_attributes.get(level, "")
+                text = render_inline((heading.group(2) or "").strip())
+                yield f"{indent}<h{level}{attributes}>{text}</h{level}>"
+            continue
+
+        if THEMATIC_BREAK_PATTERN.match(line):
+            yield from close_blocks()
+            yield f"{indent}<hr>"
+            continue
+
+        if HTML_TAG_LINE_PATTERN.match(line):
+            yield from close_blocks()
+            yield f"{indent}{line.strip()}"
+            continue
+
+        item = LIST_ITEM_PATTERN.match(line)
+        if item:
+            yield from flush_paragraph()
+            marker_indent = len(item.group(1).expandtabs(4))
+            marker = item.group(2)
+            tag = "ul" if marker in "-*+" else "ol"
+            content_indent = marker_indent + len(marker) + 1
+            while stack and marker_indent < stack[-1].indent:
+                yield from close_list()
+            top = stack[-1] if stack else None
+            if top is not None and top.item_open and marker_indent >= top.content_indent:
+                if top.item_lines or not top.has_children:
+                    yield from flush_item_text(top, 2 * (len(stack) - 1))
+                top.has_children = True
+                top = None
+            elif top is not None and top.tag == tag:
+                yield from close_item()
+            elif top is not None:
+                yield from close_list()
+                top = None
+            if top is None:
+                start = "" if tag == "ul" or int(marker[:-1]) == 1 else f' start="{int(marker[:-1])}"'
+                yield f"{pad(2 * len(stack))}<{tag}{start}>"
+                top = _ListFrame(tag, marker_indent, content_indent)
+                stack.append(top)
+            top.item_open = True
+            _append_line(top.item_lines, item.group(3) or "")
+            blank_before = False
+            continue
+
+        if stack and blank_before:
+            # After a blank line only text indented to an item's content continues that item.
+            indentation = len(line.expandtabs(4)) - len(line.expandtabs(4).lstrip())
+            while stack and indentation < stack[-1].content_indent:
+                yield from close_list()
+        if stack:
+            _append_line(stack[-1].item_lines, line)
+            blank_before = False
+            continue
+        _append_line(paragraph, line)
+        blank_before = False
+
+    yield from close_blocks()
+
+
+def write_html(lines: Iterable[str], handle: TextIO, **options: object) -> None:
+    """Stream the HTML for ``lines`` into ``handle``, one line per write."""
+
+    for html_line in iter_html(lines, **options):  # type: ignore[arg-type]
+        handle.write(html_line)
+        handle.write("\n")
+
+
+def markdown_to_html(text: str, **options: object) -> str:
+    return "\n".join(iter_html(text.splitlines(), **options))  # type: ignore[arg-type]
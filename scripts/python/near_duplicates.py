@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""Near-duplicate detection across generated drafts with MinHash signatures and LSH banding.
+
+Each draft is reduced to its lowercased word ``SHINGLE_SIZE``-grams (tokenized like Stage 2's
+analyses) and summarized by a ``NUM_PERM``-slot MinHash signature. The signature uses
+one-permutation hashing: every shingle is hashed once and the hash picks a slot and a value,
+keeping the minimum per slot; empty slots borrow from their nearest filled neighbour
+(rotation densification). The fraction of equal slots between two signatures estimates the
+Jaccard similarity of their shingle sets.
+
+Signatures are split into ``BANDS`` bands and every band is hashed into a bucket, so a query
+only scores the drafts sharing at least one bucket with it instead of the whole catalog. With
+the defaults (32 bands of 4 slots) a pair at similarity 0.5 shares a bucket 87% of the time,
+and one at 0.7 does so more than 99.9% of the time.
+
+Signatures of the published drafts (``artifacts/**/step6_5_final_draft.md`` and
+``content/*.md`` by default) persist in ``.cache/near_duplicates.marshal``. Only drafts whose
+size or mtime changed are rehashed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import marshal
+import operator
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from artifact_store import write_if_changed
+from tokenizer import WORD_PATTERN
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_INDEX_PATH = ROOT / ".cache" / "near_duplicates.marshal"
+DEFAULT_DRAFT_PATTERNS = ("artifacts/**/step6_5_final_draft.md", "content/*.md")
+INDEX_VERSION = 1
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+DEFAULT_THRESHOLD = 0.5
+WORD_ID_CACHE_SIZE = 65536
+
+_VALUE_MASK = (1 << 32) - 1
+_EMPTY = 1 << 63  # larger than any 64-bit hash or slot value
+_DENSIFY_OFFSET = 0x9E3779B1  # spreads borrowed values away from the neighbour's own
+
+Signature = array  # array("I") of NUM_PERM slot minima
+
+
+_WORD_IDS: Dict[str, int] = {}
+
+
+def word_ids(words: Sequence[str]) -> Tuple[int, ...]:
+    """CRC-32 of each word, memoized (up to ``WORD_ID_CACHE_SIZE`` words) since vocabularies repeat."""
+
+    try:
+        return tuple(map(_WORD_IDS.__getitem__, words))
+    except KeyError:
+        if len(_WORD_IDS) > WORD_ID_CACHE_SIZE:
+            _WORD_IDS.clear()
+        for word in words:
+            if word not in _WORD_IDS:
+                _WORD_IDS[word] = zlib.crc32(word.encode("utf-8"))
+        return tuple(map(_WORD_IDS.__getitem__, words))
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> Iterator[int]:
+    """Signed 64-bit hashes of the lowercased word ``size``-grams of ``text`` (one shingle if shorter).
+
+    Words are matched with the tokenizer's pattern directly rather than through
+    :func:`tokenizer.tokenize`, whose small cache is meant for the article being analysed.
+    """
+
+    ids = word_ids(WORD_PATTERN.findall(text.lower()))
+    if not ids:
+        return iter(())
+    if len(ids) <= size:
+        return iter((hash(ids),))
+    # Tuples of ints hash deterministically, so signatures are stable across processes.
+    return map(hash, zip(*(ids[offset:] for offset in range(size))))
+
+
+def minhash(text: str, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE) -> Signature | None:
+    """One-permutation MinHash signature of ``text``, or ``None`` when it has no words."""
+
+    minima = [_EMPTY] * num_perm
+    for value in shingle_hashes(text, shingle_size):
+        slot = value % num_perm
+        if value < minima[slot]:
+            minima[slot] = value
+    empty = minima.count(_EMPTY)
+    if empty == num_perm:
+        return None
+    # The slot is implied by the position, so keep 32 bits of each minimum's quotient.
+    slots = list(map(_VALUE_MASK.__and__, map(num_perm.__rfloordiv__, minima)))
+    if empty:
+        # Walk leftwards from the last filled slot so each empty slot borrows from its nearest
+        # filled slot to the right (wrapping around), offset by the distance.
+        last = num_perm - 1
+        while minima[last] == _EMPTY:
+            last -= 1
+        value, distance = slots[last], 0
+        for slot in range(last - 1, last - num_perm, -1):
+            if minima[slot] == _EMPTY:
+                distance += 1
+                slots[slot] = (value + distance * _DENSIFY_OFFSET) & _VALUE_MASK
+            else:
+                value, distance = slots[slot], 0
+    return array("I", slots)
+
+
+def estimate_similarity(first: Signature, second: Signature) -> float:
+    """Estimated Jaccard similarity: the fraction of signature slots that agree."""
+
+    return sum(map(operator.eq, first, second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """MinHash signatures keyed by document id, with LSH band buckets for candidate lookup."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, shingle_size: int = SHINGLE_SIZE) -> None:
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands}).")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.signatures: Dict[str, Signature] = {}
+        width = 4 * (num_perm // bands)  # bytes per band of the array("I") signature
+        self._band_slices = [slice(band * width, (band + 1) * width) for band in range(bands)]
+        # A bucket holds a bare id until a second document lands in it; most never do.
+        self._buckets: List[Dict[bytes, str | List[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self.signatures
+
+    def signature(self, text: str) -> Signature | None:
+        return minhash(text, self.num_perm, self.shingle_size)
+
+    def _band_keys(self, signature: Signature) -> Iterator[Tuple[Dict[bytes, str | List[str]], bytes]]:
+        return zip(self._buckets, map(signature.tobytes().__getitem__, self._band_slices))
+
+    def add(self, doc_id: str, text: str) -> Signature | None:
+        """Index ``text`` under ``doc_id`` (replacing an earlier version); empty texts are skipped."""
+
+        signature = self.signature(text)
+        if signature is None:
+            self.discard(doc_id)
+        else:
+            self.add_signature(doc_id, signature)
+        return signature
+
+    def add_signature(self, doc_id: str, signature: Signature) -> None:
+        if len(signature) != self.num_perm:
+            raise ValueError(f"Expected a {self.num_perm}-slot signature, got {len(signature)} slots.")
+        self.discard(doc_id)
+        self.signatures[doc_id] = signature
+        for buckets, key in self._band_keys(signature):
+            bucket = buckets.setdefault(key, doc_id)
+            if bucket is doc_id:
+                continue
+            if isinstance(bucket, str):
+                buckets[key] = [bucket, doc_id]
+            else:
+                bucket.append(doc_id)
+
+    def discard(self, doc_id: str) -> None:
+        signature = self.signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        for buckets, key in self._band_keys(signature):
+            bucket = buckets[key]
+            if isinstance(bucket, str):
+                del buckets[key]
+            else:
+                bucket.remove(doc_id)
+                if len(bucket) == 1:
+                    buckets[key] = bucket[0]
+
+    def candidates(self, signature: Signature) -> Set[str]:
+        """Documents sharing at least one band bucket with ``signature``."""
+
+        found: Set[str] = set()
+        for buckets, key in self._band_keys(signature):
+            bucket = buckets.get(key)
+            if isinstance(bucket, str):
+                found.add(bucket)
+            elif bucket:
+                found.update(bucket)
+        return found
+
+    def query_signature(
+        self,
+        signature: Signature,
+        threshold: float = DEFAULT_THRESHOLD,
+        limit: int | None = 10,
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, float]]:
+        """Indexed documents whose estimated similarity is at least ``threshold``, best first."""
+
+        candidates = self.candidates(signature).difference(exclude)
+        scored = []
+        for doc_id in candidates:
+            similarity = estimate_similarity(signature, self.signatures[doc_id])
+            if similarity >= threshold:
+                scored.append((doc_id, round(similarity, 4)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored if limit is None else scored[:limit]
+
+    def query(
+        self,
+        text: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        limit: int | None = 10,
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, float]]:
+        signature = self.signature(text)
+        return [] if signature is None else self.query_signature(signature, threshold, limit, exclude)
+
+    def report(self, threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+        """Every document's closest other document (among its LSH candidates), most similar first.
+
+        ``similarity`` is 0.0 and ``match`` is ``None`` when no candidate reaches ``threshold``.
+        """
+
+        rows = []
+        for doc_id, signature in self.signatures.items():
+            matches = self.query_signature(signature, threshold, limit=1, exclude=(doc_id,))
+            match, similarity = matches[0] if matches else (None, 0.0)
+            rows.append({"id": doc_id, "similarity": similarity, "match": match})
+        rows.sort(key=lambda row: (-row["similarity"], row["id"]))
+        return rows
+
+    def _params(self) -> Tuple[int, int, int, int, Tuple[int, int]]:
+        # Tuple hashing (and so the shingle hashes) may differ between Python versions.
+        return (INDEX_VERSION, self.num_perm, self.bands, self.shingle_size, sys.version_info[:2])
+
+
+def find_drafts(patterns: Iterable[str] = DEFAULT_DRAFT_PATTERNS, root: Path = ROOT) -> List[Path]:
+    paths: Set[Path] = set()
+    for pattern in patterns:
+        paths.update(path for path in root.glob(pattern) if path.is_file())
+    return sorted(paths)
+
+
+def draft_stats(patterns: Iterable[str] = DEFAULT_DRAFT_PATTERNS, root: Path = ROOT) -> Dict[str, Tuple[int, int]]:
+    """``(mtime_ns, size)`` of every draft by id; equal stats mean unchanged drafts."""
+
+    stats = {}
+    for path in find_drafts(patterns, root):
+        stat = path.stat()
+        stats[document_id(path, root)] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+def document_id(path: Path, root: Path = ROOT) -> str:
+    """Index key of a draft: its path relative to ``root`` (absolute when outside it)."""
+
+    try:
+        return path.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+def load_draft_index(
+    patterns: Iterable[str] = DEFAULT_DRAFT_PATTERNS,
+    index_path: Path | None = DEFAULT_INDEX_PATH,
+    *,
+    root: Path = ROOT,
+) -> NearDuplicateIndex:
+    """Index the drafts matching ``patterns``, reusing persisted signatures of unchanged files."""
+
+    index = NearDuplicateIndex()
+    stored: Dict[str, Tuple[int, int, bytes]] = {}
+    if index_path is not None:
+        try:
+            params, stored = marshal.loads(index_path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            stored = {}
+        else:
+            if params != index._params():
+                stored = {}
+
+    records: Dict[str, Tuple[int, int, bytes]] = {}
+    for path in find_drafts(patterns, root):
+        doc_id = document_id(path, root)
+        stat = path.stat()
+        record = stored.get(doc_id)
+        if record is not None and record[:2] == (stat.st_mtime_ns, stat.st_size):
+            signature = array("I")
+            signature.frombytes(record[2])
+            index.add_signature(doc_id, signature)
+        else:
+            signature = index.add(doc_id, path.read_text(encoding="utf-8"))
+            if signature is None:
+                continue
+            record = (stat.st_mtime_ns, stat.st_size, signature.tobytes())
+        records[doc_id] = record
+
+    if index_path is not None:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(index_path, marshal.dumps((index._params(), records)))
+    return index
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("draft", nargs="?", type=Path, help="Check this draft against the index instead of reporting")
+    parser.add_argument(
+        "--glob",
+        dest="patterns",
+        action="append",
+        default=None,
+        help="Draft glob relative to the repository root (repeatable; default: published drafts and content/*.md)",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum estimated similarity")
+    parser.add_argument("--flagged", action="store_true", help="Report only drafts with a match above the threshold")
+    parser.add_argument("--limit", type=int, default=10, help="Matches listed for a single draft")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH, help="Persisted signature location")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    patterns = args.patterns or DEFAULT_DRAFT_PATTERNS
+    if args.draft:
+        index = load_draft_index(patterns, args.index)
+        text = args.draft.read_text(encoding="utf-8")
+        matches = index.query(text, args.threshold, args.limit, exclude=(document_id(args.draft),))
+        result: Any = [{"id": doc_id, "similarity": similarity} for doc_id, similarity in matches]
+    else:
+        rows = load_draft_index(patterns, args.index).report(args.threshold)
+        result = [row for row in rows if row["match"]] if args.flagged else rows
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
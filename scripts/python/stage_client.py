@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Client for ``stage_server.py``: submit stage jobs to a running server.
+
+Only standard-library networking is imported, so each call costs a fraction of a cold
+``generate_stage_artifacts.py`` start. Paths are sent as absolute paths because the server
+resolves them against its own working directory. Exits non-zero when the job fails.
+
+    python scripts/python/stage_client.py run stage2 --output-dir artifacts/stage2 \\
+        --context artifacts/stage1/context.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+ROOT = Path(__file__).resolve().parents[2]
+SOCKET_ENV_VAR = "BLOG_WORKFLOW_SOCKET"
+DEFAULT_SOCKET_PATH = ROOT / ".cache" / "stage_server.sock"
+STAGE_NAMES = ("stage1", "stage2", "stage3", "stage4", "stage5")
+
+
+def default_socket_path() -> Path:
+    return Path(os.environ.get(SOCKET_ENV_VAR) or DEFAULT_SOCKET_PATH)
+
+
+def request(
+    message: Dict[str, Any],
+    *,
+    socket_path: Path | None = None,
+    host: str = "127.0.0.1",
+    port: int | None = None,
+    timeout: float | None = None,
+) -> Dict[str, Any]:
+    """Send one request to a running server and return its decoded response."""
+
+    if port is not None:
+        connection = socket.create_connection((host, port), timeout=timeout)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(str(socket_path or default_socket_path()))
+    with connection, connection.makefile("rb") as stream:
+        connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        line = stream.readline()
+    if not line:
+        raise ConnectionError("The stage server closed the connection without a response.")
+    return json.loads(line)
+
+
+def add_connection_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=default_socket_path(),
+        help=f"Unix socket path (default: ${SOCKET_ENV_VAR} or .cache/stage_server.sock)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host when --port is given")
+    parser.add_argument("--port", type=int, default=None, help="Use a localhost TCP port instead of the socket")
+
+
+def _absolute(path: str | None) -> str | None:
+    return str(Path(path).resolve()) if path else None
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    common = argparse.ArgumentParser(add_help=False)
+    add_connection_arguments(common)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", parents=[common], help="Run a stage (or pipeline) job on the server")
+    run.add_argument("stage", choices=[*STAGE_NAMES, "pipeline"])
+    run.add_argument("--output-dir", required=True, help="Directory to place generated artifacts")
+    run.add_argument("--context", help="Path to the prior stage's context (JSON or compact)")
+    run.add_argument("--shared-context", dest="shared_context", default=None)
+    run.add_argument("--context-format", dest="context_format", choices=("json", "compact", "delta"), default="json")
+    run.add_argument("--product", default=None)
+    run.add_argument("--persona-name", dest="persona_name", default=None)
+    run.add_argument("--lookback-days", dest="lookback_days", type=int, default=30)
+    run.add_argument("--keyword-seed", dest="keyword_seed", default=None)
+    run.add_argument("--skip-covered", dest="skip_covered", action="store_true")
+    run.add_argument(
+        "--published-dir",
+        dest="published_dirs",
+        action="append",
+        default=None,
+        help="With --skip-covered (required): directory of published articles (repeatable)",
+    )
+    run.add_argument("--variants", dest="variant_count", type=int, default=0)
+    run.add_argument("--variant-seed", dest="variant_seed", type=int, default=0)
+    run.add_argument("--check-duplicates", dest="check_duplicates", action="store_true")
+    run.add_argument("--duplicate-threshold", dest="duplicate_threshold", type=float, default=None)
+    run.add_argument("--stages", nargs="+", choices=STAGE_NAMES, default=None, help="Pipeline mode: stages to run")
+    run.add_argument("--checkpoint", choices=("end", "each"), default="end")
+    run.add_argument("--force", action="store_true")
+    run.add_argument("--render-executor", dest="render_executor", default="serial")
+    run.add_argument("--render-workers", dest="render_workers", type=int, default=None)
+    run.add_argument("--timeout", type=float, default=None, help="Seconds to wait for the job")
+
+    subparsers.add_parser("status", parents=[common], help="Show a running server's counters")
+    subparsers.add_parser("shutdown", parents=[common], help="Stop a running server")
+    args = parser.parse_args(argv)
+    if getattr(args, "skip_covered", False) and not args.published_dirs:
+        parser.error("--skip-covered requires at least one --published-dir")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "run":
+        message: Dict[str, Any] = {
+            "op": "run",
+            "stage": args.stage,
+            "output_dir": _absolute(args.output_dir),
+            "context_path": _absolute(args.context),
+            "shared_context": _absolute(args.shared_context),
+            "context_format": args.context_format,
+            "product": args.product,
+            "persona_name": args.persona_name,
+            "lookback_days": args.lookback_days,
+            "keyword_seed": args.keyword_seed,
+            "published_dirs": [_absolute(path) for path in args.published_dirs] if args.skip_covered else None,
+            "variant_count": args.variant_count,
+            "variant_seed": args.variant_seed,
+            "check_duplicates": args.check_duplicates,
+            "duplicate_threshold": args.duplicate_threshold,
+            "stages": args.stages,
+            "checkpoint": args.checkpoint,
+            "force": args.force,
+            "render_executor": args.render_executor,
+            "render_workers": args.render_workers,
+        }
+        timeout = args.timeout
+    else:
+        message, timeout = {"op": args.command}, 10.0
+    response = request(message, socket_path=args.socket, host=args.host, port=args.port, timeout=timeout)
+    print(json.dumps(response, indent=2))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
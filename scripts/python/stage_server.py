@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Long-running stage generator service.
+
+The server keeps one interpreter up with the modules imported, the workflow config and keyword
+data parsed and the templates compiled, then runs stage jobs sent over a Unix socket (or a
+localhost TCP port). The config and keyword files are re-read whenever they change on disk,
+so edits apply to the next job without a restart.
+
+The protocol is one JSON object per line in each direction. A job looks like::
+
+    {"op": "run", "stage": "stage2", "output_dir": "/abs/artifacts/stage2",
+     "context_path": "/abs/artifacts/stage1/context.json"}
+
+and is answered with ``{"ok": true, "artifacts": [...], "changed": [...], ...}`` or
+``{"ok": false, "error": "..."}``. ``"stage": "pipeline"`` with ``"stages"`` runs several
+stages in one job; ``{"op": "status"}`` and ``{"op": "shutdown"}`` are also understood.
+
+``stage_client.py`` is the matching client for scripts and CI jobs that would otherwise start
+``generate_stage_artifacts.py`` once per stage.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import generate_stage_artifacts as gsa
+from artifact_store import MANIFEST_FILENAME
+from context_format import read_context
+from instrumentation import enable_profiling
+from stage_client import DEFAULT_SOCKET_PATH, add_connection_arguments
+
+MAX_MESSAGE_BYTES = 64 << 20
+JOB_OPTION_NAMES = (
+    "product",
+    "persona_name",
+    "lookback_days",
+    "keyword_seed",
+    "covered_clusters",
+    "shared_context",
+    "context_format",
+    "variant_count",
+    "variant_seed",
+    "check_duplicates",
+    "duplicate_threshold",
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ServerError(Exception):
+    """A request the server could not run; reported to the client as ``{"ok": false}``."""
+
+
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WarmInputs:
+    """The parsed config and keyword data, re-read whenever their files change on disk.
+
+    A file that fails to parse mid-edit keeps the previously loaded value until it is valid
+    again. Keyword data is only loaded once a Stage 1 job needs it. When it is streamed down to
+    its best clusters, a job whose seed matches none of them reloads the export with that seed.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        keyword_path: Path,
+        *,
+        top_clusters: int | None = None,
+        snapshot_dir: Path | None = gsa.SNAPSHOT_DIR,
+    ) -> None:
+        self.config_path = config_path
+        self.keyword_path = keyword_path
+        self.top_clusters = top_clusters
+        self.snapshot_dir = snapshot_dir
+        self.reloads = 0
+        self._config: Dict[str, Any] | None = None
+        self._config_stamp: Tuple[int, int] | None = None
+        self._keyword_data: Dict[str, Any] | None = None
+        self._keyword_stamp: Tuple[int, int] | None = None
+        self._seeded_keyword_data: Dict[str, Dict[str, Any]] = {}
+
+    def config(self) -> Dict[str, Any]:
+        stamp = _file_stamp(self.config_path)
+        if stamp != self._config_stamp:
+            try:
+                self._config = gsa.load_json_snapshot(self.config_path, self.snapshot_dir)
+            except ValueError as exc:
+                if self._config is None:
+                    raise
+                LOGGER.warning("Keeping the previous config; %s does not parse: %s", self.config_path, exc)
+            else:
+                if self._config_stamp is not None:
+                    self.reloads += 1
+                    LOGGER.info("Reloaded config from %s", self.config_path)
+            self._config_stamp = stamp
+        assert self._config is not None
+        return self._config
+
+    def keyword_data(self, keyword_seed: str | None = None) -> Dict[str, Any]:
+        stamp = _file_stamp(self.keyword_path)
+        if stamp != self._keyword_stamp:
+            self._seeded_keyword_data.clear()
+            try:
+                self._keyword_data = gsa.load_keyword_data(
+                    self.keyword_path, top_k=self.top_clusters, snapshot_dir=self.snapshot_dir
+                )
+            except ValueError as exc:
+                if self._keyword_data is None:
+                    raise
+                LOGGER.warning("Keeping the previous keyword data; %s does not parse: %s", self.keyword_path, exc)
+            else:
+                if self._keyword_stamp is not None:
+                    self.reloads += 1
+                    LOGGER.info("Reloaded keyword data from %s", self.keyword_path)
+            self._keyword_stamp = stamp
+        assert self._keyword_data is not None
+        if (
+            keyword_seed
+            and gsa.streams_keyword_data(self.keyword_path, self.top_clusters)
+            and not gsa.clusters_matching_seed(self._keyword_data["clusters"], keyword_seed)
+        ):
+            return self._seeded(keyword_seed)
+        return self._keyword_data
+
+    def _seeded(self, keyword_seed: str) -> Dict[str, Any]:
+        """The streamed clusters plus ``keyword_seed``'s best match, which the top-K cut dropped."""
+
+        if keyword_seed not in self._seeded_keyword_data:
+            try:
+                data = gsa.load_keyword_data(self.keyword_path, top_k=self.top_clusters, keyword_seed=keyword_seed)
+            except ValueError as exc:
+                LOGGER.warning("Could not reload %s for the seed %r: %s", self.keyword_path, keyword_seed, exc)
+                assert self._keyword_data is not None
+                return self._keyword_data
+            self._seeded_keyword_data[keyword_seed] = data
+        return self._seeded_keyword_data[keyword_seed]
+
+
+def _stage_artifacts(output_dir: Path) -> Tuple[List[str], List[str]]:
+    """Artifact paths and the changed subset, from the manifest the stage just committed."""
+
+    manifest = json.loads((output_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    artifacts = [str(output_dir / name) for name in manifest["artifacts"]]
+    return artifacts, [str(output_dir / name) for name in manifest["changed"]]
+
+
+def _claim_socket(socket_path: Path) -> None:
+    """Remove a stale socket file left by a crashed server; refuse if a live server answers on it."""
+
+    if not socket_path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        socket_path.unlink(missing_ok=True)
+    else:
+        raise ServerError(f"A stage server is already listening on {socket_path}; stop it first.")
+    finally:
+        probe.close()
+
+
+class StageServer:
+    """Run stage jobs one at a time against warm inputs.
+
+    Jobs share the artifact store, the profiler and (by default) the shared ``context.json``,
+    so they are serialized; each runs on a worker thread so the event loop keeps accepting
+    connections and answering ``status`` while a long stage renders.
+    """
+
+    def __init__(self, inputs: WarmInputs, *, keyword_index_path: Path | None = gsa.KEYWORD_INDEX_PATH) -> None:
+        self.inputs = inputs
+        self.keyword_index_path = keyword_index_path
+        self.jobs = 0
+        self.failures = 0
+        self.started = time.time()
+        self._job_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+
+    def _run_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        stage = request.get("stage")
+        if stage != "pipeline" and stage not in gsa.STAGE_HANDLERS:
+            raise ServerError(f"Unknown stage {stage!r}; expected one of {', '.join(gsa.STAGE_ORDER)} or pipeline.")
+        if not request.get("output_dir"):
+            raise ServerError("Jobs require an output_dir.")
+        output_dir = Path(request["output_dir"])
+        config = self.inputs.config()
+        stages = list(request.get("stages") or gsa.STAGE_ORDER) if stage == "pipeline" else [stage]
+        keyword_data = self.inputs.keyword_data(request.get("keyword_seed")) if "stage1" in stages else {}
+        context = request.get("context")
+        if context is None and request.get("context_path"):
+            context = read_context(Path(request["context_path"]))
+        options = {name: request.get(name) for name in JOB_OPTION_NAMES}
+        if request.get("published_dirs") and "stage1" in stages:
+            # --skip-covered: the server scans the published articles with its warm keyword data.
+            options["covered_clusters"] = gsa.published_covered_clusters(
+                keyword_data["clusters"],
+                [Path(path) for path in request["published_dirs"]],
+                article_root=output_dir,
+                shared_context=options["shared_context"],
+                index_path=self.keyword_index_path,
+            )
+        options["lookback_days"] = int(options["lookback_days"] or 30)
+        options["context_format"] = options["context_format"] or "json"
+        options["variant_count"] = int(options["variant_count"] or 0)
+        options["variant_seed"] = int(options["variant_seed"] or 0)
+        options["check_duplicates"] = bool(options["check_duplicates"])
+
+        started = time.perf_counter()
+        if stage == "pipeline":
+            context = gsa.run_pipeline(
+                stages,
+                output_root=output_dir,
+                config=config,
+                keyword_data=keyword_data,
+                context=context,
+                context_path=request.get("context_path"),
+                checkpoint=request.get("checkpoint", "end"),
+                force=bool(request.get("force")),
+                render_executor=request.get("render_executor", "serial"),
+                render_workers=request.get("render_workers"),
+                **options,
+            )
+            stage_dirs = [output_dir / name for name in stages]
+        else:
+            args = argparse.Namespace(
+                stage=stage,
+                output_dir=str(output_dir),
+                context=request.get("context_path"),
+                render_executor=request.get("render_executor", "serial"),
+                render_workers=request.get("render_workers"),
+                **options,
+            )
+            args.product = args.product or config.get("product", "Affiliate Offer")
+            args.persona_name = args.persona_name or config.get("stage1", {}).get("persona", {}).get(
+                "name", "Target Persona"
+            )
+            if context is None and stage != "stage1":
+                raise ServerError(gsa.CONTEXT_REQUIREMENTS[stage])
+            context = gsa.run_stage(args, config, keyword_data, context, force=bool(request.get("force")))
+            stage_dirs = [output_dir]
+        elapsed = time.perf_counter() - started
+
+        artifacts: List[str] = []
+        changed: List[str] = []
+        for stage_dir in stage_dirs:
+            stage_artifacts, stage_changed = _stage_artifacts(stage_dir)
+            artifacts.extend(stage_artifacts)
+            changed.extend(stage_changed)
+        response: Dict[str, Any] = {
+            "ok": True,
+            "stage": stage,
+            "output_dir": str(output_dir),
+            "artifacts": artifacts,
+            "changed": changed,
+            "elapsed_seconds": round(elapsed, 4),
+        }
+        if request.get("return_context"):
+            response["context"] = context
+        return response
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "reloads": self.inputs.reloads,
+            "config_path": str(self.inputs.config_path),
+            "keyword_data_path": str(self.inputs.keyword_path),
+        }
+
+    async def handle_request(self, request: Any) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Requests must be JSON objects."}
+        op = request.get("op", "run")
+        if op == "status":
+            return self.status()
+        if op == "shutdown":
+            return {"ok": True, "stopping": True}
+        if op != "run":
+            return {"ok": False, "error": f"Unknown op {op!r}."}
+        async with self._job_lock:
+            self.jobs += 1
+            try:
+                return await asyncio.to_thread(self._run_job, request)
+            except ServerError as exc:
+                self.failures += 1
+                LOGGER.warning("Rejected job: %s", exc)
+                return {"ok": False, "error": str(exc)}
+            except Exception as exc:  # one bad job must not take the server down
+                self.failures += 1
+                LOGGER.exception("Job failed")
+                return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except ValueError as exc:
+                    response = {"ok": False, "error": f"Invalid JSON request: {exc}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+                if response.get("stopping"):
+                    # Stop only once the reply is out, so the client always gets it.
+                    self._stopping.set()
+                    break
+        except (ConnectionError, ValueError) as exc:  # ValueError: a line over MAX_MESSAGE_BYTES
+            LOGGER.warning("Dropped client connection: %s", exc)
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        *,
+        socket_path: Path | None = None,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+    ) -> None:
+        """Accept connections until a ``shutdown`` request or SIGTERM/SIGINT arrives."""
+
+        self.inputs.config()  # fail fast on an unreadable config, before accepting jobs
+        if port is not None:
+            server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_MESSAGE_BYTES)
+            LOGGER.info("Stage server listening on %s:%d", host, port)
+        else:
+            socket_path = socket_path or DEFAULT_SOCKET_PATH
+            gsa.ensure_directory(socket_path.parent)
+            _claim_socket(socket_path)
+            server = await asyncio.start_unix_server(self._handle_connection, socket_path, limit=MAX_MESSAGE_BYTES)
+            LOGGER.info("Stage server listening on %s", socket_path)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._stopping.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not the main thread, or no signal support on this platform
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            if port is None and socket_path is not None:
+                socket_path.unlink(missing_ok=True)
+        LOGGER.info("Stage server stopped after %d job(s)", self.jobs)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_connection_arguments(parser)
+    parser.add_argument("--config", type=Path, default=gsa.CONFIG_PATH, help="Workflow config JSON")
+    parser.add_argument(
+        "--keyword-data",
+        dest="keyword_data",
+        type=Path,
+        default=gsa.KEYWORD_DATA_PATH,
+        help="Keyword cluster export (.json, or .jsonl/.ndjson with one cluster per line)",
+    )
+    parser.add_argument(
+        "--top-clusters",
+        dest="top_clusters",
+        type=int,
+        default=None,
+        help="Stream the keyword export and keep only the K best clusters",
+    )
+    parser.add_argument("--profile", action="store_true", help="Write metrics.json beside each job's artifacts")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    if args.profile:
+        enable_profiling()
+    server = StageServer(WarmInputs(args.config, args.keyword_data, top_clusters=args.top_clusters))
+    asyncio.run(server.serve(socket_path=args.socket, host=args.host, port=args.port))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""A small compiled template language for the workflow's Markdown and HTML artifacts.
+
+Syntax::
+
+    {{ cluster.total_volume | format(",") }}       substitute a value, piped through filters
+    {% for item in items %} ... {% else %} ... {% endfor %}
+                                                   loop; ``else`` renders when nothing was iterated
+    {% for name, details in platforms | items %}   unpack pairs
+    {% if value %} / {% elif not other %} / {% else %} / {% endif %}
+    {% if details.metrics is defined %}            test key presence rather than truthiness
+    {% filter fill(100) %} ... {% endfilter %}     pipe a rendered block through filters
+    {# comment #}
+
+A line holding nothing but a block tag or comment is dropped entirely, so control flow does not
+leave blank lines behind. Names resolve against the render context; dotted lookups read mapping
+keys first, then attributes. Substituting a missing value raises :class:`TemplateError`, while
+conditions treat it as false.
+
+Each template is compiled to a Python function once. :class:`TemplateLoader` caches compiled
+templates per file until the file changes on disk, so a batch renders thousands of articles
+without re-parsing.
+"""
+
+from __future__ import annotations
+
+import ast
+import html
+import re
+from collections.abc import Mapping
+from pathlib import Path
+from textwrap import fill
+from typing import Any, Callable, Dict, List, TextIO, Tuple
+
+_TOKEN_PATTERN = re.compile(r"\{\{(.*?)\}\}|\{%(.*?)%\}|\{#.*?#\}", re.S)
+_STANDALONE_TAG_PATTERN = re.compile(r"^[ \t]*(\{%(?:(?!%\}).)*%\}|\{#(?:(?!#\}).)*#\})[ \t]*(?:\n|\Z)", re.M)
+_NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+_FILTER_PATTERN = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)\s*(?:\((.*)\))?$", re.S)
+
+
+class TemplateError(ValueError):
+    """Raised for template syntax errors and for substituting undefined values."""
+
+
+class _Undefined:
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __iter__(self) -> Any:
+        return iter(())
+
+    def __repr__(self) -> str:
+        return "UNDEFINED"
+
+
+UNDEFINED = _Undefined()
+
+
+def _lookup(value: Any, key: str) -> Any:
+    if value is UNDEFINED:
+        return UNDEFINED
+    if isinstance(value, Mapping):
+        return value[key] if key in value else UNDEFINED
+    return getattr(value, key, UNDEFINED)
+
+
+def _text(value: Any, expression: str, template: str) -> str:
+    if value is UNDEFINED:
+        raise TemplateError(f"{template}: '{expression}' is undefined")
+    return value if isinstance(value, str) else str(value)
+
+
+def _default(value: Any, fallback: Any = "") -> Any:
+    return value if value and value is not UNDEFINED else fallback
+
+
+FILTERS: Dict[str, Callable[..., Any]] = {
+    "compact": lambda value: [item for item in value if item],
+    "default": _default,
+    "escape": html.escape,
+    "fill": lambda value, width=100: fill(str(value), width=width),
+    "format": format,
+    "items": lambda value: list(value.items()),
+    "join": lambda value, separator="": separator.join(str(item) for item in value),
+    "length": len,
+    "lower": lambda value: str(value).lower(),
+    "replace": lambda value, old, new: str(value).replace(old, new),
+    "take": lambda value, count: list(value)[:count],
+    "title": lambda value: str(value).title(),
+    "upper": lambda value: str(value).upper(),
+}
+
+
+class Template:
+    """A template compiled to a Python render function."""
+
+    def __init__(self, source: str, name: str = "<template>") -> None:
+        self.name = name
+        self.code = _Compiler(source, name).compile()
+        namespace: Dict[str, Any] = {
+            "_lookup": _lookup,
+            "_text": _text,
+            "_join": "".join,
+            "UNDEFINED": UNDEFINED,
+            **{f"_f_{filter_name}": func for filter_name, func in FILTERS.items()},
+        }
+        exec(compile(self.code, f"<template {name}>", "exec"), namespace)  # noqa: S102 - compiled template
+        self._render: Callable[[Mapping[str, Any], Callable[[str], Any]], None] = namespace["render"]
+
+    def render(self, context: Mapping[str, Any] | None = None, /, **values: Any) -> str:
+        out: List[str] = []
+        self._render({**(context or {}), **values}, out.append)
+        return "".join(out)
+
+    def stream(self, handle: TextIO, context: Mapping[str, Any] | None = None, /, **values: Any) -> None:
+        """Write the output straight to ``handle`` as it is produced instead of building a string.
+
+        Iterable context values (e.g. generators) are consumed lazily by ``for`` loops.
+        """
+
+        self._render({**(context or {}), **values}, handle.write)
+
+
+class TemplateLoader:
+    """Load templates from ``directory``, compiling each file once until it changes on disk."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.compilations = 0
+        self._cache: Dict[str, Tuple[Tuple[int, int], Template]] = {}
+
+    def get(self, name: str) -> Template:
+        path = self.directory / name
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        template = Template(path.read_text(encoding="utf-8"), name)
+        self.compilations += 1
+        self._cache[name] = (signature, template)
+        return template
+
+    def render(self, name: str, context: Mapping[str, Any] | None = None, /, **values: Any) -> str:
+        return self.get(name).render(context, **values)
+
+    def stream(self, name: str, handle: TextIO, context: Mapping[str, Any] | None = None, /, **values: Any) -> None:
+        self.get(name).stream(handle, context, **values)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class _Compiler:
+    def __init__(self, source: str, name: str) -> None:
+        self.source = _STANDALONE_TAG_PATTERN.sub(r"\1", source)
+        self.name = name
+        self.lines: List[str] = []
+        self.indent = 1
+        self.scopes: List[set[str]] = [set()]
+        self.blocks: List[Tuple[str, Any]] = []
+        self.counter = 0
+
+    def error(self, message: str, offset: int) -> TemplateError:
+        line = self.source.count("\n", 0, offset) + 1
+        return TemplateError(f"{self.name}, line {line}: {message}")
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.indent + line)
+
+    def unique(self, prefix: str) -> str:
+        self.counter += 1
+        return f"_{prefix}{self.counter}"
+
+    def compile(self) -> str:
+        self.lines = ["def render(_ctx, _w):"]
+        position = 0
+        for match in _TOKEN_PATTERN.finditer(self.source):
+            if match.start() > position:
+                self.emit(f"_w({self.source[position:match.start()]!r})")
+            position = match.end()
+            if match.group(1) is not None:
+                expression = match.group(1).strip()
+                value = self.expression(expression, match.start())
+                self.emit(f"_w(_text({value}, {expression!r}, {self.name!r}))")
+            elif match.group(2) is not None:
+                self.statement(match.group(2).strip(), match.start())
+        if position < len(self.source):
+            self.emit(f"_w({self.source[position:]!r})")
+        if self.blocks:
+            raise self.error(f"unclosed '{self.blocks[-1][0]}' block", len(self.source))
+        self.lines.append("    return None")
+        return "\n".join(self.lines) + "\n"
+
+    def statement(self, body: str, offset: int) -> None:
+        keyword, _, rest = body.partition(" ")
+        rest = rest.strip()
+        if keyword == "for":
+            targets, separator, iterable = rest.partition(" in ")
+            names = [name.strip() for name in targets.split(",")]
+            if not separator or not all(_NAME_PATTERN.match(name) for name in names):
+                raise self.error(f"malformed for loop: {body!r}", offset)
+            empty_flag = self.unique("empty")
+            self.emit(f"{empty_flag} = True")
+            local_names = [f"_v_{name}" for name in names]
+            self.emit(f"for {', '.join(local_names)} in {self.expression(iterable.strip(), offset)}:")
+            self.indent += 1
+            self.emit(f"{empty_flag} = False")
+            self.scopes.append(set(names))
+            self.blocks.append(("for", empty_flag))
+        elif keyword == "if":
+            self.emit(f"if {self.condition(rest, offset)}:")
+            self.indent += 1
+            self.scopes.append(set())
+            self.blocks.append(("if", None))
+        elif keyword == "elif":
+            self.expect_block("if", offset)
+            self.emit("pass")
+            self.indent -= 1
+            self.emit(f"elif {self.condition(rest, offset)}:")
+            self.indent += 1
+        elif keyword == "else":
+            kind, state = self.expect_block(("if", "for"), offset)
+            self.emit("pass")
+            self.indent -= 1
+            self.scopes[-1] = set()
+            if kind == "for":
+                self.emit(f"if {state}:")
+                self.blocks[-1] = ("for-else", state)
+            else:
+                self.emit("else:")
+            self.indent += 1
+        elif keyword == "filter":
+            buffer = self.unique("buffer")
+            saved = self.unique("saved")
+            self.emit(f"{buffer} = []")
+            self.emit(f"{saved} = _w")
+            self.emit(f"_w = {buffer}.append")
+            self.blocks.append(("filter", (buffer, saved, rest)))
+        elif keyword in {"endfor", "endif", "endfilter"}:
+            kind, state = self.expect_block(
+                {"endfor": ("for", "for-else"), "endif": ("if",), "endfilter": ("filter",)}[keyword], offset
+            )
+            self.blocks.pop()
+            if kind == "filter":
+                buffer, saved, filters = state
+                self.emit(f"_w = {saved}")
+                self.emit(f"_w(str({self.apply_filters(f'_join({buffer})', filters, offset)}))")
+                return
+            self.emit("pass")
+            self.indent -= 1
+            self.scopes.pop()
+        else:
+            raise self.error(f"unknown tag {keyword!r}", offset)
+
+    def expect_block(self, kinds: Any, offset: int) -> Tuple[str, Any]:
+        kinds = (kinds,) if isinstance(kinds, str) else tuple(kinds)
+        if not self.blocks or self.blocks[-1][0] not in kinds:
+            raise self.error(f"unexpected tag outside a {'/'.join(kinds)} block", offset)
+        return self.blocks[-1]
+
+    def condition(self, text: str, offset: int) -> str:
+        negate = text.startswith("not ")
+        if negate:
+            text = text[4:].strip()
+        if text.endswith(" is defined"):
+            compiled = f"({self.expression(text[: -len(' is defined')].strip(), offset)} is not UNDEFINED)"
+        else:
+            compiled = self.expression(text, offset)
+        return f"not {compiled}" if negate else compiled
+
+    def expression(self, text: str, offset: int) -> str:
+        base, *filters = _split_pipes(text)
+        return self.apply_filters(self.value(base.strip(), offset), "|".join(filters), offset)
+
+    def apply_filters(self, value: str, filters: str, offset: int) -> str:
+        for spec in _split_pipes(filters) if filters.strip() else []:
+            match = _FILTER_PATTERN.match(spec.strip())
+            if not match or match.group(1) not in FILTERS:
+                raise self.error(f"unknown filter {spec.strip()!r}", offset)
+            arguments = ""
+            if match.group(2) is not None and match.group(2).strip():
+                try:
+                    parsed = ast.literal_eval(f"({match.group(2)},)")
+                except (SyntaxError, ValueError) as exc:
+                    raise self.error(f"filter arguments must be literals: {spec.strip()!r}", offset) from exc
+                arguments = "".join(f", {argument!r}" for argument in parsed)
+            value = f"_f_{match.group(1)}({value}{arguments})"
+        return value
+
+    def value(self, text: str, offset: int) -> str:
+        try:
+            return repr(ast.literal_eval(text))
+        except (SyntaxError, ValueError):
+            pass
+        head, *attributes = text.split(".")
+        if not _NAME_PATTERN.match(head) or not all(_NAME_PATTERN.match(attr) for attr in attributes):
+            raise self.error(f"invalid expression {text!r}", offset)
+        if any(head in scope for scope in self.scopes):
+            compiled = f"_v_{head}"
+        else:
+            compiled = f"_lookup(_ctx, {head!r})"
+        for attribute in attributes:
+            compiled = f"_lookup({compiled}, {attribute!r})"
+        return compiled
+
+
+def _split_pipes(text: str) -> List[str]:
+    """Split on ``|`` outside of quoted filter arguments."""
+
+    parts: List[str] = []
+    current: List[str] = []
+    quote = ""
+    for char in text:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = ""
+        elif char in "'\"":
+            quote = char
+            current.append(char)
+        elif char == "|":
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def render_string(source: str, context: Mapping[str, Any] | None = None, /, **values: Any) -> str:
+    """Compile and render ``source`` once; prefer :class:`TemplateLoader` for repeated renders."""
+
+    return Template(source).render(context, **values)
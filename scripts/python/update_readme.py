@@ -3,23 +3,41 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import html
+import http.client
 import json
 import logging
+import os
 import sys
+import tempfile
+import threading
+import time
 import urllib.error
-import urllib.request
+import urllib.parse
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import chain, islice
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from instrumentation import PROFILER, enable_profiling, profile
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_CONFIG = REPO_ROOT / "config" / "blogs.json"
 DEFAULT_README = REPO_ROOT / "README.md"
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "feeds"
+DEFAULT_METRICS_PATH = REPO_ROOT / "reports" / "update_readme_metrics.json"
 START_MARKER = "<!-- BLOG-POST-LIST:START -->"
 END_MARKER = "<!-- BLOG-POST-LIST:END -->"
+USER_AGENT = "Mozilla/5.0 (compatible; READMEUpdater/1.0; +https://github.com/)"
+REQUEST_TIMEOUT = 30.0
+DEFAULT_CONCURRENCY = 4
+DEFAULT_DEADLINE = 60.0
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
 
 
 class FeedUpdateError(RuntimeError):
@@ -69,31 +87,310 @@ def load_config(path: Path) -> List[BlogConfig]:
     return blogs
 
 
-def fetch_feed(config: BlogConfig, *, offline: bool = False) -> bytes:
-    if not offline and config.feed_url:
-        request = urllib.request.Request(
-            config.feed_url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; READMEUpdater/1.0; +https://github.com/)"
-            },
+class ConnectionPool:
+    """Thread-safe keep-alive HTTP(S) connections, reused per scheme, host and port.
+
+    Connections released after :meth:`close` (by a request that outlived the fetch deadline)
+    are closed instead of pooled.
+    """
+
+    def __init__(self, max_idle_per_host: int = DEFAULT_CONCURRENCY) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self.connections_opened = 0
+        self._idle: Dict[Tuple[str, str, int | None], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _acquire(self, key: Tuple[str, str, int | None], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+            self.connections_opened += 1
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=timeout), False
+
+    def _release(self, key: Tuple[str, str, int | None], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if not self._closed and len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def get(
+        self,
+        url: str,
+        *,
+        timeout: float,
+        headers: Dict[str, str] | None = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Issue a GET request, returning ``(status, headers, body)`` without following redirects."""
+
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported feed URL '{url}'")
+        key = (parts.scheme, parts.hostname, parts.port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity", **(headers or {})}
+
+        while True:
+            connection, reused = self._acquire(key, timeout)
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                connection.close()
+                if reused and not isinstance(exc, TimeoutError):
+                    # The server dropped an idle keep-alive connection; retry on a fresh one.
+                    continue
+                raise urllib.error.URLError(exc) from exc
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return response.status, response.headers, body
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle_connections = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for connection in idle_connections:
+            connection.close()
+
+
+@dataclass
+class CachedFeed:
+    """A feed body stored on disk with the validators needed for a conditional GET."""
+
+    url: str
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    def validators(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class FeedCache:
+    """On-disk feed cache keyed by feed URL.
+
+    Entries younger than ``ttl`` seconds are served without touching the network; older ones
+    are revalidated with ``If-None-Match``/``If-Modified-Since``. When a download fails the
+    cached body, however old, is used as the fallback.
+    """
+
+    directory: Path
+    ttl: float = 0.0
+    stats: Dict[str, int] = field(
+        default_factory=lambda: {"fresh": 0, "revalidated": 0, "downloaded": 0, "stale": 0}
+    )
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    @property
+    def hits(self) -> int:
+        return self.stats["fresh"] + self.stats["revalidated"] + self.stats["stale"]
+
+    @property
+    def misses(self) -> int:
+        return self.stats["downloaded"]
+
+    def lookup(self, url: str) -> CachedFeed | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return CachedFeed(
+            url=url,
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=float(meta.get("fetched_at", 0.0)),
+        )
+
+    def is_fresh(self, entry: CachedFeed) -> bool:
+        return self.ttl > 0 and time.time() - entry.fetched_at < self.ttl
+
+    def store(self, entry: CachedFeed) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(entry.url)
+        meta = {
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+        }
+        _atomic_write(body_path, entry.body)
+        _atomic_write(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hit(s) ({self.stats['fresh']} fresh, {self.stats['revalidated']} revalidated, "
+            f"{self.stats['stale']} stale fallback) and {self.misses} miss(es)"
         )
+
+
+class _StagedCache:
+    """Reads through to a :class:`FeedCache` but holds its writes and stats until :meth:`commit`.
+
+    A fetch that misses the deadline is never committed, so it cannot update the cache or its
+    counters after :func:`fetch_feeds` has returned.
+    """
+
+    def __init__(self, cache: FeedCache) -> None:
+        self.cache = cache
+        self._entries: List[CachedFeed] = []
+        self._outcomes: List[str] = []
+
+    def lookup(self, url: str) -> CachedFeed | None:
+        return self.cache.lookup(url)
+
+    def is_fresh(self, entry: CachedFeed) -> bool:
+        return self.cache.is_fresh(entry)
+
+    def store(self, entry: CachedFeed) -> None:
+        self._entries.append(entry)
+
+    def record(self, outcome: str) -> None:
+        self._outcomes.append(outcome)
+
+    def commit(self) -> None:
+        for entry in self._entries:
+            self.cache.store(entry)
+        for outcome in self._outcomes:
+            self.cache.record(outcome)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def download_feed(
+    url: str,
+    pool: ConnectionPool,
+    *,
+    timeout: float = REQUEST_TIMEOUT,
+    cache: FeedCache | _StagedCache | None = None,
+) -> bytes:
+    cached = cache.lookup(url) if cache else None
+    if cache and cached and cache.is_fresh(cached):
+        cache.record("fresh")
+        return cached.body
+
+    request_headers = cached.validators() if cached else {}
+    target = url
+    for _ in range(MAX_REDIRECTS + 1):
+        status, headers, body = pool.get(target, timeout=timeout, headers=request_headers)
+        if status in REDIRECT_STATUSES and headers.get("Location"):
+            target = urllib.parse.urljoin(target, headers["Location"])
+            continue
+        if status == 304 and cache and cached:
+            cached.fetched_at = time.time()
+            cache.store(cached)
+            cache.record("revalidated")
+            return cached.body
+        if status >= 400:
+            raise urllib.error.URLError(f"HTTP Error {status}")
+        if cache:
+            cache.store(
+                CachedFeed(
+                    url=url,
+                    body=body,
+                    etag=headers.get("ETag"),
+                    last_modified=headers.get("Last-Modified"),
+                    fetched_at=time.time(),
+                )
+            )
+            cache.record("downloaded")
+        return body
+    raise urllib.error.URLError(f"Too many redirects for '{url}'")
+
+
+def fetch_feed(
+    config: BlogConfig,
+    *,
+    offline: bool = False,
+    pool: ConnectionPool | None = None,
+    timeout: float = REQUEST_TIMEOUT,
+    cache: FeedCache | _StagedCache | None = None,
+) -> bytes:
+    if not offline and config.feed_url:
         try:
-            with urllib.request.urlopen(request, timeout=30) as response:
-                return response.read()
+            if pool is not None:
+                return download_feed(config.feed_url, pool, timeout=timeout, cache=cache)
+            with ConnectionPool() as own_pool:
+                return download_feed(config.feed_url, own_pool, timeout=timeout, cache=cache)
         except urllib.error.URLError as exc:  # pragma: no cover - network dependent
             logging.warning("Failed to download feed '%s': %s", config.feed_url, exc)
 
+    return fallback_feed(config, offline=offline, cache=cache)
+
+
+def fallback_feed(
+    config: BlogConfig,
+    *,
+    offline: bool = False,
+    cache: FeedCache | _StagedCache | None = None,
+) -> bytes:
+    """Serve the last cached copy of the feed, seeding from ``local_feed`` when nothing is cached."""
+
+    if cache and config.feed_url:
+        cached = cache.lookup(config.feed_url)
+        if cached is not None:
+            cache.record("stale")
+            return cached.body
+
     if config.local_feed and config.local_feed.exists():
         return config.local_feed.read_bytes()
 
     if offline and config.feed_url:
         raise FeedUpdateError(
-            f"Offline mode enabled but no local_feed found for '{config.name}'."
+            f"Offline mode enabled but no cached or local_feed copy found for '{config.name}'."
         )
 
     if config.feed_url:
         raise FeedUpdateError(
-            f"Unable to retrieve feed from '{config.feed_url}' and no local fallback provided."
+            f"Unable to retrieve feed from '{config.feed_url}' and no cached or local fallback available."
         )
 
     raise FeedUpdateError(
@@ -101,18 +398,138 @@ def fetch_feed(config: BlogConfig, *, offline: bool = False) -> bytes:
     )
 
 
-def parse_feed(content: bytes) -> List[tuple[str, str]]:
-    try:
-        root = ET.fromstring(content)
-    except ET.ParseError as exc:  # pragma: no cover - invalid input
-        raise FeedUpdateError(f"Unable to parse feed content: {exc}") from exc
-
-    tag_name = _strip_namespace(root.tag)
-    if tag_name == "rss":
-        return _parse_rss(root)
-    if tag_name == "feed":
-        return _parse_atom(root)
-    raise FeedUpdateError(f"Unsupported feed type '{root.tag}'.")
+def fetch_feeds(
+    blogs: Sequence[BlogConfig],
+    *,
+    offline: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    deadline: float = DEFAULT_DEADLINE,
+    timeout: float = REQUEST_TIMEOUT,
+    cache: FeedCache | None = None,
+) -> List[bytes]:
+    """Fetch every feed on a bounded thread pool, returning the bodies in config order.
+
+    Connections are reused per host. Each request's socket timeout is the budget left when it
+    starts, so no request outlives the total ``deadline`` by more than one socket operation.
+    Feeds that have not arrived by then fall back to their cached or local copy, just like a
+    failed download; a late request's cache writes and stats are dropped.
+    """
+
+    deadline_at = time.monotonic() + deadline
+    delivered: Dict[int, bytes] = {}
+    accepting = True
+    lock = threading.Lock()
+
+    def fetch(index: int, blog: BlogConfig, pool: ConnectionPool) -> None:
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            return
+        staged = _StagedCache(cache) if cache else None
+        content = fetch_feed(
+            blog, offline=offline, pool=pool, timeout=min(timeout, remaining), cache=staged
+        )
+        with lock:
+            if accepting:
+                delivered[index] = content
+                if staged:
+                    staged.commit()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="feed")
+    with ConnectionPool(max_idle_per_host=max(1, concurrency)) as pool:
+        try:
+            futures = [executor.submit(fetch, index, blog, pool) for index, blog in enumerate(blogs)]
+            done, _ = wait(futures, timeout=max(0.0, deadline_at - time.monotonic()))
+            with lock:
+                accepting = False
+            for future in done:
+                future.result()  # re-raise a feed with no usable copy
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    results: List[bytes] = []
+    for index, blog in enumerate(blogs):
+        if index not in delivered:
+            logging.warning(
+                "Feed '%s' missed the %.1fs deadline; using the fallback copy.", blog.feed_url, deadline
+            )
+            delivered[index] = fallback_feed(blog, offline=offline, cache=cache)
+        results.append(delivered[index])
+    return results
+
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+PARSE_CHUNK_SIZE = 64 * 1024
+
+
+def parse_feed(content: bytes | BinaryIO, *, max_posts: int | None = None) -> List[tuple[str, str]]:
+    """Return up to ``max_posts`` ``(title, link)`` pairs, reading no further than needed."""
+
+    return list(islice(iter_feed_posts(content), max_posts))
+
+
+def _feed_chunks(source: bytes | BinaryIO) -> Iterator[bytes]:
+    if isinstance(source, (bytes, bytearray)):
+        view = memoryview(source)
+        for start in range(0, len(view), PARSE_CHUNK_SIZE):
+            yield bytes(view[start : start + PARSE_CHUNK_SIZE])
+        return
+    while True:
+        chunk = source.read(PARSE_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_feed_posts(source: bytes | BinaryIO) -> Iterator[tuple[str, str]]:
+    """Incrementally parse an RSS or Atom feed, yielding each post as soon as it is complete.
+
+    Only the element currently being read is kept in memory: every RSS ``item``/Atom ``entry`` is
+    detached from its parent once yielded, so a huge feed parses in bounded memory and callers
+    that stop iterating early never read the rest of the document.
+    """
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    feed_type: str | None = None
+    channel: ET.Element | None = None
+
+    for chunk in chain(_feed_chunks(source), [None]):
+        try:
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            events = list(parser.read_events())
+        except ET.ParseError as exc:  # pragma: no cover - invalid input
+            raise FeedUpdateError(f"Unable to parse feed content: {exc}") from exc
+
+        for event, element in events:
+            if event == "start":
+                if feed_type is None:
+                    feed_type = _strip_namespace(element.tag)
+                    if feed_type not in {"rss", "feed"}:
+                        raise FeedUpdateError(f"Unsupported feed type '{element.tag}'.")
+                elif feed_type == "rss" and channel is None and len(stack) == 1 and element.tag == "channel":
+                    channel = element
+                stack.append(element)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if parent is None:
+                continue
+            if feed_type == "rss" and element.tag == "item" and parent is channel:
+                post = _rss_item_post(element)
+            elif feed_type == "feed" and element.tag == f"{ATOM_NS}entry" and len(stack) == 1:
+                post = _atom_entry_post(element)
+            else:
+                continue
+            parent.remove(element)
+            if post is not None:
+                yield post
+
+    if feed_type == "rss" and channel is None:
+        raise FeedUpdateError("RSS feed did not include a channel element.")
 
 
 def _strip_namespace(tag: str) -> str:
@@ -121,32 +538,23 @@ def _strip_namespace(tag: str) -> str:
     return tag
 
 
-def _parse_rss(root: ET.Element) -> List[tuple[str, str]]:
-    channel = root.find("channel")
-    if channel is None:
-        raise FeedUpdateError("RSS feed did not include a channel element.")
+def _rss_item_post(item: ET.Element) -> tuple[str, str] | None:
+    title = item.findtext("title", default="").strip()
+    link = item.findtext("link", default="").strip()
+    if title and link:
+        return html.unescape(title), link
+    return None
+
 
-    posts: List[tuple[str, str]] = []
-    for item in channel.findall("item"):
-        title = item.findtext("title", default="").strip()
-        link = item.findtext("link", default="").strip()
-        if title and link:
-            posts.append((html.unescape(title), link))
-    return posts
-
-
-def _parse_atom(root: ET.Element) -> List[tuple[str, str]]:
-    atom_ns = "{http://www.w3.org/2005/Atom}"
-    posts: List[tuple[str, str]] = []
-    for entry in root.findall(f"{atom_ns}entry"):
-        title = entry.findtext(f"{atom_ns}title", default="").strip()
-        link_element = entry.find(f"{atom_ns}link[@rel='alternate']")
-        if link_element is None:
-            link_element = entry.find(f"{atom_ns}link")
-        link = (link_element.get("href") if link_element is not None else "").strip()
-        if title and link:
-            posts.append((html.unescape(title), link))
-    return posts
+def _atom_entry_post(entry: ET.Element) -> tuple[str, str] | None:
+    title = entry.findtext(f"{ATOM_NS}title", default="").strip()
+    link_element = entry.find(f"{ATOM_NS}link[@rel='alternate']")
+    if link_element is None:
+        link_element = entry.find(f"{ATOM_NS}link")
+    link = (link_element.get("href") if link_element is not None else "").strip()
+    if title and link:
+        return html.unescape(title), link
+    return None
 
 
 def build_markdown(posts: Sequence[tuple[str, str]], *, max_posts: int) -> str:
@@ -176,20 +584,42 @@ def update_readme(readme_path: Path, lines: Iterable[str]) -> None:
     readme_path.write_text(updated, encoding="utf-8")
 
 
-def process(config_path: Path, readme_path: Path, *, offline: bool, dry_run: bool) -> List[str]:
+def process(
+    config_path: Path,
+    readme_path: Path,
+    *,
+    offline: bool,
+    dry_run: bool,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    deadline: float = DEFAULT_DEADLINE,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    cache_ttl: float = 0.0,
+) -> List[str]:
     blogs = load_config(config_path)
     markdown_sections: List[str] = []
 
-    for blog in blogs:
+    cache = FeedCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    with profile("fetch"):
+        feed_contents = fetch_feeds(
+            blogs,
+            offline=offline,
+            concurrency=concurrency,
+            deadline=deadline,
+            cache=cache,
+        )
+    if cache:
+        logging.info("Feed cache: %s", cache.summary())
+    for blog, feed_content in zip(blogs, feed_contents):
         logging.info("Processing feed for '%s'", blog.name)
-        feed_content = fetch_feed(blog, offline=offline)
-        posts = parse_feed(feed_content)
+        with profile("parse"):
+            posts = parse_feed(feed_content, max_posts=blog.max_posts)
         markdown_sections.append(build_markdown(posts, max_posts=blog.max_posts))
 
     if dry_run:
         return markdown_sections
 
-    update_readme(readme_path, markdown_sections)
+    with profile("readme_write"):
+        update_readme(readme_path, markdown_sections)
     return markdown_sections
 
 
@@ -212,11 +642,50 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="Skip network requests and rely solely on local feed files.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of feeds downloaded at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=DEFAULT_DEADLINE,
+        help="Total seconds allowed for all downloads before falling back to local feeds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for cached feed bodies and their ETag/Last-Modified validators (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0.0,
+        help="Serve cached feeds younger than this many seconds without a network request (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk feed cache.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Process the feeds but do not write to the README.",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_METRICS_PATH,
+        default=None,
+        metavar="METRICS_PATH",
+        help="Record wall/CPU time and peak memory for fetch and parse in a metrics JSON file "
+        f"(default path: {DEFAULT_METRICS_PATH.relative_to(REPO_ROOT)})",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -233,16 +702,26 @@ def main(argv: Sequence[str] | None = None) -> int:
         format="%(levelname)s: %(message)s",
     )
 
+    if args.profile:
+        enable_profiling()
+
     try:
         sections = process(
             args.config,
             args.readme,
             offline=args.offline,
             dry_run=args.dry_run,
+            concurrency=args.concurrency,
+            deadline=args.deadline,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            cache_ttl=args.cache_ttl,
         )
     except FeedUpdateError as exc:
         logging.error("%s", exc)
         return 1
+    finally:
+        if PROFILER.enabled:
+            PROFILER.write(args.profile or DEFAULT_METRICS_PATH)
 
     for idx, section in enumerate(sections, start=1):
         logging.info("Generated %d entries for feed %d", section.count("\n") + 1, idx)
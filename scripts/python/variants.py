@@ -0,0 +1,91 @@
+"""Seeded, lazy enumeration of A/B variant combinations.
+
+A :class:`VariantSpace` is the cartesian product of named axes (headlines, hooks, CTAs, ...).
+Combinations are addressed by a mixed-radix index, so the space is never materialized: a
+seed shuffles every axis and picks a stride coprime with the space size, and walking
+``index * stride + offset (mod size)`` visits each combination exactly once in a
+reproducible, well-mixed order. :func:`dedupe_rendered` drops rendered outputs that only
+differ in case, spacing or punctuation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Set
+
+from tokenizer import tokenize
+
+
+class VariantSpace:
+    """The product of named axes; empty axes are dropped and repeated values collapsed."""
+
+    def __init__(self, axes: Mapping[str, Iterable[str]]) -> None:
+        self.axes: Dict[str, List[str]] = {}
+        for name, values in axes.items():
+            unique = list(dict.fromkeys(value for value in values if value))
+            if unique:
+                self.axes[name] = unique
+        self.size = math.prod(len(values) for values in self.axes.values()) if self.axes else 0
+
+    def combination(self, index: int, axes: Mapping[str, Sequence[str]] | None = None) -> Dict[str, str]:
+        """Decode ``index`` (``0 <= index < size``) into one value per axis."""
+
+        axes = axes or self.axes
+        chosen: Dict[str, str] = {}
+        for name, values in axes.items():
+            index, digit = divmod(index, len(values))
+            chosen[name] = values[digit]
+        return chosen
+
+    def sample(self, count: int | None = None, seed: int = 0) -> Iterator[Dict[str, str]]:
+        """Yield up to ``count`` distinct combinations (all of them by default) in seeded order."""
+
+        if not self.size:
+            return
+        rng = random.Random(seed)
+        shuffled = {name: rng.sample(values, len(values)) for name, values in self.axes.items()}
+        stride = _coprime_stride(self.size, rng)
+        offset = rng.randrange(self.size)
+        limit = self.size if count is None else min(count, self.size)
+        for step in range(limit):
+            yield self.combination((step * stride + offset) % self.size, shuffled)
+
+
+def _coprime_stride(size: int, rng: random.Random) -> int:
+    """A stride coprime with ``size`` near the golden-ratio point, so steps spread out."""
+
+    if size <= 2:
+        return 1
+    stride = int(size * 0.6180339887) + rng.randrange(size // 8 + 1)
+    stride %= size
+    while math.gcd(stride, size) != 1:
+        stride = stride % (size - 1) + 1
+    return stride
+
+
+def signature(text: str) -> bytes:
+    """Digest of ``text``'s lowercased word tokens; equal for near-identical renderings.
+
+    The tokens come from the shared :func:`tokenizer.tokenize` cache, so scoring the same
+    text afterwards does not tokenize it again.
+    """
+
+    return hashlib.blake2b("\0".join(tokenize(text).lowered_words).encode("utf-8"), digest_size=16).digest()
+
+
+def dedupe_rendered(
+    items: Iterable[Any],
+    key: Callable[[Any], str],
+    seen: Set[bytes] | None = None,
+) -> Iterator[Any]:
+    """Yield ``items`` whose ``key`` text has not been seen, comparing token signatures."""
+
+    seen = set() if seen is None else seen
+    for item in items:
+        digest = signature(key(item))
+        if digest in seen:
+            continue
+        seen.add(digest)
+        yield item
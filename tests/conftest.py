@@ -0,0 +1,21 @@
+"""Make the workflow scripts importable the same way they import each other when run directly."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts" / "python"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the JSON snapshots of the config and keyword data out of the repository's ``.cache``."""
+
+    import generate_stage_artifacts as gsa
+
+    snapshots = tmp_path / "snapshots"
+    monkeypatch.setattr(gsa, "SNAPSHOT_DIR", snapshots)
+    return snapshots
@@ -0,0 +1,65 @@
+"""Tests for the content-addressed artifact writer."""
+
+import json
+import os
+from pathlib import Path
+
+from artifact_store import MANIFEST_FILENAME, ArtifactStore, write_if_changed
+
+
+def freeze_mtime(path: Path) -> int:
+    """Backdate ``path`` so a rewrite is detectable even on coarse-grained filesystems."""
+
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    return path.stat().st_mtime_ns
+
+
+def test_unchanged_artifacts_are_not_rewritten_and_the_manifest_lists_changes(tmp_path: Path) -> None:
+    store = ArtifactStore()
+    assert store.write_text(tmp_path / "a.md", "alpha\n")
+    with store.open_text(tmp_path / "b.html") as handle:
+        handle.write("<p>")
+        handle.write("beta</p>\n")
+    first = store.commit(tmp_path)
+    assert first["changed"] == ["a.md", "b.html"] and first["unchanged"] == []
+    a_mtime, b_mtime = freeze_mtime(tmp_path / "a.md"), freeze_mtime(tmp_path / "b.html")
+
+    store = ArtifactStore()
+    assert not store.write_text(tmp_path / "a.md", "alpha\n")
+    with store.open_text(tmp_path / "b.html") as handle:
+        handle.write("<p>beta, revised</p>\n")
+    second = store.commit(tmp_path)
+
+    assert (tmp_path / "a.md").stat().st_mtime_ns == a_mtime
+    assert (tmp_path / "b.html").stat().st_mtime_ns != b_mtime
+    assert (tmp_path / "b.html").read_text(encoding="utf-8") == "<p>beta, revised</p>\n"
+    assert second["changed"] == ["b.html"] and second["unchanged"] == ["a.md"]
+    assert json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8")) == second
+    assert {path.name for path in tmp_path.iterdir()} == {"a.md", "b.html", MANIFEST_FILENAME}
+
+
+def test_files_edited_outside_the_store_are_detected(tmp_path: Path) -> None:
+    store = ArtifactStore()
+    store.write_text(tmp_path / "a.md", "alpha\n")
+    store.commit(tmp_path)
+    (tmp_path / "a.md").write_text("ALPHA\n", encoding="utf-8")
+
+    store = ArtifactStore()
+    assert store.write_text(tmp_path / "a.md", "alpha\n")
+    assert (tmp_path / "a.md").read_text(encoding="utf-8") == "alpha\n"
+
+    store.mark_unchanged(tmp_path)
+    assert store.commit(tmp_path)["changed"] == ["a.md"]
+
+    store = ArtifactStore()
+    store.mark_unchanged(tmp_path)
+    assert store.commit(tmp_path)["unchanged"] == ["a.md"]
+
+
+def test_write_if_changed_compares_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "context.json"
+    assert write_if_changed(path, b"{}")
+    mtime = freeze_mtime(path)
+    assert not write_if_changed(path, b"{}")
+    assert path.stat().st_mtime_ns == mtime
+    assert write_if_changed(path, b"[]")
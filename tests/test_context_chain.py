@@ -0,0 +1,49 @@
+"""Tests for delta-chained stage contexts."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from context_chain import context_history, encode_delta, encode_pointer, resolve_context
+from context_format import read_context
+
+STAGE1 = {"slug": "devotion", "clusters": [{"id": "c1"}], "grade": 7}
+STAGE2 = {**STAGE1, "grade": 8, "draft": {"words": 1200}}
+STAGE3 = {key: value for key, value in STAGE2.items() if key != "clusters"}
+
+
+def test_deltas_store_changed_keys_and_resolve_through_pointers(tmp_path: Path) -> None:
+    paths = [tmp_path / f"stage{number}" / "context.delta.json" for number in (1, 2, 3)]
+    shared = tmp_path / "context.delta.json"
+    parent = parent_path = None
+    for number, (path, context) in enumerate(zip(paths, (STAGE1, STAGE2, STAGE3)), start=1):
+        path.parent.mkdir()
+        path.write_bytes(encode_delta(context, path, stage=f"stage{number}", parent=parent, parent_path=parent_path))
+        shared.write_bytes(encode_pointer(path, shared))
+        parent, parent_path = context, shared  # the next stage reads the shared pointer, as the CLI does
+
+    record = json.loads(paths[1].read_text(encoding="utf-8"))
+    assert record["set"] == {"grade": 8, "draft": {"words": 1200}}
+    assert record["parent_path"] == os.path.join("..", "stage1", "context.delta.json")
+    assert json.loads(paths[2].read_text(encoding="utf-8"))["removed"] == ["clusters"]
+
+    assert resolve_context(shared) == STAGE3 == read_context(paths[2])
+    assert resolve_context(paths[1]) == STAGE2
+    resolved = resolve_context(paths[1])
+    resolved["draft"]["words"] = 0
+    assert resolve_context(paths[1]) == STAGE2  # cached contexts are handed out as copies
+
+    history = context_history(shared)
+    assert [(entry["stage"], entry["set"]) for entry in history] == [
+        ("stage1", ["clusters", "grade", "slug"]),
+        ("stage2", ["draft", "grade"]),
+        ("stage3", []),
+    ]
+
+    regenerated = paths[0].with_name("regenerated.json")  # replaced atomically, as the artifact store does
+    regenerated.write_bytes(encode_delta({**STAGE1, "grade": 6}, paths[0], stage="stage1"))
+    os.replace(regenerated, paths[0])
+    with pytest.raises(ValueError, match="parent context changed"):
+        resolve_context(paths[2])
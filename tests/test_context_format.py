@@ -0,0 +1,67 @@
+"""Tests for the compact stage context format."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from context_format import (
+    MAGIC,
+    CompactContext,
+    IncompatibleContextError,
+    decode_context,
+    encode_context,
+    read_context,
+)
+
+CLUSTER = {
+    "id": "c1",
+    "label": "Devotion rituals",
+    "keywords": [{"term": f"ritual {n}", "volume": n} for n in range(12)],
+}
+CONTEXT = {
+    "slug": "devotion-rituals",
+    "winning_cluster": CLUSTER,
+    "clusters": [CLUSTER, {"id": "c2", "keywords": []}],
+    "scores": {"grade": 7.5, "passed": True, "missing": None},
+}
+
+
+def test_compact_round_trips_and_stores_repeated_subtrees_once(tmp_path: Path) -> None:
+    compact = encode_context(CONTEXT, "compact")
+    encoded = encode_context(CONTEXT, "json")
+
+    assert encoded == json.dumps(CONTEXT, indent=2).encode("utf-8")
+    assert len(compact) < len(encoded)
+    assert compact.count(b"ritual 11") == 1
+    assert decode_context(compact).to_dict() == CONTEXT == decode_context(encoded)
+
+    loaded = decode_context(compact).to_dict()
+    loaded["winning_cluster"]["keywords"].clear()
+    assert loaded["clusters"][0] == CLUSTER  # shared subtrees decode to independent copies
+
+    path = tmp_path / "context.ctx"
+    path.write_bytes(compact)
+    assert read_context(path) == CONTEXT and isinstance(read_context(path), dict)
+    with pytest.raises(ValueError):
+        encode_context(CONTEXT, "yaml")
+
+
+def test_compact_context_decodes_only_the_fields_it_reads() -> None:
+    context = decode_context(encode_context(CONTEXT, "compact"))
+
+    assert isinstance(context, CompactContext)
+    assert list(context) == list(CONTEXT) and len(context) == len(CONTEXT)
+    assert context["slug"] == "devotion-rituals" and context.get("missing") is None
+    assert list(context._decoded) == ["slug"]
+    assert context["clusters"][0] is context["clusters"][0]
+
+
+def test_compact_context_from_another_python_version_is_rejected() -> None:
+    compact = bytearray(encode_context(CONTEXT, "compact"))
+    compact[len(MAGIC) + 1] ^= 0xFF  # pretend another minor version wrote it
+
+    with pytest.raises(IncompatibleContextError, match="written by Python"):
+        decode_context(bytes(compact))
+    with pytest.raises(IncompatibleContextError, match="version"):
+        decode_context(b"BWCTX\x00\x01\n" + bytes(compact[len(MAGIC) :]))
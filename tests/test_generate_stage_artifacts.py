@@ -1,13 +1,25 @@
 """Tests for the generate_stage_artifacts helper utilities."""
 
+import argparse
+import json
+import sys
+import threading
+import tracemalloc
 from importlib import util
 from pathlib import Path
 
+import pytest
+
+from artifact_store import MANIFEST_FILENAME
+from context_format import MAGIC, read_context
+from instrumentation import PROFILER, Profiler
+
 
 MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "python" / "generate_stage_artifacts.py"
 SPEC = util.spec_from_file_location("generate_stage_artifacts", MODULE_PATH)
 assert SPEC and SPEC.loader  # narrow type for mypy/pyright
 gsa = util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = gsa  # worker processes unpickle functions through sys.modules
 SPEC.loader.exec_module(gsa)  # type: ignore[assignment]
 
 
@@ -55,3 +67,527 @@ def test_cluster_metrics_preserves_value_order() -> None:
     assert metrics["pinterest_angles"] == ["First angle", "Second angle"]
     assert metrics["meta_hooks"] == ["Hook one", "Hook two"]
     assert metrics["emotional_drivers"] == ["Hope", "Trust", "Joy"]
+
+
+def test_compute_keyword_densities_matches_single_keyword_counts() -> None:
+    text = "Phrases to make him obsessed work. Make him obsessed, make him commit; him him him."
+    keywords = ["make him obsessed", "him", "him him", "make him commit", "missing phrase"]
+
+    densities = gsa.compute_keyword_densities(text, keywords)
+
+    total_words = 15
+    assert densities == {
+        "make him obsessed": 2 / total_words,
+        "him": 6 / total_words,
+        "him him": 2 / total_words,
+        "make him commit": 1 / total_words,
+        "missing phrase": 0.0,
+    }
+    assert gsa.compute_keyword_density(text, "make him obsessed") == densities["make him obsessed"]
+
+
+def test_run_batch_generates_each_manifest_article(tmp_path: Path) -> None:
+    config = gsa.load_config()
+    keyword_data = gsa.load_keyword_clusters()
+    entries = [
+        {"id": "Scripts", "keyword_seed": "phrases to make him obsessed"},
+        {"keyword_seed": "emotional intimacy exercises", "persona_name": "Busy Founder"},
+    ]
+
+    summary = gsa.run_batch(entries, tmp_path, config, keyword_data, workers=1)
+
+    assert [article["article_dir"] for article in summary["articles"]] == [
+        str(tmp_path / "scripts"),
+        str(tmp_path / "0002-emotional-intimacy-exercises"),
+    ]
+    assert summary["articles"][1]["persona_name"] == "Busy Founder"
+    assert summary["articles"][1]["primary_keyword"] == "how to reconnect with your boyfriend"
+    for article in summary["articles"]:
+        article_dir = Path(article["article_dir"])
+        assert (article_dir / "stage5" / "stage5_growth_loop.md").exists()
+        assert (article_dir / "context.json").read_text(encoding="utf-8") == (
+            article_dir / "stage5" / "context.json"
+        ).read_text(encoding="utf-8")
+
+
+def test_run_batch_worker_processes_match_the_serial_run(tmp_path: Path) -> None:
+    config = gsa.load_config()
+    keyword_data = gsa.load_keyword_clusters()
+    entries = [
+        {"id": "Scripts", "keyword_seed": "phrases to make him obsessed"},
+        {"keyword_seed": "emotional intimacy exercises", "persona_name": "Busy Founder"},
+    ]
+    options = {"context_format": "compact", "render_executor": "threads", "render_workers": 2}
+
+    serial = gsa.run_batch(entries, tmp_path / "serial", config, keyword_data, workers=1, **options)
+    pooled = gsa.run_batch(entries, tmp_path / "pooled", config, keyword_data, workers=2, **options)
+
+    assert pooled["workers"] == 2
+    assert [{**article, "article_dir": Path(article["article_dir"]).name} for article in pooled["articles"]] == [
+        {**article, "article_dir": Path(article["article_dir"]).name} for article in serial["articles"]
+    ]
+
+    def content(path: Path) -> object:
+        if path.name != MANIFEST_FILENAME:
+            return path.read_bytes()
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        for entry in manifest["artifacts"].values():
+            del entry["mtime_ns"]  # write times differ between the two runs
+        return manifest
+
+    def tree(root: Path) -> dict:
+        return {
+            str(path.relative_to(root)): content(path)
+            for path in sorted(root.rglob("*"))
+            if path.is_file() and path.name != "batch_summary.json"
+        }
+
+    serial_files = tree(tmp_path / "serial")
+    assert tree(tmp_path / "pooled") == serial_files
+    assert "scripts/context.ctx" in serial_files and "scripts/context.json" not in serial_files
+
+
+def test_article_directory_names_reject_colliding_ids(tmp_path: Path) -> None:
+    entries = [{"id": "Post A"}, {"keyword_seed": "post a"}, {"id": "post-a"}]
+    with pytest.raises(ValueError, match="articles 1 and 3 would share the directory 'post-a'"):
+        gsa.article_directory_names(entries)
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"articles": entries}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        gsa.load_manifest(manifest)
+    assert gsa.article_directory_names(entries[:2]) == ["post-a", "0002-post-a"]
+
+
+def test_run_pipeline_threads_context_in_memory(tmp_path: Path) -> None:
+    shared = tmp_path / "context.json"
+
+    context = gsa.run_pipeline(output_root=tmp_path, shared_context=shared)
+
+    assert context["growth_actions"] and context["distribution"]["slug"] == context["slug"]
+    assert [path.parent.name for path in sorted(tmp_path.glob("stage*/context.json"))] == ["stage5"]
+    assert (tmp_path / "stage2" / "step8_5_seo_package.json").exists()
+    assert json.loads(shared.read_text(encoding="utf-8")) == context
+
+    gsa.run_pipeline(
+        ["stage3", "stage4"],
+        output_root=tmp_path / "each",
+        context=context,
+        shared_context=shared,
+        checkpoint="each",
+    )
+
+    assert sorted(path.parent.name for path in (tmp_path / "each").glob("stage*/context.json")) == ["stage3", "stage4"]
+
+
+def test_step7_keeps_the_final_close_and_concluding_paragraph_apart(tmp_path: Path) -> None:
+    gsa.run_pipeline(["stage1", "stage2"], output_root=tmp_path, shared_context=tmp_path / "context.json")
+    html = (tmp_path / "stage2" / "step7_clickbank_html.html").read_text(encoding="utf-8")
+    paragraphs = [line.strip() for line in html.splitlines() if line.strip().startswith("<p>")]
+
+    close = next(index for index, text in enumerate(paragraphs) if text.startswith("<p>You are not chasing his love"))
+    assert paragraphs[close].endswith("calm, steady backdrop of your life.</p>")
+    assert paragraphs[close + 1].startswith("<p>The ") and "persona now has a high-converting ritual" in paragraphs[close + 1]
+
+
+def test_run_pipeline_rerun_skips_stages_it_did_not_checkpoint(tmp_path: Path, monkeypatch) -> None:
+    config = gsa.load_config()
+    shared = tmp_path / "context.json"
+    first = gsa.run_pipeline(output_root=tmp_path, config=config, shared_context=shared)
+    calls = []
+    for stage, handler in list(gsa.STAGE_HANDLERS.items()):
+
+        def counted(*args, _stage=stage, _handler=handler):
+            calls.append(_stage)
+            return _handler(*args)
+
+        monkeypatch.setitem(gsa.STAGE_HANDLERS, stage, counted)
+
+    assert gsa.run_pipeline(output_root=tmp_path, config=config, shared_context=shared) == first
+    assert calls == []
+    assert not json.loads((tmp_path / "stage2" / MANIFEST_FILENAME).read_text(encoding="utf-8"))["changed"]
+
+    # A changed later stage rebuilds the earlier contexts it needs from the unchanged stages.
+    config["stage5"] = {**config["stage5"], "extra": True}
+    assert gsa.run_pipeline(output_root=tmp_path, config=config, shared_context=shared) == first
+    assert calls == gsa.STAGE_ORDER
+
+
+def test_run_stage_skips_when_inputs_are_unchanged(tmp_path: Path) -> None:
+    config = gsa.load_config()
+    keyword_data = gsa.load_keyword_clusters()
+    args = argparse.Namespace(
+        stage="stage1",
+        output_dir=str(tmp_path / "stage1"),
+        context=None,
+        product="Offer",
+        persona_name="Persona",
+        lookback_days=30,
+        keyword_seed=None,
+        shared_context=str(tmp_path / "context.json"),
+    )
+    gsa.run_stage(args, config, keyword_data)
+    persona_path = tmp_path / "stage1" / "step2_target_persona.md"
+    persona_path.write_text("edited by hand\n", encoding="utf-8")
+
+    gsa.run_stage(args, config, keyword_data)
+    assert persona_path.read_text(encoding="utf-8") == "edited by hand\n"
+
+    gsa.run_stage(args, config, keyword_data, force=True)
+    assert persona_path.read_text(encoding="utf-8").startswith("# Stage 1")
+
+    persona_path.write_text("edited by hand\n", encoding="utf-8")
+    config["stage1"]["seo_templates"]["hooks"].append("A brand new hook.")
+    gsa.run_stage(args, config, keyword_data)
+    assert persona_path.read_text(encoding="utf-8").startswith("# Stage 1")
+
+
+def test_run_stage_writes_profile_metrics_when_enabled(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(PROFILER, "enabled", True)
+    monkeypatch.setattr(PROFILER, "records", {})
+
+    try:
+        gsa.run_pipeline(["stage1", "stage2"], output_root=tmp_path, shared_context=tmp_path / "context.json")
+    finally:
+        tracemalloc.stop()
+
+    sections = json.loads((tmp_path / "stage2" / "metrics.json").read_text(encoding="utf-8"))["sections"]
+    for name in ("stage2", "stage2/tokenization", "stage2/density", "stage2/readability", "stage2/rendering"):
+        assert sections[name]["calls"] >= 1
+        assert sections[name]["wall_seconds"] >= 0 and sections[name]["cpu_seconds"] >= 0
+    assert sections["stage2"]["peak_memory_bytes"] >= sections["stage2/density"]["peak_memory_bytes"]
+    assert not any(name.startswith("stage1") for name in sections)
+
+
+def test_profiler_marks_sections_overlapping_other_threads_as_not_measured() -> None:
+    profiler = Profiler(enabled=True)
+    barrier = threading.Barrier(2)
+
+    def section(size: int) -> int:
+        with profiler.measure("section"):
+            barrier.wait(timeout=5)  # both threads are inside a section at once
+            return len(bytearray(size))
+
+    try:
+        with profiler.measure("serial"):
+            bytearray(1 << 20)
+        with profiler.measure("fan_out"):
+            assert gsa.executor_map(section, [1 << 10, 1 << 20], executor="threads", workers=2) == [1 << 10, 1 << 20]
+    finally:
+        tracemalloc.stop()
+
+    sections = profiler.snapshot()["sections"]
+    assert sections["serial"]["peak_memory_bytes"] >= 1 << 20
+    assert sections["fan_out"]["peak_memory_bytes"] is None
+    assert sections["section"] == {**sections["section"], "calls": 2, "peak_memory_bytes": None}
+
+
+def test_cluster_metrics_columnar_matches_dict_based_metrics() -> None:
+    clusters = gsa.load_keyword_clusters()["clusters"] + [
+        {
+            "id": "ties",
+            "label": "Ties",
+            "conversion_potential": "Low",
+            "keywords": [
+                {"term": "first", "volume": 50, "difficulty": 20},
+                {"term": "second", "volume": 90, "difficulty": 40, "ctr_estimate": 0.1},
+                {"term": "third", "volume": 50, "difficulty": 30, "ctr_estimate": 0.3},
+                {"term": "fourth", "volume": 50, "difficulty": 30.5},
+            ],
+        }
+    ]
+
+    columnar = gsa.cluster_metrics_columnar(clusters)
+
+    assert columnar == [gsa.cluster_metrics(cluster) for cluster in clusters]
+    assert json.dumps(columnar) == json.dumps([gsa.cluster_metrics(cluster) for cluster in clusters])
+    assert columnar[-1]["top_keywords"] == ["second", "first", "third"]
+    assert gsa.top_clusters(columnar, 2) == sorted(columnar, key=lambda c: c["score"], reverse=True)[:2]
+
+
+def test_stream_keyword_clusters_matches_full_load_in_both_formats(tmp_path: Path, caplog) -> None:
+    clusters = gsa.load_keyword_clusters()["clusters"]
+    jsonl_path = tmp_path / "clusters.jsonl"
+    jsonl_path.write_text("".join(json.dumps(cluster) + "\n" for cluster in clusters), encoding="utf-8")
+
+    # Tiny chunks force clusters, keys and numbers to straddle buffer boundaries.
+    assert list(gsa.iter_keyword_clusters(gsa.KEYWORD_DATA_PATH, chunk_size=5)) == clusters
+    assert list(gsa.iter_keyword_clusters(jsonl_path)) == clusters
+
+    reduced = gsa.stream_keyword_clusters(gsa.KEYWORD_DATA_PATH, 2, chunk_size=5)
+    best = gsa.top_clusters(gsa.cluster_metrics_columnar(clusters), 2)
+    assert reduced["cluster_count"] == len(clusters)
+    assert [cluster["id"] for cluster in reduced["clusters"]] == [
+        cluster["id"] for cluster in clusters if cluster["id"] in {c["id"] for c in best}
+    ]
+
+    seeds = ["intimacy", "boundaries", "storytelling"]
+    seeded = gsa.stream_keyword_clusters(jsonl_path, 1, keyword_seed=seeds)
+    for seed in seeds:
+        expected = gsa.select_winning_cluster(gsa.cluster_metrics_columnar(clusters), seed)
+        assert gsa.select_winning_cluster(gsa.cluster_metrics_columnar(seeded["clusters"]), seed) == expected
+    assert "No keyword cluster matches" not in caplog.text
+    gsa.select_winning_cluster(gsa.cluster_metrics_columnar(clusters), "no such phrase")
+    assert "No keyword cluster matches the seed 'no such phrase'" in caplog.text
+
+
+def test_stream_keyword_clusters_keeps_memory_bounded(tmp_path: Path) -> None:
+    path = tmp_path / "export.jsonl"
+    cluster_count = 20000
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(cluster_count):
+            keywords = [
+                {"term": f"term {index} {row}", "volume": (index * 7919 + row) % 10007, "difficulty": row % 60}
+                for row in range(12)
+            ]
+            handle.write(json.dumps({"id": f"c{index}", "label": f"Cluster {index}", "keywords": keywords}) + "\n")
+
+    tracemalloc.start()
+    try:
+        reduced = gsa.stream_keyword_clusters(path, 10)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert reduced["cluster_count"] == cluster_count
+    assert len(reduced["clusters"]) == 10
+    assert peak < 2 * 1024 * 1024
+    scores = [gsa.cluster_score(cluster) for cluster in reduced["clusters"]]
+    assert min(scores) >= max(
+        gsa.cluster_score(cluster)
+        for cluster in gsa.iter_keyword_clusters(path)
+        if cluster["id"] not in {kept["id"] for kept in reduced["clusters"]}
+    )
+
+
+def test_text_analysis_tokenizes_once_and_matches_standalone_functions() -> None:
+    text = "Say it softly. He listens! Say it softly again? Softly, softly... Don't rush the ritual"
+    keywords = ["say it softly", "softly", "ritual", "missing phrase"]
+
+    analysis = gsa.TextAnalysis(text)
+
+    assert analysis.word_count == 15
+    assert analysis.sentence_count == 5
+    assert analysis.syllable_count == sum(gsa.estimate_syllables(word) for word in analysis.words)
+    assert analysis.flesch_kincaid_grade() == gsa.flesch_kincaid_grade(text)
+    assert analysis.keyword_counts(keywords) == {"say it softly": 2, "softly": 4, "ritual": 1, "missing phrase": 0}
+    assert analysis.keyword_densities(keywords) == gsa.compute_keyword_densities(text, keywords)
+    assert gsa.TextAnalysis("").flesch_kincaid_grade() == 0.0
+
+    gsa.cached_syllables.cache_clear()
+    gsa.TextAnalysis(text).syllable_count
+    assert gsa.cached_syllables.cache_info().misses == len({word.lower() for word in analysis.words})
+
+
+def test_render_sections_keeps_outline_order_on_worker_pools() -> None:
+    config = gsa.load_config()
+    context = {
+        "persona_name": "Heart-Led High Achiever",
+        "product": config["product"],
+        "primary_keyword": "phrases to make him obsessed",
+        "winning_cluster": gsa.cluster_metrics(gsa.load_keyword_clusters()["clusters"][0]),
+    }
+    sections = config["stage2"]["outline"]["sections"] * 3
+
+    serial = gsa.render_sections(sections, context)
+
+    assert [rendered.splitlines()[0] for rendered in serial] == [f"## {section['heading']}" for section in sections]
+    assert gsa.render_sections(sections, context, executor="threads", workers=3) == serial
+    assert gsa.render_sections(sections, context, executor="processes", workers=2) == serial
+
+
+def test_stage3_and_stage4_fan_out_per_platform_and_merge_in_config_order(tmp_path: Path) -> None:
+    config = gsa.load_config()
+    shared = tmp_path / "shared.json"
+    context = gsa.run_pipeline(["stage1", "stage2"], output_root=tmp_path, shared_context=shared)
+    serial = gsa.run_pipeline(
+        ["stage3", "stage4"], output_root=tmp_path / "serial", context=context, shared_context=shared, checkpoint="each"
+    )
+    pooled = gsa.run_pipeline(
+        ["stage3", "stage4"],
+        output_root=tmp_path / "pooled",
+        context=context,
+        shared_context=shared,
+        checkpoint="each",
+        render_executor="threads",
+        render_workers=3,
+    )
+
+    assert pooled == serial
+    for stage, prefix, merged, units in (
+        ("stage3", "stage3_platform", "stage3_cross_platform_distribution.md", config["stage3"]["platforms"]),
+        ("stage4", "stage4_system", "stage4_analytics_refinement.md", config["stage4"]["analytics_systems"]),
+    ):
+        combined = (tmp_path / "pooled" / stage / merged).read_text(encoding="utf-8")
+        assert combined == (tmp_path / "serial" / stage / merged).read_text(encoding="utf-8")
+        positions = []
+        for name in units:
+            unit = (tmp_path / "pooled" / stage / gsa.unit_artifact_name(prefix, name)).read_text(encoding="utf-8")
+            assert unit in combined
+            positions.append(combined.index(unit))
+        assert positions == sorted(positions)
+        manifest = json.loads((tmp_path / "pooled" / stage / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        assert len(manifest["artifacts"]) == len(units) + 2  # the units, the merged plan and context.json
+
+    dropped = next(iter(config["stage3"]["platforms"]))
+    config["stage3"]["platforms"].pop(dropped)
+    gsa.run_pipeline(["stage3"], output_root=tmp_path / "pooled", config=config, context=context, shared_context=shared)
+    assert not (tmp_path / "pooled" / "stage3" / gsa.unit_artifact_name("stage3_platform", dropped)).exists()
+    record = json.loads((tmp_path / "pooled" / "stage3" / gsa.STAGE_CACHE_FILENAME).read_text(encoding="utf-8"))
+    assert gsa.unit_artifact_name("stage3_platform", dropped) not in record["artifacts"]
+
+    with pytest.raises(ValueError, match="would both write stage4_system_ga4.md"):
+        gsa.unit_artifact_names("stage4_system", ["GA4", "ga4"])
+
+
+def test_load_json_snapshot_reuses_and_invalidates_marshal_snapshot(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "config.json"
+    snapshots = tmp_path / "snapshots"
+    source.write_text(json.dumps({"b": [1, 2.5, None], "a": "x"}), encoding="utf-8")
+
+    assert gsa.load_json_snapshot(source, snapshots) == {"b": [1, 2.5, None], "a": "x"}
+    (snapshot,) = snapshots.iterdir()
+
+    # A fresh snapshot is served without parsing the source again.
+    monkeypatch.setattr(gsa.json, "loads", lambda *_: (_ for _ in ()).throw(AssertionError("parsed")))
+    assert list(gsa.load_json_snapshot(source, snapshots)) == ["b", "a"]
+    monkeypatch.undo()
+
+    source.write_text(json.dumps({"b": [1, 2.5, None], "a": "yz"}), encoding="utf-8")
+    assert gsa.load_json_snapshot(source, snapshots)["a"] == "yz"
+
+    snapshot.write_bytes(b"corrupt")
+    assert gsa.load_json_snapshot(source, snapshots)["a"] == "yz"
+    assert gsa.load_json_snapshot(source, None)["a"] == "yz"
+
+    # Sources are keyed by name: another config.json replaces the snapshot rather than adding one,
+    # and snapshots left by the old per-path naming are pruned.
+    (snapshots / "config-0123456789abcdef.marshal").write_bytes(b"legacy")
+    other = tmp_path / "other" / "config.json"
+    other.parent.mkdir()
+    other.write_text(json.dumps({"a": "other"}), encoding="utf-8")
+    assert gsa.load_json_snapshot(other, snapshots) == {"a": "other"}
+    assert gsa.load_json_snapshot(source, snapshots)["a"] == "yz"
+    assert [path.name for path in snapshots.iterdir()] == ["config.json.marshal"]
+
+
+def test_select_winning_cluster_skips_covered_clusters() -> None:
+    clusters = [{"id": "a", "score": 5.0}, {"id": "b", "score": 9.0}, {"id": "c", "score": 9.0}, {"id": "d", "score": 1.0}]
+
+    assert gsa.select_winning_cluster(clusters)["id"] == "b"
+    assert gsa.select_winning_cluster(clusters, covered=["b"])["id"] == "c"
+    assert gsa.select_winning_cluster(clusters, covered={"b", "c"})["id"] == "a"
+    assert gsa.select_winning_cluster(clusters, covered={"a", "b", "c", "d"})["id"] == "b"
+
+
+def test_stage2_writes_reproducible_scored_variants(tmp_path: Path) -> None:
+    config = gsa.load_config()
+    context = gsa.run_pipeline(["stage1"], output_root=tmp_path, config=config, shared_context=tmp_path / "shared.json")
+
+    variants = list(gsa.iter_article_variants(config, context, 25, seed=11))
+
+    assert len(variants) == 25 and variants == list(gsa.iter_article_variants(config, context, 25, seed=11))
+    assert len({variant["text"] for variant in variants}) == 25
+    assert variants[0]["id"] == "v00001" and variants[0]["text"].startswith(f"# {variants[0]['headline']}\n")
+    assert all(variant["word_count"] > 0 and variant["target_gap"] >= 0 for variant in variants)
+
+    stage2 = gsa.run_pipeline(
+        ["stage2"],
+        output_root=tmp_path,
+        config=config,
+        context=context,
+        shared_context=tmp_path / "shared.json",
+        variant_count=25,
+        variant_seed=11,
+    )
+
+    lines = (tmp_path / "stage2" / "step2_5_variants.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == variants
+    best = min(variants, key=lambda variant: variant["target_gap"])
+    assert stage2["variants"]["count"] == 25 and stage2["variants"]["best"]["id"] == best["id"]
+
+    stage2 = gsa.run_pipeline(
+        ["stage2"], output_root=tmp_path, config=config, context=context, shared_context=tmp_path / "shared.json"
+    )
+
+    assert "variants" not in stage2
+    assert not (tmp_path / "stage2" / "step2_5_variants.jsonl").exists()
+    record = json.loads((tmp_path / "stage2" / gsa.STAGE_CACHE_FILENAME).read_text(encoding="utf-8"))
+    assert "step2_5_variants.jsonl" not in record["artifacts"]
+
+
+def test_run_pipeline_writes_and_resumes_from_compact_contexts(tmp_path: Path) -> None:
+    shared = tmp_path / "context.ctx"
+    context = gsa.run_pipeline(
+        ["stage1", "stage2"], output_root=tmp_path, shared_context=shared, context_format="compact", checkpoint="each"
+    )
+
+    assert not list(tmp_path.glob("stage*/context.json"))
+    assert read_context(tmp_path / "stage2" / "context.ctx") == context == read_context(shared)
+
+    args = argparse.Namespace(
+        stage="stage3",
+        output_dir=str(tmp_path / "stage3"),
+        context=str(shared),
+        shared_context=str(tmp_path / "context.json"),
+    )
+    resumed = gsa.run_stage(args, gsa.load_config(), {})
+    assert resumed["slug"] == context["slug"] and resumed.keys() > context.keys()
+    assert json.loads((tmp_path / "stage3" / "context.json").read_text(encoding="utf-8")) == resumed
+
+    # A compact context from another Python version cannot be decoded, so the stage is rebuilt.
+    stage2_path = tmp_path / "stage2" / "context.ctx"
+    foreign = bytearray(stage2_path.read_bytes())
+    foreign[len(MAGIC) + 1] ^= 0xFF
+    stage2_path.write_bytes(bytes(foreign))
+    gsa.run_pipeline(
+        ["stage1", "stage2"], output_root=tmp_path, shared_context=shared, context_format="compact", checkpoint="each"
+    )
+    assert read_context(stage2_path) == context
+
+
+def test_run_pipeline_chains_delta_contexts(tmp_path: Path) -> None:
+    shared = tmp_path / "context.delta.json"
+    context = gsa.run_pipeline(output_root=tmp_path, shared_context=shared, context_format="delta", checkpoint="each")
+
+    deltas = {path.parent.name: json.loads(path.read_bytes()) for path in tmp_path.glob("stage*/context.delta.json")}
+    assert sorted(deltas) == gsa.STAGE_ORDER
+    assert deltas["stage1"]["parent"] is None and list(deltas["stage5"]["set"]) == ["growth_actions"]
+    assert read_context(shared) == context
+
+    args = argparse.Namespace(
+        stage="stage4",
+        output_dir=str(tmp_path / "stage4"),
+        context=str(tmp_path / "stage3" / "context.delta.json"),
+        shared_context=str(shared),
+        context_format="delta",
+    )
+    gsa.run_stage(args, gsa.load_config(), {})  # unchanged inputs: only the shared pointer moves
+    assert json.loads(shared.read_bytes())["stage"] == "stage4"
+    assert read_context(shared) == read_context(tmp_path / "stage4" / "context.delta.json")
+
+
+def test_skip_covered_ignores_the_article_being_generated(tmp_path: Path) -> None:
+    keyword_data = gsa.load_keyword_clusters()
+    work = tmp_path / "work"
+
+    def run() -> str:
+        covered = gsa.published_covered_clusters(
+            keyword_data["clusters"], [tmp_path], article_root=work, index_path=tmp_path / "index.json"
+        )
+        context = gsa.run_pipeline(
+            ["stage1", "stage2"],
+            output_root=work,
+            keyword_data=keyword_data,
+            shared_context=work / "context.json",
+            covered_clusters=covered,
+            checkpoint="each",
+        )
+        return context["winning_cluster"]["id"]
+
+    first = run()
+    assert run() == first and run() == first
+
+    published = json.loads((work / "stage2" / "context.json").read_text(encoding="utf-8"))
+    (tmp_path / "catalog").mkdir()
+    (tmp_path / "catalog" / "context.json").write_text(json.dumps({**published, "slug": "live"}), encoding="utf-8")
+    assert run() != first
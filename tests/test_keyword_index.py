@@ -0,0 +1,67 @@
+"""Tests for the keyword inverted index."""
+
+import json
+from pathlib import Path
+
+from keyword_index import KeywordIndex, load_keyword_index
+
+CLUSTERS = [
+    {"id": "devotion", "keywords": [{"term": "Phrases to make him obsessed"}, {"term": "devotion phrases"}]},
+    {"id": "boundaries", "keywords": [{"term": "high value woman phrases"}, {"term": "devotion phrases"}]},
+    {"id": "texting", "keywords": [{"term": "texts to make him miss you"}]},
+]
+
+
+def write_context(directory: Path, **context: object) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "context.json"
+    path.write_text(json.dumps(context), encoding="utf-8")
+    return path
+
+
+def test_lookup_prefix_fuzzy_and_coverage(tmp_path: Path) -> None:
+    write_context(
+        tmp_path / "published" / "stage2",
+        slug="obsessed-post",
+        primary_keyword="phrases to make him obsessed",
+        winning_cluster={"id": "devotion", "keywords": [{"term": "devotion phrases"}]},
+    )
+    write_context(tmp_path / "published" / "stage1", primary_keyword="texts to make him miss you")  # unpublished
+
+    index = load_keyword_index(CLUSTERS, [tmp_path / "published"], tmp_path / "index.json")
+
+    assert index.lookup("  Devotion, phrases ") == {"clusters": ["devotion", "boundaries"], "slugs": ["obsessed-post"]}
+    assert index.lookup("missing") == {"clusters": [], "slugs": []}
+    assert index.prefix("phrases to make") == ["phrases to make him obsessed"]
+    assert index.prefix("t") == ["texts to make him miss you"]
+    assert index.fuzzy("phrase to make him obssesed", limit=1)[0][0] == "phrases to make him obsessed"
+    assert index.fuzzy("zzzz") == []
+    # The winning cluster is covered, and so is every cluster sharing the published primary keyword.
+    assert index.covered_clusters() == {"devotion"}
+
+
+def test_index_is_persisted_and_rebuilt_when_sources_change(tmp_path: Path) -> None:
+    published = tmp_path / "published"
+    index_path = tmp_path / "index.json"
+    first = load_keyword_index(CLUSTERS, [published], index_path)
+    assert first.covered_clusters() == set()
+    assert KeywordIndex.load(index_path).fingerprint == first.fingerprint
+
+    write_context(published / "a", slug="value-post", primary_keyword="devotion phrases", winning_cluster={"id": "x"})
+    rebuilt = load_keyword_index(CLUSTERS, [published], index_path)
+    assert rebuilt.fingerprint != first.fingerprint
+    assert rebuilt.covered_clusters() == {"x", "devotion", "boundaries"}
+    assert load_keyword_index(CLUSTERS, [published], index_path).to_dict() == rebuilt.to_dict()
+
+
+def test_scan_excludes_the_working_article_and_keeps_one_context_per_slug(tmp_path: Path) -> None:
+    catalog = tmp_path / "catalog"
+    write_context(catalog / "old" / "stage2", slug="post", winning_cluster={"id": "texting"})
+    write_context(catalog / "new" / "stage5", slug="post", winning_cluster={"id": "devotion"})
+    write_context(catalog / "work" / "stage2", slug="draft", winning_cluster={"id": "boundaries"})
+    shared = write_context(catalog, slug="draft", winning_cluster={"id": "boundaries"})
+
+    index = load_keyword_index(CLUSTERS, [catalog], None, exclude=[catalog / "work", shared])
+
+    assert index.articles == {"post": {"cluster": "devotion", "primary_keyword": ""}}
+    assert index.covered_clusters() == {"devotion"}
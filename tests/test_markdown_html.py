@@ -0,0 +1,88 @@
+"""Tests for the streaming Markdown to HTML converter."""
+
+import io
+import tracemalloc
+from pathlib import Path
+
+from markdown_html import iter_html, markdown_to_html, write_html
+
+SAMPLE_POST = Path(__file__).resolve().parents[1] / "content" / "why-men-pull-away-understandingman.md"
+
+
+def test_markdown_to_html_handles_blocks_inline_markup_and_escaping() -> None:
+    markdown = (
+        "# Title\n"
+        "## Why He Pulls Away & What To Do\n"
+        "A wrapped paragraph that\n"
+        "continues here with <tags> & **bold** text.  \n"
+        "After a hard break, a [link](https://example.com/?a=1&b=2).\n"
+        "\n"
+        "### FAQ question?\n"
+        "- First *idea*\n"
+        "  - Nested `code<b>`\n"
+        "- Second idea\n"
+        "  wrapped onto two lines\n"
+        "\n"
+        "3. Third\n"
+        "4. Fourth\n"
+        "\n"
+        "---\n"
+        "<center>\n"
+    )
+
+    html = markdown_to_html(markdown, skip_heading_levels=(1,), heading_attributes={2: ' class="centered"'})
+
+    assert html.splitlines() == [
+        '<h2 class="centered">Why He Pulls Away &amp; What To Do</h2>',
+        "<p>A wrapped paragraph that continues here with &lt;tags&gt; &amp; <strong>bold</strong> text.<br>"
+        'After a hard break, a <a href="https://example.com/?a=1&amp;b=2">link</a>.</p>',
+        "<h3>FAQ question?</h3>",
+        "<ul>",
+        "  <li>First <em>idea</em>",
+        "    <ul>",
+        "      <li>Nested <code>code&lt;b&gt;</code></li>",
+        "    </ul>",
+        "  </li>",
+        "  <li>Second idea wrapped onto two lines</li>",
+        "</ul>",
+        '<ol start="3">',
+        "  <li>Third</li>",
+        "  <li>Fourth</li>",
+        "</ol>",
+        "<hr>",
+        "<center>",
+    ]
+
+
+def test_write_html_streams_sample_post_with_bounded_memory() -> None:
+    with SAMPLE_POST.open(encoding="utf-8") as handle:
+        first_lines = list(iter_html(handle))[:3]
+    assert first_lines == [
+        "<center>",
+        "<h1>Why Men Pull Away — The Truth Behind His Distance and How to Pull Him Back</h1>",
+        "</center>",
+    ]
+
+    post = SAMPLE_POST.read_text(encoding="utf-8").split("---\n", 2)[2]
+    repeats = 400
+
+    def lines():
+        for _ in range(repeats):
+            yield from io.StringIO(post)
+
+    class CountingSink:
+        written = 0
+
+        def write(self, text: str) -> None:
+            self.written += len(text)
+
+    sink = CountingSink()
+    tracemalloc.start()
+    try:
+        write_html(lines(), sink, front_matter=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert sink.written > repeats * len(post)
+    assert peak < 256 * 1024
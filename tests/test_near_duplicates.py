@@ -0,0 +1,75 @@
+"""Tests for MinHash/LSH near-duplicate detection."""
+
+import os
+import random
+from pathlib import Path
+
+import near_duplicates
+from near_duplicates import NearDuplicateIndex, estimate_similarity, load_draft_index, minhash, shingle_hashes
+
+WORDS = "devotion ritual phrase trust calm focus spark bond heart steady".split()
+
+
+def random_text(seed: int, length: int = 200) -> str:
+    return " ".join(random.Random(seed).choices(WORDS, k=length))
+
+
+def edited(text: str, count: int) -> str:
+    words = text.split()
+    for position in random.Random(count).sample(range(len(words)), count):
+        words[position] = f"edit{position}"
+    return " ".join(words)
+
+
+def test_index_finds_near_duplicates_and_estimates_jaccard() -> None:
+    base = random_text(1)
+    near = edited(base, 6)
+    exact = set(shingle_hashes(base)) & set(shingle_hashes(near))
+    jaccard = len(exact) / len(set(shingle_hashes(base)) | set(shingle_hashes(near)))
+
+    assert abs(estimate_similarity(minhash(base), minhash(near)) - jaccard) < 0.15
+    assert minhash("Devotion, RITUAL phrase!") == minhash("devotion ritual phrase")
+    assert minhash("...") is None
+
+    index = NearDuplicateIndex()
+    index.add("base", base)
+    for seed in range(2, 40):
+        index.add(f"other-{seed}", random_text(seed))
+    matches = index.query(near)
+    assert [doc_id for doc_id, _ in matches] == ["base"] and matches[0][1] > 0.5
+    assert index.query(near, exclude=["base"]) == []
+    assert index.report()[0]["similarity"] == 0.0
+
+    index.add("copy", base)
+    assert index.report()[:2] == [
+        {"id": "base", "similarity": 1.0, "match": "copy"},
+        {"id": "copy", "similarity": 1.0, "match": "base"},
+    ]
+    index.discard("base")
+    index.add("copy", random_text(99))  # re-adding an id replaces its old signature
+    assert "base" not in index and index.query(near) == []
+
+
+def test_draft_index_reuses_signatures_of_unchanged_drafts(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "content").mkdir()
+    (tmp_path / "artifacts" / "a" / "stage2").mkdir(parents=True)
+    published = tmp_path / "content" / "post.md"
+    draft = tmp_path / "artifacts" / "a" / "stage2" / "step6_5_final_draft.md"
+    published.write_text(random_text(1), encoding="utf-8")
+    draft.write_text(edited(random_text(1), 4), encoding="utf-8")
+    (tmp_path / "artifacts" / "a" / "stage2" / "notes.md").write_text(random_text(1), encoding="utf-8")
+    index_path = tmp_path / "index.marshal"
+
+    calls = []
+    original = near_duplicates.minhash
+    monkeypatch.setattr(near_duplicates, "minhash", lambda *args: calls.append(args) or original(*args))
+
+    index = load_draft_index(index_path=index_path, root=tmp_path)
+    assert sorted(index.signatures) == ["artifacts/a/stage2/step6_5_final_draft.md", "content/post.md"]
+    assert index.report()[0]["match"] and len(calls) == 2
+
+    published.write_text(random_text(2), encoding="utf-8")
+    os.utime(published, ns=(1_000_000_000, 1_000_000_000))
+    index = load_draft_index(index_path=index_path, root=tmp_path)
+    assert len(calls) == 3  # only the changed draft was rehashed
+    assert index.report()[0]["match"] is None
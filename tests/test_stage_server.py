@@ -0,0 +1,139 @@
+"""Tests for the long-running stage server and its client."""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import generate_stage_artifacts as gsa
+from stage_client import request
+from stage_server import ServerError, StageServer, WarmInputs
+
+
+def warm_inputs(tmp_path: Path, config_path: Path, keyword_path: Path = gsa.KEYWORD_DATA_PATH, **kwargs) -> WarmInputs:
+    return WarmInputs(config_path, keyword_path, snapshot_dir=tmp_path / "snapshots", **kwargs)
+
+
+def start_server(tmp_path: Path, inputs: WarmInputs) -> tuple[Path, threading.Thread]:
+    socket_path = tmp_path / "server.sock"
+    server = StageServer(inputs, keyword_index_path=tmp_path / "keyword_index.json")
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(socket_path=socket_path),), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            request({"op": "status"}, socket_path=socket_path)
+            break
+        except OSError:
+            assert time.monotonic() < deadline, "server did not start"
+            time.sleep(0.01)
+    return socket_path, thread
+
+
+def test_server_runs_chained_stages_and_reloads_the_config(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    config = gsa.load_config()
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    socket_path, thread = start_server(tmp_path, warm_inputs(tmp_path, config_path))
+    assert (tmp_path / "snapshots" / "config.json.marshal").is_file()
+    shared = str(tmp_path / "context.json")
+
+    stage1 = request(
+        {"stage": "stage1", "output_dir": str(tmp_path / "stage1"), "shared_context": shared, "return_context": True},
+        socket_path=socket_path,
+    )
+    assert stage1["ok"], stage1
+    assert stage1["context"]["product"] == config["product"]
+    assert str(tmp_path / "stage1" / "context.json") in stage1["artifacts"]
+
+    with pytest.raises(ServerError, match="already listening"):
+        asyncio.run(StageServer(warm_inputs(tmp_path, config_path)).serve(socket_path=socket_path))
+    assert request({"op": "status"}, socket_path=socket_path)["ok"]
+
+    catalog = tmp_path / "catalog"
+    catalog.mkdir()
+    published = {**stage1["context"], "slug": "live"}
+    (catalog / "context.json").write_text(json.dumps(published), encoding="utf-8")
+    skipped = request(
+        {
+            "stage": "stage1",
+            "output_dir": str(tmp_path / "skipped"),
+            "shared_context": shared,
+            "published_dirs": [str(catalog)],
+            "return_context": True,
+        },
+        socket_path=socket_path,
+    )
+    assert skipped["ok"], skipped
+    assert skipped["context"]["winning_cluster"]["id"] != stage1["context"]["winning_cluster"]["id"]
+
+    stage2 = request(
+        {
+            "stage": "stage2",
+            "output_dir": str(tmp_path / "stage2"),
+            "context_path": str(tmp_path / "stage1" / "context.json"),
+            "shared_context": shared,
+        },
+        socket_path=socket_path,
+    )
+    assert stage2["ok"], stage2
+    assert all(Path(path).is_file() for path in stage2["artifacts"])
+    assert str(tmp_path / "stage2" / "step7_clickbank_html.html") in stage2["changed"]
+
+    missing = request({"stage": "stage3", "output_dir": str(tmp_path / "stage3")}, socket_path=socket_path)
+    assert not missing["ok"] and "Stage 3" in missing["error"]
+
+    config["product"] = "Reloaded Offer"
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    os.utime(config_path, ns=(1_000_000_000, 1_000_000_000))  # a distinct mtime even on coarse clocks
+    reloaded = request(
+        {"stage": "stage1", "output_dir": str(tmp_path / "stage1"), "shared_context": shared, "return_context": True},
+        socket_path=socket_path,
+    )
+    assert reloaded["context"]["product"] == "Reloaded Offer"
+
+    status = request({"op": "status"}, socket_path=socket_path)
+    assert (status["jobs"], status["failures"], status["reloads"]) == (5, 1, 1)
+
+    assert request({"op": "shutdown"}, socket_path=socket_path) == {"ok": True, "stopping": True}
+    thread.join(timeout=10)
+    assert not thread.is_alive() and not socket_path.exists()
+
+
+def test_server_keeps_a_seeded_cluster_from_a_streamed_export(tmp_path: Path) -> None:
+    clusters = gsa.load_keyword_clusters()["clusters"]
+    jsonl_path = tmp_path / "clusters.jsonl"
+    jsonl_path.write_text("".join(json.dumps(cluster) + "\n" for cluster in clusters), encoding="utf-8")
+    inputs = warm_inputs(tmp_path, gsa.CONFIG_PATH, jsonl_path, top_clusters=1)
+    expected = gsa.select_winning_cluster(gsa.cluster_metrics_columnar(clusters), "storytelling")["id"]
+
+    assert len(inputs.keyword_data()["clusters"]) == 1
+    assert not gsa.clusters_matching_seed(inputs.keyword_data()["clusters"], "storytelling")
+    seeded = inputs.keyword_data("storytelling")
+    assert inputs.keyword_data("storytelling") is seeded
+
+    # A stale socket file from a crashed server is replaced rather than refused.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "server.sock"))
+    stale.close()
+    socket_path, thread = start_server(tmp_path, inputs)
+    job = request(
+        {
+            "stage": "stage1",
+            "output_dir": str(tmp_path / "stage1"),
+            "shared_context": str(tmp_path / "context.json"),
+            "keyword_seed": "storytelling",
+            "return_context": True,
+        },
+        socket_path=socket_path,
+    )
+    assert job["ok"], job
+    assert job["context"]["winning_cluster"]["id"] == expected
+
+    request({"op": "shutdown"}, socket_path=socket_path)
+    thread.join(timeout=10)
@@ -0,0 +1,94 @@
+"""Tests for the compiled artifact template engine."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from template_engine import Template, TemplateError, TemplateLoader, render_string
+
+
+def test_template_loops_conditions_and_filters() -> None:
+    template = Template(
+        "# {{ title | upper }}\n"
+        "{% for name, details in platforms | items %}\n"
+        "## {{ name | replace('_', ' ') }}\n"
+        "{% if details.posts is defined %}\n"
+        "- Posts: {{ details.posts | format(',') }}\n"
+        "{% elif details.topics %}\n"
+        "- Topics: {{ details.topics | take(2) | join(', ') }}\n"
+        "{% else %}\n"
+        "- Nothing scheduled\n"
+        "{% endif %}\n"
+        "{% endfor %}\n"
+        "{% for hook in hooks | compact %}\n"
+        "- {{ hook }}\n"
+        "{% else %}\n"
+        "- {{ missing | default('No hooks') }}\n"
+        "{% endfor %}\n"
+        "{# comments and tag-only lines leave no blank lines #}\n"
+        "{% filter fill(24) %}Inline {% if title %}{{ title }}{% endif %} is wrapped at twenty-four columns.{% endfilter %}\n"
+    )
+
+    rendered = template.render(
+        title="Plan",
+        platforms={"Short_Form": {"posts": 1200}, "Medium": {"topics": ["Love", "Trust", "Calm"]}, "Email": {}},
+        hooks=["", None],
+    )
+
+    assert rendered == (
+        "# PLAN\n"
+        "## Short Form\n- Posts: 1,200\n"
+        "## Medium\n- Topics: Love, Trust\n"
+        "## Email\n- Nothing scheduled\n"
+        "- No hooks\n"
+        "Inline Plan is wrapped\nat twenty-four columns.\n"
+    )
+
+
+def test_template_errors_name_the_problem() -> None:
+    with pytest.raises(TemplateError, match="line 2: unknown filter"):
+        Template("ok\n{{ value | shout }}")
+    with pytest.raises(TemplateError, match="unclosed 'for' block"):
+        Template("{% for item in items %}{{ item }}")
+    with pytest.raises(TemplateError, match="'cluster.label' is undefined"):
+        render_string("{{ cluster.label }}", cluster={})
+
+
+def test_template_loader_compiles_once_until_the_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "greeting.md"
+    path.write_text("Hello {{ name }}\n", encoding="utf-8")
+    loader = TemplateLoader(tmp_path)
+
+    assert [loader.render("greeting.md", name=str(index)) for index in range(3)] == ["Hello 0\n", "Hello 1\n", "Hello 2\n"]
+    assert loader.compilations == 1
+
+    path.write_text("Hi {{ name }}!\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert loader.render("greeting.md", name="there") == "Hi there!\n"
+    assert loader.compilations == 2
+
+
+def test_template_stream_writes_lazily_to_a_handle() -> None:
+    template = Template("<ul>\n{% for line in lines %}\n  {{ line | escape }}\n{% endfor %}\n</ul>\n")
+    consumed = []
+
+    def lines():
+        for index in range(3):
+            consumed.append(index)
+            yield f"<li>{index}</li>"
+
+    class Handle:
+        def __init__(self) -> None:
+            self.chunks = []
+
+        def write(self, text: str) -> None:
+            self.chunks.append((len(consumed), text))
+
+    handle = Handle()
+    template.stream(handle, lines=lines())
+
+    assert "".join(text for _, text in handle.chunks) == template.render(lines=[f"<li>{i}</li>" for i in range(3)])
+    assert handle.chunks[0] == (0, "<ul>\n")
+    assert "&lt;li&gt;0&lt;/li&gt;" in template.render(lines=["<li>0</li>"])
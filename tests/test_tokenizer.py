@@ -0,0 +1,28 @@
+"""Tests for the shared tokenizer."""
+
+from tokenizer import TokenizedText, phrase_tokens, slugify, tokenize
+
+
+def test_tokenize_caches_one_representation_per_text() -> None:
+    text = "# Title\n## Say It Softly\nSay it softly. He listens! Hope... don't rush\n## Close"
+    tokenize.cache_clear()
+
+    tokens = tokenize(text)
+
+    assert tokenize("".join(text)) is tokens
+    assert tokenize.cache_info().misses == 1
+    assert tokens.words[:3] == ("Title", "Say", "It")
+    assert tokens.word_count == 13
+    assert tokens.sentence_count == 4
+    assert tokens.lowered_words[:3] == ("title", "say", "it")
+    assert tokens.vocabulary["say"] == 2
+    assert tokens.lines_starting_with("## ") == ["## Say It Softly", "## Close"]
+    assert tokens.contains("HOPE") and not tokens.contains("fear")
+    assert tokenize("different") is not tokens
+
+
+def test_non_ascii_lowering_retokenizes_and_slugs_collapse_separators() -> None:
+    # "K" (Kelvin sign) lowercases to an ASCII "k", joining the surrounding word.
+    assert TokenizedText("aKb").lowered_words == ("akb",)
+    assert phrase_tokens("Say It, Softly") == ("say", "it", "softly")
+    assert slugify("  Why Men -- Pull Away?! ") == "why-men-pull-away"
@@ -0,0 +1,234 @@
+"""Tests for the README feed updater."""
+
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import util
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "python" / "update_readme.py"
+SPEC = util.spec_from_file_location("update_readme", MODULE_PATH)
+assert SPEC and SPEC.loader  # narrow type for mypy/pyright
+update_readme = util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = update_readme  # dataclasses resolve annotations through sys.modules
+SPEC.loader.exec_module(update_readme)  # type: ignore[assignment]
+
+SAMPLE_FEED = Path(__file__).resolve().parents[1] / "data" / "sample_feed.xml"
+
+
+def rss_feed(*titles: str) -> bytes:
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{index}</link></item>"
+        for index, title in enumerate(titles)
+    )
+    return f"<rss version='2.0'><channel>{items}</channel></rss>".encode("utf-8")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    feeds = {
+        "/slow": (0.3, rss_feed("Slow post")),
+        "/fast": (0.0, rss_feed("Fast post")),
+        "/stalled": (2.0, rss_feed("Never seen")),
+    }
+    client_ports: List[int] = []
+    requests: List[str] = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            self._respond()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _respond(self) -> None:
+        self.client_ports.append(self.client_address[1])
+        self.requests.append(self.path)
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = rss_feed("Cached post")
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        delay, body = self.feeds[self.path]
+        time.sleep(delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def feed_server() -> Iterator[str]:
+    FeedHandler.client_ports = []
+    FeedHandler.requests = []
+    FeedHandler.in_flight = FeedHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def blog(name: str, feed_url: str | None, local_feed: Path | None = None) -> object:
+    return update_readme.BlogConfig(name=name, feed_url=feed_url, local_feed=local_feed, max_posts=5)
+
+
+def test_fetch_feeds_runs_concurrently_and_keeps_config_order(feed_server: str) -> None:
+    blogs = [blog("slow", f"{feed_server}/slow"), blog("fast", f"{feed_server}/fast")]
+
+    contents = update_readme.fetch_feeds(blogs, concurrency=2, deadline=5)
+
+    assert [update_readme.parse_feed(content)[0][0] for content in contents] == ["Slow post", "Fast post"]
+    assert FeedHandler.max_in_flight == 2  # the fast feed was served while the slow one was still pending
+
+
+def test_connection_pool_closes_connections_released_after_close() -> None:
+    pool = update_readme.ConnectionPool()
+    connection = update_readme.http.client.HTTPConnection("127.0.0.1", 9)
+    closed = []
+    connection.close = lambda: closed.append(True)  # type: ignore[method-assign]
+    pool.close()
+
+    pool._release(("http", "127.0.0.1", 9), connection)
+
+    assert closed == [True] and not any(pool._idle.values())
+
+
+def test_connection_pool_reuses_connections_per_host(feed_server: str) -> None:
+    with update_readme.ConnectionPool() as pool:
+        for _ in range(3):
+            update_readme.download_feed(f"{feed_server}/fast", pool, timeout=5)
+
+    assert pool.connections_opened == 1
+    assert len(set(FeedHandler.client_ports)) == 1
+
+
+def test_fetch_feeds_falls_back_to_local_feed_after_deadline(feed_server: str) -> None:
+    blogs = [blog("stalled", f"{feed_server}/stalled", SAMPLE_FEED), blog("fast", f"{feed_server}/fast")]
+
+    started = time.monotonic()
+    contents = update_readme.fetch_feeds(blogs, concurrency=2, deadline=0.5)
+
+    assert time.monotonic() - started < 1.5
+    assert contents[0] == SAMPLE_FEED.read_bytes()
+    assert update_readme.parse_feed(contents[1]) == [("Fast post", "https://example.com/0")]
+
+
+def test_fetch_feeds_bounds_late_requests_by_the_remaining_budget(
+    feed_server: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stalled_url = f"{feed_server}/stalled"
+    cache = update_readme.FeedCache(tmp_path)
+    cache.store(update_readme.CachedFeed(url=stalled_url, body=rss_feed("Cached post")))
+    timeouts = {}
+    download_feed = update_readme.download_feed
+
+    def recording_download(url: str, pool: object, *, timeout: float, cache: object = None) -> bytes:
+        timeouts[url] = timeout
+        return download_feed(url, pool, timeout=timeout, cache=cache)
+
+    monkeypatch.setattr(update_readme, "download_feed", recording_download)
+    blogs = [blog("slow", f"{feed_server}/slow"), blog("stalled", stalled_url)]
+
+    contents = update_readme.fetch_feeds(blogs, concurrency=1, deadline=0.5, cache=cache)
+    stats = dict(cache.stats)
+    deadline = time.monotonic() + 5
+    while any(thread.name.startswith("feed") for thread in threading.enumerate()):
+        assert time.monotonic() < deadline, "a feed request outlived its budget"
+        time.sleep(0.01)
+
+    assert timeouts[stalled_url] <= 0.2  # the slow feed had already used 0.3s of the 0.5s budget
+    assert contents[1] == rss_feed("Cached post")
+    assert cache.stats == stats  # the abandoned request never touched the stats
+    assert (stats["downloaded"], stats["stale"]) == (1, 1)
+
+
+def test_feed_cache_revalidates_with_etag_and_honours_ttl(feed_server: str, tmp_path: Path) -> None:
+    url = f"{feed_server}/etag"
+    cache = update_readme.FeedCache(tmp_path)
+    with update_readme.ConnectionPool() as pool:
+        first = update_readme.download_feed(url, pool, timeout=5, cache=cache)
+        second = update_readme.download_feed(url, pool, timeout=5, cache=cache)
+
+        ttl_cache = update_readme.FeedCache(tmp_path, ttl=60)
+        third = update_readme.download_feed(url, pool, timeout=5, cache=ttl_cache)
+
+    assert first == second == third == rss_feed("Cached post")
+    assert cache.stats["downloaded"] == 1 and cache.stats["revalidated"] == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert ttl_cache.stats["fresh"] == 1
+    assert FeedHandler.requests == ["/etag", "/etag"]
+
+    offline_blog = blog("cached", url)
+    assert update_readme.fetch_feed(offline_blog, offline=True, cache=ttl_cache) == first
+    assert ttl_cache.stats["stale"] == 1
+
+
+def test_parse_feed_streams_sample_feed_and_stops_at_max_posts() -> None:
+    content = SAMPLE_FEED.read_bytes()
+
+    posts = update_readme.parse_feed(content)
+
+    assert len(posts) == 5
+    assert posts[2] == (
+        "Say These 3 Lines & He Becomes Emotionally Closer #WhyMenPullAway #GetHi...",
+        "https://understandman727.blogspot.com/2025/10/say-these-3-lines-he-becomes.html",
+    )
+    assert update_readme.parse_feed(content, max_posts=2) == posts[:2]
+
+    truncated = rss_feed("One", "Two").replace(b"</channel></rss>", b"<item><title>broken")
+    assert [title for title, _ in update_readme.parse_feed(truncated, max_posts=2)] == ["One", "Two"]
+
+
+def test_iter_feed_posts_keeps_memory_bounded_on_large_feed(tmp_path: Path) -> None:
+    feed_path = tmp_path / "large_feed.xml"
+    description = "<p>" + "Long-form post body &amp; markup. " * 60 + "</p>"
+    item_count = 0
+    with feed_path.open("w", encoding="utf-8") as handle:
+        handle.write("<rss version='2.0'><channel><title>Large</title>")
+        while handle.tell() < 50 * 1024 * 1024:
+            handle.write(
+                f"<item><title>Post {item_count}</title><link>https://example.com/{item_count}</link>"
+                f"<description>{description}</description></item>"
+            )
+            item_count += 1
+        handle.write("</channel></rss>")
+
+    tracemalloc.start()
+    try:
+        with feed_path.open("rb") as handle:
+            parsed = sum(1 for _ in update_readme.iter_feed_posts(handle))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert parsed == item_count
+    assert peak < 4 * 1024 * 1024
@@ -0,0 +1,22 @@
+"""Tests for the seeded variant space."""
+
+from variants import VariantSpace, dedupe_rendered
+
+
+def test_sample_visits_every_combination_once_in_seeded_order() -> None:
+    space = VariantSpace({"headline": ["A", "B", "C"], "hook": ["x", "y", "", "x"], "cta": ["go", "buy"], "empty": []})
+
+    assert list(space.axes) == ["headline", "hook", "cta"]
+    assert space.size == 12
+    combinations = [tuple(choice.values()) for choice in space.sample(seed=7)]
+    assert len(set(combinations)) == 12
+    assert combinations == [tuple(choice.values()) for choice in space.sample(seed=7)]
+    assert combinations != [tuple(choice.values()) for choice in space.sample(seed=8)]
+    assert [tuple(choice.values()) for choice in space.sample(5, seed=7)] == combinations[:5]
+    assert list(VariantSpace({"hook": []}).sample()) == []
+
+
+def test_dedupe_rendered_ignores_case_and_punctuation() -> None:
+    texts = ["Hold his focus.", "hold HIS focus!", "Hold his  focus", "Keep him close."]
+
+    assert list(dedupe_rendered(texts, key=str)) == ["Hold his focus.", "Keep him close."]